@@ -1,22 +1,38 @@
 from __future__ import annotations
 
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
 from functools import lru_cache
+from typing import cast
 
 import httpx
 from fastapi import Depends, Request
+from starlette.datastructures import State
 
-from app.clients.session_manager import SessionManager
+from app.clients.account_pool import Account, AccountPool
+from app.clients.http_client import PoolMetrics
+from app.clients.search_session_pool import SearchSessionPool
 from app.config import Settings
 from app.services.auth_client import AuthClient
 from app.services.captcha_handler import CaptchaHandler
 from app.services.extractor import Extractor
+from app.services.gazette_cache import GazetteRecordCache
 from app.services.gazette_client import GazetteClient
+from app.services.job_queue import JobQueue
 from app.services.ocr_pipeline import OCRPipeline
+from app.services.page_index import GazettePageIndex
+from app.services.pdf_cache import PDFCache
 from app.services.pdf_fetcher import PDFFetcher
+from app.services.prefetcher import Prefetcher
+from app.services.search_cache import SearchCache
 from app.services.search_client import SearchClient
-
-# Singletons
-_session_manager = SessionManager()
+from app.services.text_index import GazetteTextIndex
+from app.utils.circuit_breaker import CircuitBreakerRegistry
+from app.utils.hedging import Hedger
+from app.utils.rate_limit import TokenBucket
+from app.utils.retry import RetryBudget
+from app.utils.single_flight import SingleFlight
 
 
 @lru_cache
@@ -24,23 +40,96 @@ def get_settings() -> Settings:
     return Settings()
 
 
-def get_http_client(request: Request) -> httpx.AsyncClient:
-    return request.app.state.http_client
+def get_search_session_pool(request: Request) -> SearchSessionPool:
+    return cast(SearchSessionPool, request.app.state.search_session_pool)
+
+
+async def get_public_http_client(
+    pool: SearchSessionPool = Depends(get_search_session_pool),
+) -> AsyncIterator[httpx.AsyncClient]:
+    """Lease an anonymous search client; it never carries an authenticated session."""
+    async with pool.acquire() as client:
+        yield client
+
+
+def get_rate_limiter(request: Request) -> TokenBucket:
+    return cast(TokenBucket, request.app.state.rate_limiter)
+
+
+def get_pool_metrics(request: Request) -> dict[str, PoolMetrics]:
+    return cast("dict[str, PoolMetrics]", request.app.state.pool_metrics)
+
+
+def get_hedger(request: Request) -> Hedger | None:
+    return cast("Hedger | None", request.app.state.hedger)
+
+
+def get_breakers(request: Request) -> CircuitBreakerRegistry:
+    return cast(CircuitBreakerRegistry, request.app.state.breakers)
+
+
+def get_retry_budget(request: Request) -> RetryBudget:
+    return cast(RetryBudget, request.app.state.retry_budget)
+
+
+def get_search_cache(request: Request) -> SearchCache:
+    return cast(SearchCache, request.app.state.search_cache)
+
+
+def get_gazette_cache(request: Request) -> GazetteRecordCache:
+    return cast(GazetteRecordCache, request.app.state.gazette_cache)
+
+
+def get_ocr_slots(request: Request) -> asyncio.Semaphore:
+    return cast(asyncio.Semaphore, request.app.state.ocr_slots)
+
+
+def get_flights(request: Request) -> SingleFlight:
+    return cast(SingleFlight, request.app.state.flights)
+
+
+def get_pdf_cache(request: Request) -> PDFCache | None:
+    return cast("PDFCache | None", request.app.state.pdf_cache)
+
+
+def get_page_index(request: Request) -> GazettePageIndex | None:
+    return cast("GazettePageIndex | None", request.app.state.page_index)
+
+
+def get_text_index(request: Request) -> GazetteTextIndex | None:
+    return cast("GazetteTextIndex | None", request.app.state.text_index)
+
+
+def get_prefetcher(request: Request) -> Prefetcher | None:
+    return cast("Prefetcher | None", request.app.state.prefetcher)
 
 
-def get_session_manager() -> SessionManager:
-    return _session_manager
+def get_job_queue(request: Request) -> JobQueue:
+    return cast(JobQueue, request.app.state.job_queue)
+
+
+def get_account_pool(request: Request) -> AccountPool:
+    return cast(AccountPool, request.app.state.account_pool)
+
+
+async def get_account(
+    pool: AccountPool = Depends(get_account_pool),
+) -> AsyncIterator[Account]:
+    """Lease one pooled TOBB account for the whole request."""
+    async with pool.acquire() as account:
+        yield account
 
 
 def get_captcha_handler(
-    client: httpx.AsyncClient = Depends(get_http_client),
+    client: httpx.AsyncClient = Depends(get_public_http_client),
     settings: Settings = Depends(get_settings),
+    retry_budget: RetryBudget = Depends(get_retry_budget),
 ) -> CaptchaHandler:
-    return CaptchaHandler(client=client, settings=settings)
+    return CaptchaHandler(client=client, settings=settings, retry_budget=retry_budget)
 
 
 def get_search_client(
-    client: httpx.AsyncClient = Depends(get_http_client),
+    client: httpx.AsyncClient = Depends(get_public_http_client),
     settings: Settings = Depends(get_settings),
     captcha: CaptchaHandler = Depends(get_captcha_handler),
 ) -> SearchClient:
@@ -48,28 +137,27 @@ def get_search_client(
 
 
 def get_auth_client(
-    client: httpx.AsyncClient = Depends(get_http_client),
+    account: Account = Depends(get_account),
     settings: Settings = Depends(get_settings),
-    captcha: CaptchaHandler = Depends(get_captcha_handler),
-    session_mgr: SessionManager = Depends(get_session_manager),
+    retry_budget: RetryBudget = Depends(get_retry_budget),
 ) -> AuthClient:
-    return AuthClient(
-        client=client, settings=settings, captcha_handler=captcha, session_manager=session_mgr
-    )
+    return build_auth_client(account, settings, retry_budget)
 
 
 def get_gazette_client(
-    client: httpx.AsyncClient = Depends(get_http_client),
+    account: Account = Depends(get_account),
     settings: Settings = Depends(get_settings),
+    cache: GazetteRecordCache = Depends(get_gazette_cache),
 ) -> GazetteClient:
-    return GazetteClient(client=client, settings=settings)
+    return build_gazette_client(account, settings, cache)
 
 
 def get_pdf_fetcher(
-    client: httpx.AsyncClient = Depends(get_http_client),
+    account: Account = Depends(get_account),
     settings: Settings = Depends(get_settings),
+    hedger: Hedger | None = Depends(get_hedger),
 ) -> PDFFetcher:
-    return PDFFetcher(client=client, settings=settings)
+    return PDFFetcher(client=account.client, settings=settings, hedger=hedger)
 
 
 def get_ocr_pipeline(settings: Settings = Depends(get_settings)) -> OCRPipeline:
@@ -80,9 +168,106 @@ def get_extractor(
     auth: AuthClient = Depends(get_auth_client),
     pdf_fetcher: PDFFetcher = Depends(get_pdf_fetcher),
     ocr: OCRPipeline = Depends(get_ocr_pipeline),
+    ocr_slots: asyncio.Semaphore = Depends(get_ocr_slots),
+    flights: SingleFlight = Depends(get_flights),
+    pdf_cache: PDFCache | None = Depends(get_pdf_cache),
+    page_index: GazettePageIndex | None = Depends(get_page_index),
+    gazette_cache: GazetteRecordCache = Depends(get_gazette_cache),
+    text_index: GazetteTextIndex | None = Depends(get_text_index),
 ) -> Extractor:
     return Extractor(
         auth_client=auth,
         pdf_fetcher=pdf_fetcher,
         ocr_pipeline=ocr,
+        ocr_slots=ocr_slots,
+        flights=flights,
+        pdf_cache=pdf_cache,
+        page_index=page_index,
+        gazette_cache=gazette_cache,
+        text_index=text_index,
     )
+
+
+def get_extractor_factory(
+    settings: Settings = Depends(get_settings),
+    retry_budget: RetryBudget = Depends(get_retry_budget),
+    hedger: Hedger | None = Depends(get_hedger),
+    ocr_slots: asyncio.Semaphore = Depends(get_ocr_slots),
+    flights: SingleFlight = Depends(get_flights),
+    pdf_cache: PDFCache | None = Depends(get_pdf_cache),
+    page_index: GazettePageIndex | None = Depends(get_page_index),
+    gazette_cache: GazetteRecordCache = Depends(get_gazette_cache),
+    text_index: GazetteTextIndex | None = Depends(get_text_index),
+) -> Callable[[Account], Extractor]:
+    """Return a builder for an Extractor on an account the caller leases later.
+
+    For streaming responses, which lease the account inside the response body
+    rather than for the request's dependency lifetime.
+    """
+
+    def build(account: Account) -> Extractor:
+        return Extractor(
+            auth_client=build_auth_client(account, settings, retry_budget),
+            pdf_fetcher=PDFFetcher(client=account.client, settings=settings, hedger=hedger),
+            ocr_pipeline=OCRPipeline(settings=settings),
+            ocr_slots=ocr_slots,
+            flights=flights,
+            pdf_cache=pdf_cache,
+            page_index=page_index,
+            gazette_cache=gazette_cache,
+            text_index=text_index,
+        )
+
+    return build
+
+
+def build_auth_client(
+    account: Account, settings: Settings, retry_budget: RetryBudget
+) -> AuthClient:
+    """Build an AuthClient on an already leased account outside of FastAPI's request scope."""
+    # Login captcha is bound to the PHP session, so it must use the account's cookie jar
+    captcha = CaptchaHandler(client=account.client, settings=settings, retry_budget=retry_budget)
+    return AuthClient(
+        client=account.client,
+        settings=settings,
+        captcha_handler=captcha,
+        session_manager=account.session,
+        account=account,
+        retry_budget=retry_budget,
+    )
+
+
+def build_gazette_client(
+    account: Account, settings: Settings, cache: GazetteRecordCache
+) -> GazetteClient:
+    """Build a GazetteClient on an already leased account outside of FastAPI's request scope."""
+    return GazetteClient(client=account.client, settings=settings, cache=cache)
+
+
+def build_extractor(state: State, settings: Settings, account: Account) -> Extractor:
+    """Build an Extractor on an already leased account outside of FastAPI's request scope.
+
+    `state` is the application state set up in the lifespan.
+    """
+    return Extractor(
+        auth_client=build_auth_client(account, settings, state.retry_budget),
+        pdf_fetcher=PDFFetcher(client=account.client, settings=settings, hedger=state.hedger),
+        ocr_pipeline=OCRPipeline(settings=settings),
+        ocr_slots=state.ocr_slots,
+        flights=state.flights,
+        pdf_cache=state.pdf_cache,
+        page_index=state.page_index,
+        gazette_cache=state.gazette_cache,
+        text_index=state.text_index,
+    )
+
+
+@asynccontextmanager
+async def lease_extractor(state: State, settings: Settings) -> AsyncIterator[Extractor]:
+    """Lease an account and build an Extractor on it for the duration of the block.
+
+    Used by streaming responses and background workers, which outlive the request's
+    dependency lifetime.
+    """
+    async with state.account_pool.acquire() as account:
+        yield build_extractor(state, settings, account)
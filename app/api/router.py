@@ -2,9 +2,12 @@ from __future__ import annotations
 
 from fastapi import APIRouter
 
-from app.api.v1 import extract, health, search
+from app.api.v1 import extract, health, jobs, notices, registry, search
 
 api_router = APIRouter(prefix="/api/v1")
 api_router.include_router(health.router, tags=["health"])
 api_router.include_router(search.router, tags=["search"])
+api_router.include_router(registry.router, tags=["registry"])
 api_router.include_router(extract.router, tags=["extract"])
+api_router.include_router(jobs.router, tags=["jobs"])
+api_router.include_router(notices.router, tags=["notices"])
@@ -1,12 +1,22 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from collections.abc import AsyncIterator
 
-from app.api.deps import get_extractor
-from app.schemas.requests import ExtractRequest
-from app.schemas.responses import ExtractResult
+from fastapi import APIRouter, Depends, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.datastructures import State
+
+from app.api.deps import get_extractor, get_gazette_cache, get_settings, lease_extractor
+from app.config import Settings
+from app.core.exceptions import TOBBBaseError
+from app.core.logging import get_logger
+from app.schemas.requests import BatchExtractRequest, ExtractRequest
+from app.schemas.responses import BatchExtractResponse, ExtractResult
 from app.services.extractor import Extractor
+from app.services.gazette_cache import GazetteRecordCache
+from app.services.gazette_client import filter_records
 
+logger = get_logger(__name__)
 router = APIRouter()
 
 
@@ -16,3 +26,96 @@ async def extract(
     extractor: Extractor = Depends(get_extractor),
 ) -> ExtractResult:
     return await extractor.extract_from_url(pdf_url=body.pdf_url)
+
+
+@router.post(
+    "/extract/batch",
+    response_model=BatchExtractResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def extract_batch(
+    body: BatchExtractRequest,
+    request: Request,
+    settings: Settings = Depends(get_settings),
+    gazette_cache: GazetteRecordCache = Depends(get_gazette_cache),
+) -> Response | BatchExtractResponse:
+    """Extract several PDFs over one session with per-URL results.
+
+    Duplicate URLs are processed once. With stream=true, each ExtractResult is sent
+    as an NDJSON line as soon as it completes; otherwise results come back together
+    in request order. A failure that stops the whole batch (e.g. login) is returned
+    as an error response; when streaming, each remaining URL gets an error line instead.
+
+    With ilan_turu/date_from/date_to set, URLs whose gazette record (known from an
+    earlier search) falls outside the filters are skipped before download and
+    listed in skipped; URLs with no known record are extracted as usual.
+    """
+    pdf_urls, skipped = _apply_filters(body, gazette_cache)
+    results = _run_batch(pdf_urls, settings, request.app.state)
+    if body.stream:
+        return StreamingResponse(
+            (
+                result.model_dump_json() + "\n"
+                async for result in _stream_results(results, pdf_urls)
+            ),
+            media_type="application/x-ndjson",
+        )
+
+    by_url = {result.source_pdf_url: result async for result in results}
+    ordered = [by_url[url] for url in pdf_urls]
+    return BatchExtractResponse(
+        total_processed=len(ordered),
+        successful=sum(1 for result in ordered if result.error is None),
+        results=ordered,
+        skipped=skipped,
+    )
+
+
+def _apply_filters(
+    body: BatchExtractRequest, cache: GazetteRecordCache
+) -> tuple[list[str], list[str]]:
+    """Split the deduplicated URLs into (to extract, skipped by the filters)."""
+    pdf_urls = list(dict.fromkeys(body.pdf_urls))
+    if not body.is_active:
+        return pdf_urls, []
+
+    kept: list[str] = []
+    skipped: list[str] = []
+    for url in pdf_urls:
+        record = cache.find_by_pdf_url(url)
+        matches = record is None or filter_records(
+            [record], ilan_turu=body.ilan_turu, date_from=body.date_from, date_to=body.date_to
+        )
+        (kept if matches else skipped).append(url)
+    if skipped:
+        logger.info("extract_batch_filtered", kept=len(kept), skipped=len(skipped))
+    return kept, skipped
+
+
+async def _stream_results(
+    results: AsyncIterator[ExtractResult], pdf_urls: list[str]
+) -> AsyncIterator[ExtractResult]:
+    """Pass results through; once headers are sent, a batch-wide error becomes per-URL lines."""
+    remaining = dict.fromkeys(pdf_urls)
+    try:
+        async for result in results:
+            remaining.pop(result.source_pdf_url or "", None)
+            yield result
+    except TOBBBaseError as exc:
+        logger.warning("extract_batch_stream_failed", error_code=exc.error_code, error=exc.message)
+        for url in remaining:
+            yield ExtractResult(source_pdf_url=url, error=exc.message)
+
+
+async def _run_batch(
+    pdf_urls: list[str],
+    settings: Settings,
+    state: State,
+) -> AsyncIterator[ExtractResult]:
+    if not pdf_urls:
+        return
+    async with lease_extractor(state, settings) as extractor:
+        async for result in extractor.extract_many(
+            pdf_urls, download_concurrency=settings.EXTRACT_DOWNLOAD_CONCURRENCY
+        ):
+            yield result
@@ -1,8 +1,31 @@
 from __future__ import annotations
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from app.schemas.responses import HealthResponse
+from app.api.deps import (
+    get_breakers,
+    get_hedger,
+    get_page_index,
+    get_pool_metrics,
+    get_rate_limiter,
+    get_retry_budget,
+)
+from app.clients.http_client import PoolMetrics
+from app.schemas.responses import (
+    BreakerStats,
+    HealthResponse,
+    HedgeStats,
+    HttpPoolStats,
+    PageIndexStats,
+    RateLimiterStats,
+    RetryBudgetStats,
+    StatsResponse,
+)
+from app.services.page_index import GazettePageIndex
+from app.utils.circuit_breaker import CircuitBreakerRegistry
+from app.utils.hedging import Hedger
+from app.utils.rate_limit import TokenBucket
+from app.utils.retry import RetryBudget
 
 router = APIRouter()
 
@@ -10,3 +33,63 @@ router = APIRouter()
 @router.get("/health", response_model=HealthResponse)
 async def health() -> HealthResponse:
     return HealthResponse()
+
+
+@router.get("/stats", response_model=StatsResponse)
+async def stats(
+    limiter: TokenBucket = Depends(get_rate_limiter),
+    pool_metrics: dict[str, PoolMetrics] = Depends(get_pool_metrics),
+    hedger: Hedger | None = Depends(get_hedger),
+    breakers: CircuitBreakerRegistry = Depends(get_breakers),
+    retry_budget: RetryBudget = Depends(get_retry_budget),
+    page_index: GazettePageIndex | None = Depends(get_page_index),
+) -> StatsResponse:
+    return StatsResponse(
+        rate_limiter=RateLimiterStats(
+            rate_per_second=round(limiter.rate, 3),
+            queue_depth=limiter.queue_depth,
+            available_tokens=round(limiter.available, 3),
+        ),
+        http_pools={name: _pool_stats(metrics) for name, metrics in pool_metrics.items()},
+        hedging=_hedge_stats(hedger) if hedger is not None else {},
+        circuit_breakers={
+            name: BreakerStats(state=breaker.state.value, rejected=breaker.rejected)
+            for name, breaker in breakers.breakers.items()
+        },
+        retry_budget=RetryBudgetStats(
+            requests=retry_budget.requests,
+            retries=retry_budget.retries,
+            denied=retry_budget.denied,
+            available=round(retry_budget.available, 3),
+        ),
+        page_index=_page_index_stats(page_index) if page_index is not None else None,
+    )
+
+
+def _pool_stats(metrics: PoolMetrics) -> HttpPoolStats:
+    return HttpPoolStats(
+        requests=metrics.requests,
+        new_connections=metrics.new_connections,
+        avg_wait_ms=round(1000 * metrics.total_wait / max(1, metrics.requests), 2),
+        max_wait_ms=round(1000 * metrics.max_wait, 2),
+        avg_connect_ms=round(1000 * metrics.total_connect / max(1, metrics.new_connections), 2),
+    )
+
+
+def _page_index_stats(page_index: GazettePageIndex) -> PageIndexStats:
+    pages, texts = page_index.counts()
+    return PageIndexStats(
+        pages=pages, texts=texts, page_hits=page_index.page_hits, hash_hits=page_index.hash_hits
+    )
+
+
+def _hedge_stats(hedger: Hedger) -> dict[str, HedgeStats]:
+    return {
+        kind: HedgeStats(
+            requests=stats.requests,
+            hedged=stats.hedged,
+            hedge_wins=stats.hedge_wins,
+            delay_ms=round(1000 * hedger.delay_for(kind), 2),
+        )
+        for kind, stats in hedger.stats.items()
+    }
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends
+
+from app.api.deps import get_job_queue
+from app.core.exceptions import NotFoundError
+from app.schemas.requests import ExtractJobRequest
+from app.schemas.responses import JobResponse
+from app.services.job_queue import JobQueue
+
+router = APIRouter()
+
+
+@router.post("/jobs/extract", response_model=JobResponse, status_code=202)
+async def create_extract_job(
+    body: ExtractJobRequest,
+    queue: JobQueue = Depends(get_job_queue),
+) -> JobResponse:
+    """Queue a PDF extraction and return its job id without waiting for OCR."""
+    callback_url = str(body.callback_url) if body.callback_url is not None else None
+    return await queue.submit(pdf_url=body.pdf_url, callback_url=callback_url)
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    queue: JobQueue = Depends(get_job_queue),
+) -> JobResponse:
+    job = queue.get(job_id)
+    if job is None:
+        raise NotFoundError(message=f"'{job_id}' isi bulunamadi", detail=f"job_id={job_id}")
+    return job
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends
+
+from app.api.deps import get_text_index
+from app.core.exceptions import FeatureDisabledError
+from app.core.logging import get_logger
+from app.schemas.requests import NoticeSearchRequest
+from app.schemas.responses import NoticeSearchHit, NoticeSearchResponse
+from app.services.text_index import GazetteTextIndex
+
+logger = get_logger(__name__)
+router = APIRouter()
+
+
+@router.post("/notices/search", response_model=NoticeSearchResponse)
+async def search_notices(
+    body: NoticeSearchRequest,
+    text_index: GazetteTextIndex | None = Depends(get_text_index),
+) -> NoticeSearchResponse:
+    """Full-text search over every gazette notice extracted so far.
+
+    Answered from the local index only, without contacting TOBB. Words match
+    regardless of case and Turkish characters ("artirimi" finds "ARTIRIMI" and
+    "artırımı"); all words must occur. ilan_turu and date_from/date_to narrow
+    the hits by the notice's gazette record, so notices extracted without a
+    known record only match unfiltered queries.
+
+    A notice answered from the page index is stored with the OCR text of its
+    whole gazette page, which also holds other companies' notices. A hit on such
+    a page is reported for every company extracted from it, even when the words
+    occur in another company's notice on that page.
+    """
+    if text_index is None:
+        raise FeatureDisabledError(
+            message="Metin indeksi devre disi", detail="TEXT_INDEX_DB_PATH ayarlanmamis"
+        )
+    hits = text_index.search(
+        body.query,
+        ilan_turu=body.ilan_turu,
+        date_from=body.date_from,
+        date_to=body.date_to,
+        limit=body.limit,
+    )
+    logger.info("notice_search_completed", query=body.query, result_count=len(hits))
+    return NoticeSearchResponse(
+        query=body.query,
+        total_results=len(hits),
+        results=[
+            NoticeSearchHit(
+                source_pdf_url=hit.pdf_url,
+                record=hit.record,
+                snippet=hit.snippet,
+                score=hit.score,
+                raw_text=hit.raw_text if body.include_text else None,
+            )
+            for hit in hits
+        ],
+    )
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends
+
+from app.api.deps import get_auth_client, get_gazette_client
+from app.core.exceptions import NotFoundError
+from app.core.logging import get_logger
+from app.schemas.requests import RegistryLookupRequest
+from app.schemas.responses import RegistryLookupResponse
+from app.services.auth_client import AuthClient
+from app.services.gazette_cache import gazette_date_sort_key
+from app.services.gazette_client import GazetteClient, filter_records
+from app.services.tsm_mapping import resolve_tsm_id
+
+logger = get_logger(__name__)
+router = APIRouter()
+
+
+@router.post("/registry/lookup", response_model=RegistryLookupResponse)
+async def registry_lookup(
+    body: RegistryLookupRequest,
+    auth_client: AuthClient = Depends(get_auth_client),
+    gazette_client: GazetteClient = Depends(get_gazette_client),
+) -> RegistryLookupResponse:
+    """Gazette announcements of a company known by registry office and number.
+
+    Skips the captcha'd trade-name search: the office is resolved locally and the
+    ilan goruntuleme page is queried directly, so a lookup costs one TOBB round
+    trip (none when the company's records are cached).
+    """
+    sicil_mudurlugu_id = body.sicil_mudurlugu_id or resolve_tsm_id(body.tsm or "")
+    if not sicil_mudurlugu_id:
+        raise NotFoundError(
+            message=f"'{body.tsm}' icin ticaret sicil mudurlugu bulunamadi",
+            detail=f"tsm={body.tsm}",
+        )
+    registry_no = body.registry_no.strip()
+
+    await auth_client.ensure_authenticated_with_retry(operation="registry_lookup")
+    records = await gazette_client.search_window(
+        sicil_mudurlugu_id, registry_no, date_from=body.date_from, date_to=body.date_to
+    )
+    records = filter_records(records, ilan_turu=body.ilan_turu)
+    records = sorted(records, key=gazette_date_sort_key, reverse=True)
+    logger.info(
+        "registry_lookup_completed",
+        sicil_mudurlugu_id=sicil_mudurlugu_id,
+        registry_no=registry_no,
+        result_count=len(records),
+    )
+    return RegistryLookupResponse(
+        sicil_mudurlugu_id=sicil_mudurlugu_id,
+        registry_no=registry_no,
+        total_results=len(records),
+        records=records,
+    )
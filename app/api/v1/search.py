@@ -2,21 +2,52 @@ from __future__ import annotations
 
 import asyncio
 import unicodedata
-from datetime import datetime
+from collections.abc import AsyncIterator, Awaitable, Callable
 
 import httpx
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import StreamingResponse
 from unicode_tr import unicode_tr as tr
 
-from app.api.deps import get_auth_client, get_gazette_client, get_search_client
-from app.core.exceptions import AuthError
+from app.api.deps import (
+    build_auth_client,
+    build_gazette_client,
+    get_account_pool,
+    get_auth_client,
+    get_extractor_factory,
+    get_gazette_cache,
+    get_gazette_client,
+    get_prefetcher,
+    get_retry_budget,
+    get_search_cache,
+    get_search_client,
+    get_search_session_pool,
+    get_settings,
+)
+from app.clients.account_pool import Account, AccountPool
+from app.clients.search_session_pool import SearchSessionPool
+from app.config import Settings
+from app.core.exceptions import TOBBBaseError, UpstreamUnavailableError
 from app.core.logging import get_logger
-from app.schemas.requests import SearchRequest
-from app.schemas.responses import GazetteRecord, SearchRecord, SearchResponse
+from app.schemas.enums import ErrorCode, LatestNoticeStage
+from app.schemas.requests import BatchSearchRequest, GazetteFilter, SearchRequest
+from app.schemas.responses import (
+    BatchSearchItem,
+    ExtractResult,
+    LatestNoticeEvent,
+    SearchRecord,
+    SearchResponse,
+)
 from app.services.auth_client import AuthClient
-from app.services.gazette_client import GazetteClient
+from app.services.captcha_handler import CaptchaHandler
+from app.services.extractor import Extractor
+from app.services.gazette_cache import GazetteRecordCache, gazette_date_sort_key
+from app.services.gazette_client import GazetteClient, filter_records
+from app.services.prefetcher import Prefetcher
+from app.services.search_cache import SearchCache, normalize_query_key
 from app.services.search_client import SearchClient
 from app.services.tsm_mapping import resolve_tsm_id
+from app.utils.retry import RetryBudget, is_upstream_failure
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -24,64 +55,32 @@ router = APIRouter()
 _RETRY_DELAY = 2.0
 
 
-def _date_sort_key(record: GazetteRecord) -> datetime:
-    """Parse yayin_tarihi (DD/MM/YYYY or DD.MM.YYYY) for sorting. Unknown dates go last."""
-    if not record.yayin_tarihi:
-        return datetime.min
-    try:
-        cleaned = record.yayin_tarihi.replace(".", "/")
-        return datetime.strptime(cleaned, "%d/%m/%Y")
-    except (ValueError, TypeError):
-        return datetime.min
-
-
 @router.post("/search", response_model=SearchResponse)
 async def search(
     body: SearchRequest,
     search_client: SearchClient = Depends(get_search_client),
     auth_client: AuthClient = Depends(get_auth_client),
     gazette_client: GazetteClient = Depends(get_gazette_client),
+    settings: Settings = Depends(get_settings),
+    search_cache: SearchCache = Depends(get_search_cache),
+    session_pool: SearchSessionPool = Depends(get_search_session_pool),
+    prefetcher: Prefetcher | None = Depends(get_prefetcher),
+    retry_budget: RetryBudget = Depends(get_retry_budget),
 ) -> SearchResponse:
     trade_name = unicodedata.normalize("NFC", body.trade_name)
 
-    results, total_records = await _search_with_retry(search_client, trade_name)
-
-    if not results:
-        return SearchResponse(
-            query=body.trade_name,
-            total_results=0,
-            total_records=total_records,
-            results=[],
-        )
+    results, total_records = await _cached_search(
+        search_cache,
+        trade_name,
+        search=lambda: _search_with_retry(search_client, trade_name, retry_budget),
+        refresh=lambda: _pooled_search(session_pool, settings, trade_name, retry_budget),
+    )
 
-    # Enrich with PDF URLs from ilan goruntuleme
-    try:
-        await auth_client.ensure_authenticated()
-    except AuthError:
-        logger.warning("search_enrich_auth_failed_retrying")
-        await auth_client.logout()
-        await auth_client.ensure_authenticated()
-
-    for record in results:
-        if not record.tsm or not record.registry_no:
-            continue
-        tsm_id = resolve_tsm_id(record.tsm)
-        if not tsm_id:
-            continue
-        try:
-            gazette_records = await gazette_client.search(
-                sicil_mudurlugu_id=tsm_id,
-                tic_sic_no=record.registry_no,
-            )
-            gazette_records = sorted(gazette_records, key=_date_sort_key, reverse=True)
-            record.pdf_urls = [gr.pdf_url for gr in gazette_records if gr.pdf_url]
-        except Exception:
-            logger.warning(
-                "gazette_enrich_failed",
-                title=record.title,
-                registry_no=record.registry_no,
-                exc_info=True,
-            )
+    if results:
+        await auth_client.ensure_authenticated_with_retry(operation="search_enrich")
+        await _enrich_results(results, gazette_client, settings, body)
+        if prefetcher is not None:
+            prefetcher.schedule(results)
 
     return SearchResponse(
         query=body.trade_name,
@@ -91,25 +90,385 @@ async def search(
     )
 
 
+@router.post(
+    "/search/batch",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def search_batch(
+    body: BatchSearchRequest,
+    settings: Settings = Depends(get_settings),
+    search_cache: SearchCache = Depends(get_search_cache),
+    gazette_cache: GazetteRecordCache = Depends(get_gazette_cache),
+    session_pool: SearchSessionPool = Depends(get_search_session_pool),
+    account_pool: AccountPool = Depends(get_account_pool),
+    prefetcher: Prefetcher | None = Depends(get_prefetcher),
+    retry_budget: RetryBudget = Depends(get_retry_budget),
+) -> StreamingResponse:
+    """Search many trade names; streams one BatchSearchItem JSON line per name as it finishes.
+
+    Names that normalize to the same query are searched once. Searches run on up to
+    SEARCH_BATCH_CONCURRENCY pooled anonymous sessions, and enrichment shares one
+    authenticated account for the whole batch.
+    """
+    groups: dict[str, list[str]] = {}
+    for name in body.trade_names:
+        groups.setdefault(normalize_query_key(name), []).append(name)
+
+    return StreamingResponse(
+        _stream_batch(
+            list(groups.values()),
+            settings,
+            search_cache,
+            gazette_cache,
+            session_pool,
+            account_pool,
+            retry_budget,
+            prefetcher,
+            body,
+        ),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.post(
+    "/search/latest",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def search_latest(
+    body: SearchRequest,
+    settings: Settings = Depends(get_settings),
+    retry_budget: RetryBudget = Depends(get_retry_budget),
+    search_cache: SearchCache = Depends(get_search_cache),
+    session_pool: SearchSessionPool = Depends(get_search_session_pool),
+    account_pool: AccountPool = Depends(get_account_pool),
+    gazette_cache: GazetteRecordCache = Depends(get_gazette_cache),
+    extractor_factory: Callable[[Account], Extractor] = Depends(get_extractor_factory),
+) -> StreamingResponse:
+    """Search a trade name and OCR the newest gazette notice of the top hit in one call.
+
+    Streams LatestNoticeEvent NDJSON lines. MATCH is sent as soon as the top hit's
+    gazette records are known, and its newest PDF is downloaded right away on the
+    same authenticated session; the remaining hits are enriched while it is
+    OCR'd. EXTRACT and SEARCH follow in completion order; an ERROR line ends the
+    stream, including when the top hit has no gazette notice.
+
+    With ilan_turu/date_from/date_to set, "newest" means the newest notice passing
+    those filters, so e.g. the latest capital change is fetched directly.
+    """
+    trade_name = unicodedata.normalize("NFC", body.trade_name)
+    return StreamingResponse(
+        _stream_latest(
+            trade_name,
+            settings,
+            retry_budget,
+            search_cache=search_cache,
+            session_pool=session_pool,
+            account_pool=account_pool,
+            gazette_cache=gazette_cache,
+            extractor_factory=extractor_factory,
+            filters=body,
+        ),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.delete("/search/cache", status_code=204)
+async def invalidate_search_cache(
+    trade_name: str = Query(..., min_length=2, max_length=500),
+    search_cache: SearchCache = Depends(get_search_cache),
+) -> Response:
+    """Drop cached (including not-found) results for a trade name."""
+    search_cache.invalidate(unicodedata.normalize("NFC", trade_name))
+    return Response(status_code=204)
+
+
+async def _stream_batch(
+    groups: list[list[str]],
+    settings: Settings,
+    search_cache: SearchCache,
+    gazette_cache: GazetteRecordCache,
+    session_pool: SearchSessionPool,
+    account_pool: AccountPool,
+    retry_budget: RetryBudget,
+    prefetcher: Prefetcher | None = None,
+    filters: GazetteFilter | None = None,
+) -> AsyncIterator[str]:
+    semaphore = asyncio.Semaphore(settings.SEARCH_BATCH_CONCURRENCY)
+    auth_lock = asyncio.Lock()
+
+    async with account_pool.acquire() as account:
+        auth_client = build_auth_client(account, settings, retry_budget)
+        gazette_client = build_gazette_client(account, settings, gazette_cache)
+
+        async def run(names: list[str]) -> list[BatchSearchItem]:
+            trade_name = unicodedata.normalize("NFC", names[0])
+            try:
+                async with semaphore:
+                    results, total = await _cached_search(
+                        search_cache,
+                        trade_name,
+                        search=lambda: _pooled_search(
+                            session_pool, settings, trade_name, retry_budget
+                        ),
+                        refresh=lambda: _pooled_search(
+                            session_pool, settings, trade_name, retry_budget
+                        ),
+                    )
+                    if results:
+                        async with auth_lock:
+                            await auth_client.ensure_authenticated_with_retry(
+                                operation="search_enrich"
+                            )
+                        await _enrich_results(results, gazette_client, settings, filters)
+                        if prefetcher is not None:
+                            prefetcher.schedule(results)
+            except TOBBBaseError as exc:
+                return [
+                    BatchSearchItem(
+                        query=name, error_code=ErrorCode(exc.error_code), error=exc.message
+                    )
+                    for name in names
+                ]
+            except Exception as exc:
+                logger.warning("batch_search_item_failed", query=trade_name, exc_info=True)
+                return [
+                    BatchSearchItem(query=name, error_code=ErrorCode.INTERNAL_ERROR, error=str(exc))
+                    for name in names
+                ]
+            return [
+                BatchSearchItem(
+                    query=name,
+                    result=SearchResponse(
+                        query=name,
+                        total_results=len(results),
+                        total_records=total,
+                        results=results,
+                    ),
+                )
+                for name in names
+            ]
+
+        tasks = [asyncio.create_task(run(names)) for names in groups]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                for item in await next_done:
+                    yield item.model_dump_json() + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+async def _stream_latest(
+    trade_name: str,
+    settings: Settings,
+    retry_budget: RetryBudget,
+    *,
+    search_cache: SearchCache,
+    session_pool: SearchSessionPool,
+    account_pool: AccountPool,
+    gazette_cache: GazetteRecordCache,
+    extractor_factory: Callable[[Account], Extractor],
+    filters: GazetteFilter | None = None,
+) -> AsyncIterator[str]:
+    def line(event: LatestNoticeEvent) -> str:
+        return event.model_dump_json(exclude_none=True) + "\n"
+
+    def error(code: ErrorCode, message: str) -> str:
+        return line(
+            LatestNoticeEvent(stage=LatestNoticeStage.ERROR, error_code=code, error=message)
+        )
+
+    try:
+        results, total = await _cached_search(
+            search_cache,
+            trade_name,
+            search=lambda: _pooled_search(session_pool, settings, trade_name, retry_budget),
+            refresh=lambda: _pooled_search(session_pool, settings, trade_name, retry_budget),
+        )
+    except TOBBBaseError as exc:
+        yield error(ErrorCode(exc.error_code), exc.message)
+        return
+    except httpx.HTTPError as exc:
+        # The response is already 200 once streaming starts, so the failure goes in a line
+        logger.warning("search_latest_upstream_failed", error=str(exc))
+        yield error(ErrorCode.UPSTREAM_UNAVAILABLE, "TOBB arama servisine ulasilamiyor")
+        return
+    if not results:
+        yield error(ErrorCode.NOT_FOUND, f"'{trade_name}' icin sonuc bulunamadi")
+        return
+
+    async with account_pool.acquire() as account:
+        auth_client = build_auth_client(account, settings, retry_budget)
+        gazette_client = build_gazette_client(account, settings, gazette_cache)
+        try:
+            await auth_client.ensure_authenticated_with_retry(operation="search_enrich")
+        except TOBBBaseError as exc:
+            yield error(ErrorCode(exc.error_code), exc.message)
+            return
+
+        top, rest = results[0], results[1:]
+        rest_task = asyncio.create_task(_enrich_results(rest, gazette_client, settings, filters))
+        extract_task: asyncio.Task[ExtractResult] | None = None
+        try:
+            await _enrich_results([top], gazette_client, settings, filters)
+            yield line(LatestNoticeEvent(stage=LatestNoticeStage.MATCH, record=top))
+            if not top.pdf_urls:
+                # ERROR ends the stream; the remaining hits are not waited for
+                yield error(ErrorCode.NOT_FOUND, f"'{top.title}' icin gazete ilani bulunamadi")
+                return
+            extractor = extractor_factory(account)
+            extract_task = asyncio.create_task(extractor.extract_from_url(top.pdf_urls[0]))
+
+            pending: set[asyncio.Task[object]] = {rest_task, extract_task}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                if extract_task in done:
+                    yield line(
+                        LatestNoticeEvent(
+                            stage=LatestNoticeStage.EXTRACT, extract=extract_task.result()
+                        )
+                    )
+                if rest_task in done:
+                    search = SearchResponse(
+                        query=trade_name,
+                        total_results=len(results),
+                        total_records=total,
+                        results=results,
+                    )
+                    yield line(LatestNoticeEvent(stage=LatestNoticeStage.SEARCH, search=search))
+        finally:
+            for task in (rest_task, extract_task):
+                if task is not None:
+                    task.cancel()
+
+
+async def _pooled_search(
+    pool: SearchSessionPool,
+    settings: Settings,
+    trade_name: str,
+    retry_budget: RetryBudget,
+) -> tuple[list[SearchRecord], int]:
+    """Run the retry ladder on a freshly leased anonymous session."""
+    async with pool.acquire() as http:
+        client = SearchClient(
+            client=http,
+            settings=settings,
+            captcha_handler=CaptchaHandler(
+                client=http, settings=settings, retry_budget=retry_budget
+            ),
+        )
+        return await _search_with_retry(client, trade_name, retry_budget)
+
+
+async def _cached_search(
+    cache: SearchCache,
+    trade_name: str,
+    search: Callable[[], Awaitable[tuple[list[SearchRecord], int]]],
+    refresh: Callable[[], Awaitable[tuple[list[SearchRecord], int]]],
+) -> tuple[list[SearchRecord], int]:
+    """Serve from the search cache; stale hits are returned and refreshed in the background.
+
+    Queries that recently exhausted the retry ladder are answered from the negative cache.
+    """
+    if cache.is_known_missing(trade_name):
+        logger.info("search_negative_cache_hit", query=trade_name)
+        return [], 0
+
+    cached = cache.get(trade_name)
+    if cached is not None:
+        logger.info("search_cache_hit", query=trade_name, stale=cached.stale)
+        if cached.stale:
+            cache.refresh_in_background(trade_name, refresh)
+        return cached.results, cached.total
+
+    results, total = await search()
+    if results:
+        cache.put(trade_name, results, total)
+    else:
+        cache.put_negative(trade_name, _ascii_to_turkish_upper(trade_name))
+    return results, total
+
+
+async def _enrich_results(
+    results: list[SearchRecord],
+    gazette_client: GazetteClient,
+    settings: Settings,
+    filters: GazetteFilter | None = None,
+) -> None:
+    """Fill pdf_urls for all records concurrently, keeping only notices that pass filters.
+
+    At most SEARCH_ENRICH_CONCURRENCY gazette lookups run at once; request pacing comes
+    from the shared rate limiter on the transport. A record that fails or exceeds
+    SEARCH_ENRICH_TIMEOUT keeps empty pdf_urls instead of delaying the response.
+    """
+    semaphore = asyncio.Semaphore(settings.SEARCH_ENRICH_CONCURRENCY)
+
+    async def enrich(record: SearchRecord) -> None:
+        async with semaphore:
+            try:
+                await asyncio.wait_for(
+                    _enrich_record(record, gazette_client, filters),
+                    timeout=settings.SEARCH_ENRICH_TIMEOUT,
+                )
+            except TimeoutError:
+                logger.warning(
+                    "gazette_enrich_timeout",
+                    title=record.title,
+                    registry_no=record.registry_no,
+                    timeout=settings.SEARCH_ENRICH_TIMEOUT,
+                )
+            except Exception:
+                logger.warning(
+                    "gazette_enrich_failed",
+                    title=record.title,
+                    registry_no=record.registry_no,
+                    exc_info=True,
+                )
+
+    await asyncio.gather(*(enrich(record) for record in results))
+
+
+async def _enrich_record(
+    record: SearchRecord,
+    gazette_client: GazetteClient,
+    filters: GazetteFilter | None = None,
+) -> None:
+    """Set pdf_urls to the record's notices, newest first.
+
+    A date window is sent to TOBB as Tarih1/Tarih2 unless the company's records
+    are cached; notice types are matched locally.
+    """
+    if not record.tsm or not record.registry_no:
+        return
+    tsm_id = resolve_tsm_id(record.tsm)
+    if not tsm_id:
+        return
+    filters = filters or GazetteFilter()
+    gazette_records = await gazette_client.search_window(
+        tsm_id, record.registry_no, date_from=filters.date_from, date_to=filters.date_to
+    )
+    gazette_records = filter_records(gazette_records, ilan_turu=filters.ilan_turu)
+    gazette_records = sorted(gazette_records, key=gazette_date_sort_key, reverse=True)
+    record.pdf_urls = [gr.pdf_url for gr in gazette_records if gr.pdf_url]
+
+
 async def _search_with_retry(
     client: SearchClient,
     trade_name: str,
+    retry_budget: RetryBudget,
 ) -> tuple[list[SearchRecord], int]:
     """Search with retries: try original text twice, then I→İ fallback twice.
 
-    Returns empty list if no results found.
+    Returns empty list if no results found. Empty results and 404s are answers
+    from TOBB and are repeated for free; a repeat after a transport error or 5xx
+    spends a retry-budget token. An upstream failure on the last attempt or an
+    exhausted budget raises UpstreamUnavailableError instead of caching a false miss.
     """
-    for attempt in range(1, 3):
-        try:
-            results, total = await client.search(trade_name)
-            if results:
-                return results, total
-        except httpx.HTTPStatusError as exc:
-            if exc.response.status_code != 404:
-                raise
-        if attempt < 2:
-            logger.info("search_failed_retrying", attempt=attempt, query=trade_name)
-            await asyncio.sleep(_RETRY_DELAY)
+    results, total = await _search_twice(client, trade_name, retry_budget, "search_failed_retrying")
+    if results:
+        return results, total
 
     # Fallback: aggressive I→İ conversion
     turkish = _ascii_to_turkish_upper(trade_name)
@@ -118,19 +477,37 @@ async def _search_with_retry(
         return [], 0
 
     logger.info("retrying_search_with_turkish_upper", original=trade_name, turkish=turkish)
+    results, total = await _search_twice(client, turkish, retry_budget, "search_fallback_retrying")
+    if results:
+        return results, total
+
+    logger.info("search_not_found", query=trade_name)
+    return [], 0
+
+
+async def _search_twice(
+    client: SearchClient,
+    query: str,
+    retry_budget: RetryBudget,
+    retry_event: str,
+) -> tuple[list[SearchRecord], int]:
     for attempt in range(1, 3):
         try:
-            results, total = await client.search(turkish)
+            results, total = await client.search(query)
             if results:
                 return results, total
-        except httpx.HTTPStatusError as exc:
-            if exc.response.status_code != 404:
+        except httpx.HTTPError as exc:
+            if is_upstream_failure(exc):
+                if attempt == 2:
+                    raise UpstreamUnavailableError(
+                        message="TOBB arama servisine ulasilamiyor", detail=str(exc)
+                    ) from exc
+                retry_budget.spend(operation="search")
+            elif not isinstance(exc, httpx.HTTPStatusError) or exc.response.status_code != 404:
                 raise
         if attempt < 2:
-            logger.info("search_fallback_retrying", attempt=attempt, query=turkish)
+            logger.info(retry_event, attempt=attempt, query=query)
             await asyncio.sleep(_RETRY_DELAY)
-
-    logger.info("search_not_found", query=trade_name)
     return [], 0
 
 
@@ -0,0 +1,148 @@
+"""Pool of TOBB member accounts, each with its own session, cookie jar and rate budget.
+
+Requests that need an authenticated session lease an account from the pool.
+The least-loaded healthy account is chosen; accounts whose logins keep failing
+are quarantined for a while so traffic shifts to the remaining ones.
+
+Leases are shared, not exclusive: several requests may run on one account and
+its session at the same time. Login, probe and logout on an account are
+serialised through its auth_lock so they do not race each other.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import httpx
+from pydantic import SecretStr
+
+from app.clients.http_client import PoolMetrics, close_http_client, create_http_client
+from app.clients.session_manager import SessionManager
+from app.config import Settings
+from app.core.exceptions import AuthError
+from app.core.logging import get_logger
+from app.utils.circuit_breaker import CircuitBreakerRegistry
+from app.utils.rate_limit import TokenBucket
+from app.utils.retry import RetryBudget
+
+logger = get_logger(__name__)
+
+
+class Account:
+    """A single TOBB login with its own HTTP client, session state and token bucket."""
+
+    def __init__(
+        self,
+        email: str,
+        password: SecretStr,
+        client: httpx.AsyncClient,
+        limiter: TokenBucket,
+        quarantine_after: int,
+        quarantine_seconds: float,
+    ) -> None:
+        self.email = email
+        self.password = password
+        self.client = client
+        self.limiter = limiter
+        self._quarantine_after = quarantine_after
+        self._quarantine_seconds = quarantine_seconds
+        self.session = SessionManager()
+        # Shared by every AuthClient built on this account; see AuthClient
+        self.auth_lock = asyncio.Lock()
+        self.in_flight = 0
+        self.auth_failures = 0
+        self.quarantined_until = 0.0
+
+    @property
+    def is_quarantined(self) -> bool:
+        return time.monotonic() < self.quarantined_until
+
+    def record_auth_success(self) -> None:
+        self.auth_failures = 0
+
+    def record_auth_failure(self) -> None:
+        """Count a failed login; quarantine the account after too many in a row."""
+        self.auth_failures += 1
+        if self.auth_failures < self._quarantine_after:
+            return
+        self.quarantined_until = time.monotonic() + self._quarantine_seconds
+        self.auth_failures = 0
+        self.session.invalidate()
+        self.client.cookies.clear()
+        logger.warning("account_quarantined", email=self.email, seconds=self._quarantine_seconds)
+
+
+class AccountPool:
+    """Schedules authenticated work onto the least-loaded, non-quarantined account."""
+
+    def __init__(self, accounts: list[Account]) -> None:
+        self._accounts = accounts
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: Settings,
+        global_limiter: TokenBucket | None = None,
+        metrics: PoolMetrics | None = None,
+        breakers: CircuitBreakerRegistry | None = None,
+        retry_budget: RetryBudget | None = None,
+    ) -> AccountPool:
+        """Build one client per configured account, all sharing the global limiter."""
+        shared = [global_limiter] if global_limiter is not None else []
+        accounts: list[Account] = []
+        for creds in settings.credentials():
+            limiter = TokenBucket(
+                rate=settings.ACCOUNT_RATE_PER_SECOND, capacity=settings.ACCOUNT_BURST
+            )
+            accounts.append(
+                Account(
+                    email=creds.email,
+                    password=creds.password,
+                    client=create_http_client(
+                        settings,
+                        limiters=[limiter, *shared],
+                        max_connections=settings.AUTH_HTTP_MAX_CONNECTIONS,
+                        metrics=metrics,
+                        breakers=breakers,
+                        retry_budget=retry_budget,
+                    ),
+                    limiter=limiter,
+                    quarantine_after=settings.ACCOUNT_QUARANTINE_AFTER_FAILURES,
+                    quarantine_seconds=settings.ACCOUNT_QUARANTINE_SECONDS,
+                )
+            )
+        return cls(accounts)
+
+    @property
+    def accounts(self) -> list[Account]:
+        return list(self._accounts)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Account]:
+        """Lease the least-loaded healthy account for the duration of the block.
+
+        The lease is shared: other holders may be using the same account and
+        session concurrently, so holders must not log out on their own.
+        """
+        account = self._pick()
+        account.in_flight += 1
+        try:
+            yield account
+        finally:
+            account.in_flight -= 1
+
+    async def aclose(self) -> None:
+        for account in self._accounts:
+            await close_http_client(account.client)
+
+    def _pick(self) -> Account:
+        healthy = [a for a in self._accounts if not a.is_quarantined]
+        if not healthy:
+            raise AuthError(
+                message="Kullanilabilir TOBB hesabi yok",
+                detail=f"{len(self._accounts)} hesap karantinada",
+            )
+        return min(healthy, key=lambda a: (a.in_flight, -a.limiter.available))
@@ -1,24 +1,242 @@
 from __future__ import annotations
 
+import asyncio
+import importlib.util
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
 import httpx
 
 from app.config import Settings
+from app.core.logging import get_logger
+from app.utils.circuit_breaker import CircuitBreakerRegistry
+from app.utils.rate_limit import TokenBucket
+from app.utils.retry import RetryBudget
 from app.utils.ua_rotation import get_random_ua
 
+logger = get_logger(__name__)
+
+_SLOW_POOL_WAIT_SECONDS = 1.0
+_PREWARM_TIMEOUT_SECONDS = 10.0
+
+
+@dataclass
+class PoolMetrics:
+    """Connection-pool timings for a group of clients, fed by PoolTimingTransport."""
+
+    requests: int = 0
+    new_connections: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    total_connect: float = 0.0
+
+    def record(self, wait: float, connect: float | None) -> None:
+        self.requests += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        if connect is not None:
+            self.new_connections += 1
+            self.total_connect += connect
+
+
+class PoolTimingTransport(httpx.AsyncBaseTransport):
+    """Measures how long each request waits for a pooled connection.
+
+    Uses httpcore's trace extension: the wait is the time until the first
+    connection event (a new TCP connect, or sending headers on a reused
+    connection). Connect + TLS time is recorded separately for new connections.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, metrics: PoolMetrics) -> None:
+        self._transport = transport
+        self._metrics = metrics
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.monotonic()
+        marks: dict[str, float] = {}
+        outer_trace = request.extensions.get("trace")
+
+        async def trace(name: str, info: dict[str, Any]) -> None:
+            now = time.monotonic()
+            if name.endswith(".started"):
+                marks.setdefault("first", now)
+            if name == "connection.connect_tcp.started":
+                marks["connect"] = now
+            elif name.endswith("send_request_headers.started"):
+                marks.setdefault("sent", now)
+            if outer_trace is not None:
+                await outer_trace(name, info)
+
+        request.extensions["trace"] = trace
+        try:
+            return await self._transport.handle_async_request(request)
+        finally:
+            wait = marks.get("first", time.monotonic()) - started
+            connect = (
+                marks["sent"] - marks["connect"] if "connect" in marks and "sent" in marks else None
+            )
+            self._metrics.record(wait, connect)
+            if wait > _SLOW_POOL_WAIT_SECONDS:
+                logger.warning("http_pool_wait_slow", url=str(request.url), wait=round(wait, 3))
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper that takes a token from each bucket before every outbound request.
+
+    Buckets are acquired in order, so the narrowest (per-account) budget should come
+    first and the shared global one last. Each response's status and latency is fed
+    back to the buckets so adaptive limiters can adjust their rate.
+    """
+
+    def __init__(
+        self, transport: httpx.AsyncBaseTransport, limiters: Sequence[TokenBucket]
+    ) -> None:
+        self._transport = transport
+        self._limiters = limiters
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        for limiter in self._limiters:
+            await limiter.acquire()
+        started = time.monotonic()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except httpx.TransportError:
+            self._record(None, time.monotonic() - started)
+            raise
+        self._record(response.status_code, time.monotonic() - started)
+        return response
 
-def create_http_client(settings: Settings) -> httpx.AsyncClient:
-    transport = httpx.AsyncHTTPTransport(
+    def _record(self, status_code: int | None, latency: float) -> None:
+        for limiter in self._limiters:
+            limiter.record(status_code, latency)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class CircuitBreakerTransport(httpx.AsyncBaseTransport):
+    """Outermost transport: rejects requests to an endpoint class whose breaker is open.
+
+    Sits above the rate limiter so a rejected request never waits for a token. 5xx
+    responses and transport errors count as failures; a local pool timeout says
+    nothing about TOBB and is ignored. Every request that goes out is also counted
+    toward the retry budget.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        breakers: CircuitBreakerRegistry,
+        retry_budget: RetryBudget | None = None,
+    ) -> None:
+        self._transport = transport
+        self._breakers = breakers
+        self._retry_budget = retry_budget
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        breaker = self._breakers.for_url(request.url)
+        breaker.before_request()
+        if self._retry_budget is not None:
+            self._retry_budget.record_request()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except httpx.PoolTimeout:
+            breaker.release_probe()
+            raise
+        except httpx.TransportError:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.release_probe()
+            raise
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def create_http_client(
+    settings: Settings,
+    limiters: Sequence[TokenBucket] = (),
+    max_connections: int = 100,
+    metrics: PoolMetrics | None = None,
+    breakers: CircuitBreakerRegistry | None = None,
+    retry_budget: RetryBudget | None = None,
+) -> httpx.AsyncClient:
+    """Build an AsyncClient with its own cookie jar and connection pool.
+
+    Public (anonymous) search and each authenticated account get separate clients,
+    so a public search can never overwrite a logged-in PHPSESSID. Pool-wait timing is
+    measured below the rate limiter, so time spent waiting for a token is not counted.
+    The circuit breakers, when given, wrap everything else.
+    """
+    transport: httpx.AsyncBaseTransport = httpx.AsyncHTTPTransport(
         retries=settings.MAX_RETRIES,
         verify=settings.VERIFY_SSL,
+        http2=_http2_enabled(settings),
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=min(max_connections, settings.HTTP_MAX_KEEPALIVE_CONNECTIONS),
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        ),
     )
+    if metrics is not None:
+        transport = PoolTimingTransport(transport, metrics)
+    if limiters:
+        transport = RateLimitedTransport(transport, limiters)
+    if breakers is not None:
+        transport = CircuitBreakerTransport(transport, breakers, retry_budget)
     return httpx.AsyncClient(
         transport=transport,
-        timeout=httpx.Timeout(settings.REQUEST_TIMEOUT),
+        timeout=httpx.Timeout(settings.REQUEST_TIMEOUT, pool=settings.HTTP_POOL_TIMEOUT),
         verify=settings.VERIFY_SSL,
         headers={"User-Agent": get_random_ua()},
         follow_redirects=True,
     )
 
 
+def _http2_enabled(settings: Settings) -> bool:
+    return settings.HTTP2_ENABLED and _h2_installed()
+
+
+@lru_cache
+def _h2_installed() -> bool:
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("http2_unavailable", reason="h2 paketi kurulu degil, HTTP/1.1 kullaniliyor")
+        return False
+    return True
+
+
+async def prewarm_http_clients(clients: Sequence[httpx.AsyncClient], url: str) -> int:
+    """Open (and TLS-handshake) one pooled connection per client ahead of real traffic.
+
+    Any response counts as success; failures are logged and ignored. Returns the
+    number of clients that got a connection.
+    """
+
+    async def warm(client: httpx.AsyncClient) -> bool:
+        try:
+            await client.head(url, timeout=_PREWARM_TIMEOUT_SECONDS)
+            return True
+        except httpx.HTTPError as exc:
+            logger.debug("http_prewarm_failed", url=url, error=str(exc))
+            return False
+
+    results = await asyncio.gather(*(warm(client) for client in clients))
+    warmed = sum(results)
+    logger.info("http_prewarm_done", clients=len(clients), warmed=warmed)
+    return warmed
+
+
 async def close_http_client(client: httpx.AsyncClient) -> None:
     await client.aclose()
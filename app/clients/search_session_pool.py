@@ -0,0 +1,75 @@
+"""Pool of anonymous HTTP clients for public trade-name search.
+
+The search captcha is stored in the PHP session, so two searches sharing a
+cookie jar would overwrite each other's captcha. Each lease gets exclusive
+use of one client (its own cookie jar), letting several searches run in
+parallel without interfering.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
+
+import httpx
+
+from app.clients.http_client import PoolMetrics, close_http_client, create_http_client
+from app.config import Settings
+from app.utils.circuit_breaker import CircuitBreakerRegistry
+from app.utils.rate_limit import TokenBucket
+from app.utils.retry import RetryBudget
+
+
+class SearchSessionPool:
+    """Hands out anonymous clients one lease at a time; waits when all are busy."""
+
+    def __init__(self, clients: Sequence[httpx.AsyncClient]) -> None:
+        self._clients = list(clients)
+        self._idle: asyncio.Queue[httpx.AsyncClient] = asyncio.Queue()
+        for client in self._clients:
+            self._idle.put_nowait(client)
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: Settings,
+        global_limiter: TokenBucket | None = None,
+        metrics: PoolMetrics | None = None,
+        breakers: CircuitBreakerRegistry | None = None,
+        retry_budget: RetryBudget | None = None,
+    ) -> SearchSessionPool:
+        limiters = [global_limiter] if global_limiter is not None else []
+        return cls(
+            [
+                create_http_client(
+                    settings,
+                    limiters=limiters,
+                    max_connections=settings.PUBLIC_HTTP_MAX_CONNECTIONS,
+                    metrics=metrics,
+                    breakers=breakers,
+                    retry_budget=retry_budget,
+                )
+                for _ in range(max(1, settings.SEARCH_SESSION_POOL_SIZE))
+            ]
+        )
+
+    @property
+    def size(self) -> int:
+        return len(self._clients)
+
+    @property
+    def clients(self) -> list[httpx.AsyncClient]:
+        return list(self._clients)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[httpx.AsyncClient]:
+        client = await self._idle.get()
+        try:
+            yield client
+        finally:
+            self._idle.put_nowait(client)
+
+    async def aclose(self) -> None:
+        for client in self._clients:
+            await close_http_client(client)
@@ -14,6 +14,7 @@ class SessionManager:
 
     def __init__(self) -> None:
         self._authenticated_at: float | None = None
+        self._validated_at: float | None = None
 
     @property
     def is_authenticated(self) -> bool:
@@ -23,13 +24,33 @@ class SessionManager:
         if elapsed > SESSION_TTL_SECONDS:
             logger.info("session_expired", elapsed_seconds=elapsed)
             self._authenticated_at = None
+            self._validated_at = None
             return False
         return True
 
+    def needs_probe(self, probe_after_seconds: float, probe_cache_seconds: float) -> bool:
+        """True if the session is old enough that TOBB may have dropped it server-side.
+
+        Fresh sessions are trusted; older ones are trusted for probe_cache_seconds
+        after the last successful probe.
+        """
+        if self._authenticated_at is None:
+            return False
+        now = time.monotonic()
+        if now - self._authenticated_at < probe_after_seconds:
+            return False
+        return self._validated_at is None or now - self._validated_at >= probe_cache_seconds
+
     def mark_authenticated(self) -> None:
         self._authenticated_at = time.monotonic()
+        self._validated_at = self._authenticated_at
         logger.info("session_authenticated")
 
+    def mark_validated(self) -> None:
+        self._validated_at = time.monotonic()
+        logger.debug("session_validated")
+
     def invalidate(self) -> None:
         self._authenticated_at = None
+        self._validated_at = None
         logger.info("session_invalidated")
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
-from pydantic import SecretStr
+from pydantic import BaseModel, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class TOBBCredentials(BaseModel):
+    email: str
+    password: SecretStr
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
@@ -11,6 +16,33 @@ class Settings(BaseSettings):
     TOBB_BASE_URL: str = "https://www.ticaretsicil.gov.tr"
     TOBB_LOGIN_EMAIL: str = ""
     TOBB_LOGIN_PASSWORD: SecretStr = SecretStr("")
+    # JSON list of {"email": ..., "password": ...}; overrides the single login above
+    TOBB_ACCOUNTS: list[TOBBCredentials] = []
+
+    # Account pool
+    ACCOUNT_RATE_PER_SECOND: float = 1.0
+    ACCOUNT_BURST: int = 3
+    ACCOUNT_QUARANTINE_AFTER_FAILURES: int = 2
+    ACCOUNT_QUARANTINE_SECONDS: int = 300
+
+    # Search enrichment
+    SEARCH_ENRICH_CONCURRENCY: int = 4
+    SEARCH_ENRICH_TIMEOUT: float = 15.0
+
+    # Per-company gazette record cache
+    GAZETTE_CACHE_FRESH_SECONDS: int = 600
+    GAZETTE_CACHE_MAX_ENTRIES: int = 5000
+
+    # Public search sessions and batch search
+    SEARCH_SESSION_POOL_SIZE: int = 8
+    SEARCH_BATCH_CONCURRENCY: int = 4
+
+    # Search result cache (TTL 0 disables)
+    SEARCH_CACHE_TTL: int = 3600
+    SEARCH_CACHE_STALE_TTL: int = 86400
+    SEARCH_CACHE_MAX_ENTRIES: int = 1000
+    SEARCH_CACHE_DIR: str = ""  # optional on-disk tier
+    SEARCH_NEGATIVE_CACHE_TTL: int = 300  # not-found queries (0 disables)
 
     # HTTP
     REQUEST_TIMEOUT: int = 30
@@ -18,16 +50,59 @@ class Settings(BaseSettings):
     BACKOFF_FACTOR: float = 0.5
     VERIFY_SSL: bool = False
     RATE_LIMIT_DELAY: float = 1.0
+    # Shared adaptive (AIMD) budget for all outbound TOBB requests
+    TOBB_GLOBAL_RATE_PER_SECOND: float = 4.0  # starting rate
+    TOBB_GLOBAL_BURST: int = 8
+    TOBB_RATE_MIN_PER_SECOND: float = 0.5
+    TOBB_RATE_MAX_PER_SECOND: float = 10.0
+    TOBB_RATE_INCREASE_STEP: float = 0.1
+    TOBB_RATE_DECREASE_FACTOR: float = 0.5
+    TOBB_RATE_LATENCY_THRESHOLD: float = 5.0
+    PUBLIC_HTTP_MAX_CONNECTIONS: int = 10  # per anonymous search client
+    AUTH_HTTP_MAX_CONNECTIONS: int = 10  # per authenticated account client
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10  # idle connections kept per client
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0  # seconds an idle connection is kept open
+    HTTP_POOL_TIMEOUT: float = 10.0  # max wait for a free pooled connection
+    HTTP2_ENABLED: bool = False  # needs the optional h2 package (pip install ".[http2]")
+    HTTP_PREWARM: bool = True  # open connections to TOBB_BASE_URL at startup
+
+    # Request hedging for idempotent GETs (PDF downloads)
+    HEDGE_ENABLED: bool = False
+    HEDGE_PERCENTILE: float = 95.0  # hedge after this latency percentile
+    HEDGE_MIN_DELAY: float = 2.0  # seconds; floor, and the delay until enough samples exist
+    HEDGE_MAX_RATIO: float = 0.1  # max fraction of requests that may be hedged
+
+    # Circuit breakers (per TOBB endpoint class) and retry budget
+    BREAKER_FAILURE_THRESHOLD: int = 5  # consecutive failures that open a breaker
+    BREAKER_RECOVERY_SECONDS: float = 30.0  # open time before a half-open probe
+    RETRY_BUDGET_RATIO: float = 0.2  # retries allowed per upstream request
+    RETRY_BUDGET_MIN_PER_SECOND: float = 0.5  # retries allowed regardless of traffic
+
+    # Session
+    SESSION_PROBE_AFTER_SECONDS: int = 300
+    SESSION_PROBE_CACHE_SECONDS: int = 60
 
     # OCR
     OCR_LANG: str = "tur"
     MAX_PDF_MB: int = 20
+    PDF_RESUME_ATTEMPTS: int = 3  # Range-resumes of an interrupted PDF download
     OCR_DPI: int = 300
     OCR_COLUMN_DETECTION: bool = True
     OCR_MIN_COLUMN_GAP_PX: int = 4
     OCR_BINARIZE_BLOCK_SIZE: int = 31
     OCR_DENOISE_STRENGTH: int = 10
 
+    # Extraction concurrency
+    EXTRACT_DOWNLOAD_CONCURRENCY: int = 4  # per batch
+    EXTRACT_OCR_CONCURRENCY: int = 2  # service-wide
+
+    # Async extraction jobs
+    JOB_DB_PATH: str = "/tmp/tobb_jobs/jobs.sqlite3"
+    JOB_WORKERS: int = 2
+    WEBHOOK_TIMEOUT: int = 10
+    # Hosts (and their subdomains) callbacks may target; empty allows any public address
+    WEBHOOK_ALLOWED_HOSTS: list[str] = []
+
     # CAPTCHA
     CAPTCHA_MAX_ATTEMPTS: int = 5
 
@@ -35,5 +110,24 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = "INFO"
     DEBUG: bool = False
 
-    # Temp
+    # PDF cache (keyed by Guid; 0 disables)
     PDF_DOWNLOAD_DIR: str = "/tmp/tobb_pdfs"
+    PDF_CACHE_MAX_MB: int = 500
+
+    # Cross-company OCR reuse per gazette page (sayi + sayfa) and PDF hash; empty disables
+    PAGE_INDEX_DB_PATH: str = "/tmp/tobb_pages/pages.sqlite3"
+
+    # Full-text index (SQLite FTS5) of extracted text; empty disables
+    TEXT_INDEX_DB_PATH: str = "/tmp/tobb_index/notices.sqlite3"
+
+    # Background PDF prefetch after /search (opt-in, needs the PDF cache)
+    PREFETCH_ENABLED: bool = False
+    PREFETCH_TOP_K: int = 1
+    PREFETCH_OCR: bool = False
+    PREFETCH_MAX_PENDING: int = 50
+
+    def credentials(self) -> list[TOBBCredentials]:
+        """Configured TOBB accounts, falling back to the single TOBB_LOGIN_* pair."""
+        if self.TOBB_ACCOUNTS:
+            return list(self.TOBB_ACCOUNTS)
+        return [TOBBCredentials(email=self.TOBB_LOGIN_EMAIL, password=self.TOBB_LOGIN_PASSWORD)]
@@ -13,6 +13,11 @@ class TOBBBaseError(Exception):
         super().__init__(message)
 
 
+class InvalidRequestError(TOBBBaseError):
+    status_code = 400
+    error_code = "INVALID_REQUEST"
+
+
 class NotFoundError(TOBBBaseError):
     status_code = 404
     error_code = "NOT_FOUND"
@@ -41,3 +46,13 @@ class CaptchaError(TOBBBaseError):
 class AuthError(TOBBBaseError):
     status_code = 401
     error_code = "AUTH_FAILED"
+
+
+class UpstreamUnavailableError(TOBBBaseError):
+    status_code = 503
+    error_code = "UPSTREAM_UNAVAILABLE"
+
+
+class FeatureDisabledError(TOBBBaseError):
+    status_code = 503
+    error_code = "FEATURE_DISABLED"
@@ -1,16 +1,33 @@
 from __future__ import annotations
 
+import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncIterator
 
+import httpx
 from fastapi import FastAPI
 
+from app.api.deps import lease_extractor
 from app.api.router import api_router
-from app.clients.http_client import close_http_client, create_http_client
+from app.clients.account_pool import AccountPool
+from app.clients.http_client import PoolMetrics, prewarm_http_clients
+from app.clients.search_session_pool import SearchSessionPool
 from app.config import Settings
 from app.core.exceptions import TOBBBaseError
 from app.core.logging import setup_logging
 from app.core.middleware import tobb_exception_handler
+from app.services.gazette_cache import GazetteRecordCache
+from app.services.job_queue import JobQueue, JobStore
+from app.services.page_index import GazettePageIndex
+from app.services.pdf_cache import PDFCache
+from app.services.prefetcher import Prefetcher
+from app.services.search_cache import SearchCache
+from app.services.text_index import GazetteTextIndex
+from app.utils.circuit_breaker import CircuitBreakerRegistry
+from app.utils.hedging import Hedger
+from app.utils.rate_limit import AdaptiveRateLimiter
+from app.utils.retry import RetryBudget
+from app.utils.single_flight import SingleFlight
 
 
 @asynccontextmanager
@@ -18,9 +35,119 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     settings = Settings()
     setup_logging(log_level=settings.LOG_LEVEL, debug=settings.DEBUG)
     app.state.settings = settings
-    app.state.http_client = create_http_client(settings)
+    app.state.rate_limiter = AdaptiveRateLimiter(
+        rate=settings.TOBB_GLOBAL_RATE_PER_SECOND,
+        capacity=settings.TOBB_GLOBAL_BURST,
+        min_rate=settings.TOBB_RATE_MIN_PER_SECOND,
+        max_rate=settings.TOBB_RATE_MAX_PER_SECOND,
+        increase_step=settings.TOBB_RATE_INCREASE_STEP,
+        decrease_factor=settings.TOBB_RATE_DECREASE_FACTOR,
+        latency_threshold=settings.TOBB_RATE_LATENCY_THRESHOLD,
+    )
+    app.state.hedger = (
+        Hedger(
+            percentile=settings.HEDGE_PERCENTILE,
+            min_delay=settings.HEDGE_MIN_DELAY,
+            max_ratio=settings.HEDGE_MAX_RATIO,
+            limiter=app.state.rate_limiter,
+        )
+        if settings.HEDGE_ENABLED
+        else None
+    )
+    app.state.breakers = CircuitBreakerRegistry(
+        failure_threshold=settings.BREAKER_FAILURE_THRESHOLD,
+        recovery_timeout=settings.BREAKER_RECOVERY_SECONDS,
+    )
+    app.state.retry_budget = RetryBudget(
+        ratio=settings.RETRY_BUDGET_RATIO,
+        min_per_second=settings.RETRY_BUDGET_MIN_PER_SECOND,
+    )
+    app.state.pool_metrics = {"public": PoolMetrics(), "auth": PoolMetrics()}
+    app.state.search_session_pool = SearchSessionPool.from_settings(
+        settings,
+        global_limiter=app.state.rate_limiter,
+        metrics=app.state.pool_metrics["public"],
+        breakers=app.state.breakers,
+        retry_budget=app.state.retry_budget,
+    )
+    app.state.account_pool = AccountPool.from_settings(
+        settings,
+        global_limiter=app.state.rate_limiter,
+        metrics=app.state.pool_metrics["auth"],
+        breakers=app.state.breakers,
+        retry_budget=app.state.retry_budget,
+    )
+    prewarm: asyncio.Task[int] | None = None
+    if settings.HTTP_PREWARM:
+        # In the background so a slow or unreachable TOBB does not block startup
+        prewarm = asyncio.create_task(
+            prewarm_http_clients(
+                [
+                    *app.state.search_session_pool.clients,
+                    *(account.client for account in app.state.account_pool.accounts),
+                ],
+                settings.TOBB_BASE_URL,
+            )
+        )
+    app.state.search_cache = SearchCache(
+        ttl=settings.SEARCH_CACHE_TTL,
+        stale_ttl=settings.SEARCH_CACHE_STALE_TTL,
+        max_entries=settings.SEARCH_CACHE_MAX_ENTRIES,
+        disk_dir=settings.SEARCH_CACHE_DIR,
+        negative_ttl=settings.SEARCH_NEGATIVE_CACHE_TTL,
+    )
+    app.state.gazette_cache = GazetteRecordCache(
+        fresh_ttl=settings.GAZETTE_CACHE_FRESH_SECONDS,
+        max_entries=settings.GAZETTE_CACHE_MAX_ENTRIES,
+    )
+    app.state.ocr_slots = asyncio.Semaphore(settings.EXTRACT_OCR_CONCURRENCY)
+    app.state.flights = SingleFlight()
+    app.state.pdf_cache = (
+        PDFCache(settings.PDF_DOWNLOAD_DIR, max_bytes=settings.PDF_CACHE_MAX_MB * 1024 * 1024)
+        if settings.PDF_CACHE_MAX_MB > 0
+        else None
+    )
+    app.state.page_index = (
+        GazettePageIndex(settings.PAGE_INDEX_DB_PATH) if settings.PAGE_INDEX_DB_PATH else None
+    )
+    app.state.text_index = (
+        GazetteTextIndex(settings.TEXT_INDEX_DB_PATH) if settings.TEXT_INDEX_DB_PATH else None
+    )
+    app.state.webhook_client = httpx.AsyncClient(timeout=httpx.Timeout(settings.WEBHOOK_TIMEOUT))
+    job_store = JobStore(settings.JOB_DB_PATH)
+    app.state.job_queue = JobQueue(
+        store=job_store,
+        extractor_factory=lambda: lease_extractor(app.state, settings),
+        webhook_client=app.state.webhook_client,
+        workers=settings.JOB_WORKERS,
+        allowed_callback_hosts=settings.WEBHOOK_ALLOWED_HOSTS,
+    )
+    app.state.job_queue.start()
+    app.state.prefetcher = None
+    if settings.PREFETCH_ENABLED and app.state.pdf_cache is not None:
+        app.state.prefetcher = Prefetcher(
+            extractor_factory=lambda: lease_extractor(app.state, settings),
+            pdf_cache=app.state.pdf_cache,
+            top_k=settings.PREFETCH_TOP_K,
+            max_pending=settings.PREFETCH_MAX_PENDING,
+            ocr=settings.PREFETCH_OCR,
+            limiter=app.state.rate_limiter,
+        )
+        app.state.prefetcher.start()
     yield
-    await close_http_client(app.state.http_client)
+    if prewarm is not None:
+        prewarm.cancel()
+    if app.state.prefetcher is not None:
+        await app.state.prefetcher.stop()
+    await app.state.job_queue.stop()
+    job_store.close()
+    if app.state.page_index is not None:
+        app.state.page_index.close()
+    if app.state.text_index is not None:
+        app.state.text_index.close()
+    await app.state.webhook_client.aclose()
+    await app.state.account_pool.aclose()
+    await app.state.search_session_pool.aclose()
 
 
 def create_app() -> FastAPI:
@@ -5,11 +5,14 @@ from enum import Enum
 
 class ErrorCode(str, Enum):
     NOT_FOUND = "NOT_FOUND"
+    INVALID_REQUEST = "INVALID_REQUEST"
     PDF_FETCH_FAILED = "PDF_FETCH_FAILED"
     OCR_FAILED = "OCR_FAILED"
     PARSING_FAILED = "PARSING_FAILED"
     CAPTCHA_FAILED = "CAPTCHA_FAILED"
     AUTH_FAILED = "AUTH_FAILED"
+    UPSTREAM_UNAVAILABLE = "UPSTREAM_UNAVAILABLE"
+    FEATURE_DISABLED = "FEATURE_DISABLED"
     INTERNAL_ERROR = "INTERNAL_ERROR"
 
 
@@ -18,3 +21,17 @@ class NoticeType(str, Enum):
     DEGISIKLIK = "DEGISIKLIK"
     KAPANIS = "KAPANIS"
     DIGER = "DIGER"
+
+
+class JobStatus(str, Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
+class LatestNoticeStage(str, Enum):
+    MATCH = "MATCH"
+    EXTRACT = "EXTRACT"
+    SEARCH = "SEARCH"
+    ERROR = "ERROR"
@@ -1,11 +1,82 @@
 from __future__ import annotations
 
-from pydantic import BaseModel, Field
+from datetime import date
+from typing import Annotated
 
+from pydantic import BaseModel, Field, HttpUrl, model_validator
 
-class SearchRequest(BaseModel):
+TradeName = Annotated[str, Field(min_length=2, max_length=500)]
+
+
+class GazetteFilter(BaseModel):
+    """Notice type and publication date filters applied before any PDF is fetched."""
+
+    ilan_turu: list[Annotated[str, Field(min_length=2, max_length=100)]] = Field(
+        default_factory=list,
+        max_length=20,
+        description="Ilan turu filtresi (ornegin 'Sermaye'); biri eslesen ilanlar doner",
+    )
+    date_from: date | None = Field(default=None, description="Bu tarihten itibaren yayinlananlar")
+    date_to: date | None = Field(default=None, description="Bu tarihe kadar yayinlananlar")
+
+    @property
+    def is_active(self) -> bool:
+        return bool(self.ilan_turu) or self.date_from is not None or self.date_to is not None
+
+    @model_validator(mode="after")
+    def _check_window(self) -> GazetteFilter:
+        if self.date_from and self.date_to and self.date_from > self.date_to:
+            raise ValueError("date_from, date_to'dan sonra olamaz")
+        return self
+
+
+class SearchRequest(GazetteFilter):
     trade_name: str = Field(..., min_length=2, max_length=500, description="Ticaret unvani")
 
 
+class BatchSearchRequest(GazetteFilter):
+    trade_names: list[TradeName] = Field(
+        ..., min_length=1, max_length=500, description="Ticaret unvanlari"
+    )
+
+
 class ExtractRequest(BaseModel):
     pdf_url: str = Field(..., min_length=10, max_length=2000, description="Gazete PDF URL")
+
+
+class BatchExtractRequest(GazetteFilter):
+    pdf_urls: list[Annotated[str, Field(min_length=10, max_length=2000)]] = Field(
+        ..., min_length=1, max_length=100, description="Gazete PDF URL listesi"
+    )
+    stream: bool = Field(default=False, description="Sonuclari NDJSON olarak akit")
+
+
+class ExtractJobRequest(BaseModel):
+    pdf_url: str = Field(..., min_length=10, max_length=2000, description="Gazete PDF URL")
+    callback_url: HttpUrl | None = Field(
+        default=None, description="Is bitince sonucun POST edilecegi http(s) URL"
+    )
+
+
+class NoticeSearchRequest(GazetteFilter):
+    query: str = Field(
+        ..., min_length=2, max_length=500, description="Aranacak kelimeler; sonda * ile onek"
+    )
+    limit: int = Field(default=20, ge=1, le=100, description="En fazla sonuc sayisi")
+    include_text: bool = Field(default=False, description="Ilanin tam metnini de dondur")
+
+
+class RegistryLookupRequest(GazetteFilter):
+    registry_no: str = Field(..., min_length=1, max_length=50, description="Sicil numarasi")
+    tsm: str | None = Field(
+        default=None, min_length=2, max_length=100, description="Ticaret Sicil Mudurlugu (sehir)"
+    )
+    sicil_mudurlugu_id: str | None = Field(
+        default=None, pattern=r"^\d{1,6}$", description="TOBB SicilMudurluguId (tsm yerine)"
+    )
+
+    @model_validator(mode="after")
+    def _check_registry_office(self) -> RegistryLookupRequest:
+        if not self.tsm and not self.sicil_mudurlugu_id:
+            raise ValueError("tsm veya sicil_mudurlugu_id gerekli")
+        return self
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from pydantic import BaseModel, Field
 
-from app.schemas.enums import ErrorCode, NoticeType
+from app.schemas.enums import ErrorCode, JobStatus, LatestNoticeStage, NoticeType
 
 
 class HealthResponse(BaseModel):
@@ -10,6 +10,55 @@ class HealthResponse(BaseModel):
     service: str = "tobb-ocr-rest-api"
 
 
+class RateLimiterStats(BaseModel):
+    rate_per_second: float = Field(..., description="Su anki izin verilen istek hizi")
+    queue_depth: int = Field(..., description="Token bekleyen istek sayisi")
+    available_tokens: float
+
+
+class HttpPoolStats(BaseModel):
+    requests: int
+    new_connections: int
+    avg_wait_ms: float = Field(..., description="Havuzdan baglanti bekleme suresi ortalamasi")
+    max_wait_ms: float
+    avg_connect_ms: float = Field(..., description="Yeni baglanti (TCP + TLS) suresi ortalamasi")
+
+
+class HedgeStats(BaseModel):
+    requests: int
+    hedged: int = Field(..., description="Yedek istek gonderilen istek sayisi")
+    hedge_wins: int = Field(..., description="Yedek istegin once dondugu istek sayisi")
+    delay_ms: float = Field(..., description="Su anki yedekleme gecikmesi")
+
+
+class BreakerStats(BaseModel):
+    state: str = Field(..., description="CLOSED, OPEN veya HALF_OPEN")
+    rejected: int = Field(..., description="Devre acikken reddedilen istek sayisi")
+
+
+class RetryBudgetStats(BaseModel):
+    requests: int
+    retries: int = Field(..., description="Izin verilen yeniden deneme sayisi")
+    denied: int = Field(..., description="Butce tukendigi icin reddedilen yeniden denemeler")
+    available: float
+
+
+class PageIndexStats(BaseModel):
+    pages: int = Field(..., description="OCR metni bilinen gazete sayfasi (sayi + sayfa)")
+    texts: int = Field(..., description="PDF icerik hash'ine gore saklanan OCR metni")
+    page_hits: int = Field(..., description="Indirmeden sayfa uzerinden cevaplanan istek")
+    hash_hits: int = Field(..., description="Indirilip OCR'i atlanan istek")
+
+
+class StatsResponse(BaseModel):
+    rate_limiter: RateLimiterStats
+    http_pools: dict[str, HttpPoolStats] = Field(default_factory=dict)
+    hedging: dict[str, HedgeStats] = Field(default_factory=dict)
+    circuit_breakers: dict[str, BreakerStats] = Field(default_factory=dict)
+    retry_budget: RetryBudgetStats | None = None
+    page_index: PageIndexStats | None = None
+
+
 class SearchRecord(BaseModel):
     title: str = Field(..., description="Ticaret unvani")
     registry_no: str | None = Field(default=None, description="Sicil numarasi")
@@ -24,6 +73,15 @@ class SearchResponse(BaseModel):
     results: list[SearchRecord]
 
 
+class BatchSearchItem(BaseModel):
+    """One line of the NDJSON stream returned by /search/batch."""
+
+    query: str
+    result: SearchResponse | None = None
+    error_code: ErrorCode | None = None
+    error: str | None = None
+
+
 class GazetteRecord(BaseModel):
     """A single gazette announcement from ilan goruntuleme results."""
 
@@ -37,6 +95,15 @@ class GazetteRecord(BaseModel):
     pdf_url: str | None = None
 
 
+class RegistryLookupResponse(BaseModel):
+    sicil_mudurlugu_id: str
+    registry_no: str
+    total_results: int
+    records: list[GazetteRecord] = Field(
+        default_factory=list, description="Ilanlar, en yeniden en eskiye"
+    )
+
+
 class ParsedGazette(BaseModel):
     registry_city: str | None = None
     registry_no: str | None = None
@@ -55,6 +122,64 @@ class ExtractResult(BaseModel):
     error: str | None = None
 
 
+class BatchExtractResponse(BaseModel):
+    total_processed: int
+    successful: int
+    results: list[ExtractResult]
+    skipped: list[str] = Field(
+        default_factory=list, description="Ilan turu/tarih filtresine uymadigi icin atlanan URL'ler"
+    )
+
+
+class NoticeSearchHit(BaseModel):
+    source_pdf_url: str
+    record: GazetteRecord | None = Field(
+        default=None, description="Ilanin gazete kaydi (PDF bir aramada listelendiyse)"
+    )
+    snippet: str = Field(
+        ..., description="Eslesmenin gectigi metin parcasi, <em> ile isaretli, HTML kacisli"
+    )
+    score: float = Field(..., description="bm25 alaka puani (yuksek daha iyi)")
+    raw_text: str | None = None
+
+
+class NoticeSearchResponse(BaseModel):
+    query: str
+    total_results: int
+    results: list[NoticeSearchHit]
+
+
+class LatestNoticeEvent(BaseModel):
+    """One line of the NDJSON stream returned by /search/latest.
+
+    MATCH carries the top search hit with its pdf_urls, EXTRACT the OCR result of
+    its newest notice, SEARCH the full enriched search response, ERROR a failure
+    that ends the stream.
+    """
+
+    stage: LatestNoticeStage
+    record: SearchRecord | None = None
+    extract: ExtractResult | None = None
+    search: SearchResponse | None = None
+    error_code: ErrorCode | None = None
+    error: str | None = None
+
+
+class JobResponse(BaseModel):
+    """State of an asynchronous extraction job."""
+
+    job_id: str
+    status: JobStatus
+    pdf_url: str
+    callback_url: str | None = Field(default=None, description="Isi olusturan istegin callback'i")
+    callback_urls: list[str] = Field(
+        default_factory=list, description="Sonucun POST edilecegi tum callback URL'leri"
+    )
+    result: ExtractResult | None = None
+    created_at: str
+    updated_at: str
+
+
 class ErrorResponse(BaseModel):
     error_code: ErrorCode
     message: str
@@ -4,17 +4,30 @@ import asyncio
 
 import httpx
 
+from app.clients.account_pool import Account
 from app.clients.session_manager import SessionManager
 from app.config import Settings
-from app.core.exceptions import AuthError
+from app.core.exceptions import AuthError, UpstreamUnavailableError
 from app.core.logging import get_logger
 from app.services.captcha_handler import CaptchaHandler
+from app.utils.retry import RetryBudget, is_upstream_failure
 
 logger = get_logger(__name__)
 
+# Small authenticated page used to check whether TOBB still honours our session.
+# The ilan goruntuleme form is only rendered for logged-in members.
+_SESSION_PROBE_PATH = "/view/hizlierisim/ilangoruntuleme.php"
+_SESSION_PROBE_MARKER = "SicilMudurluguId"
+
 
 class AuthClient:
-    """Handles TOBB login: session init, captcha solve, credential POST."""
+    """Handles TOBB login: session init, captcha solve, credential POST.
+
+    When bound to a pooled Account, its credentials are used and login outcomes
+    feed the account's quarantine tracking. Every AuthClient on the same account
+    shares its auth_lock, so concurrent leases log in, probe and log out one at
+    a time and a login waited on is reused instead of repeated.
+    """
 
     def __init__(
         self,
@@ -22,39 +35,123 @@ class AuthClient:
         settings: Settings,
         captcha_handler: CaptchaHandler,
         session_manager: SessionManager,
+        account: Account | None = None,
+        retry_budget: RetryBudget | None = None,
     ) -> None:
         self._client = client
         self._settings = settings
         self._captcha = captcha_handler
         self._session = session_manager
+        self._account = account
+        self._retry_budget = retry_budget
+        self._lock = account.auth_lock if account is not None else asyncio.Lock()
 
     async def ensure_authenticated(self) -> None:
         """Login if session is expired or not yet established."""
         if self._session.is_authenticated:
             return
-        await self._login_with_retry()
+        async with self._lock:
+            # Another holder of the account may have logged in while we waited
+            if self._session.is_authenticated:
+                return
+            await self._login_with_retry()
+
+    async def ensure_authenticated_with_retry(self, operation: str) -> None:
+        """ensure_authenticated, clearing the session and trying once more on AuthError."""
+        try:
+            await self.ensure_authenticated()
+        except AuthError:
+            logger.warning("auth_failed_clearing_session_and_retrying", operation=operation)
+            await self.logout()
+            await self.ensure_authenticated()
+
+    async def ensure_session_valid(self) -> None:
+        """Like ensure_authenticated, but probes older sessions before large downloads.
+
+        TOBB may drop a session server-side before our local TTL runs out. Once the
+        session is older than SESSION_PROBE_AFTER_SECONDS, a cheap authenticated page
+        is fetched (result cached for SESSION_PROBE_CACHE_SECONDS) and we re-login if
+        it no longer shows the member-only form.
+        """
+        await self.ensure_authenticated()
+        if not self._needs_probe():
+            return
+        async with self._lock:
+            # Probed or renewed by another holder while we waited
+            if not self._needs_probe():
+                if not self._session.is_authenticated:
+                    await self._login_with_retry()
+                return
+
+            if await self._probe_session():
+                self._session.mark_validated()
+                return
+
+            logger.warning("session_probe_failed_reauthenticating")
+            self._session.invalidate()
+            self._client.cookies.clear()
+            await self._login_with_retry()
+
+    async def relogin(self) -> None:
+        """Drop the current session and log in again."""
+        async with self._lock:
+            self._session.invalidate()
+            self._client.cookies.clear()
+            await self._login_with_retry()
+
+    def _needs_probe(self) -> bool:
+        return self._session.needs_probe(
+            self._settings.SESSION_PROBE_AFTER_SECONDS,
+            self._settings.SESSION_PROBE_CACHE_SECONDS,
+        )
+
+    async def _probe_session(self) -> bool:
+        """Return True if the authenticated probe page is still served to us."""
+        try:
+            resp = await self._client.get(f"{self._settings.TOBB_BASE_URL}{_SESSION_PROBE_PATH}")
+        except httpx.HTTPError:
+            logger.warning("session_probe_error", exc_info=True)
+            return False
+        return resp.status_code == 200 and _SESSION_PROBE_MARKER in resp.text
 
     async def logout(self) -> None:
         """Logout from TOBB and clear session state."""
-        if not self._session.is_authenticated:
-            return
-        self._session.invalidate()
-        self._client.cookies.clear()
-        logger.info("logout_complete")
+        async with self._lock:
+            if not self._session.is_authenticated:
+                return
+            self._session.invalidate()
+            self._client.cookies.clear()
+            logger.info("logout_complete")
 
     async def _login_with_retry(self) -> None:
-        """Try login up to MAX_RETRIES times. Captcha errors or unexpected responses trigger retry."""
+        """Try login up to MAX_RETRIES times. Captcha errors or unexpected responses trigger retry.
+
+        Only a retry after an upstream failure (transport error or 5xx) spends a
+        retry-budget token. An outage (open circuit breaker or exhausted retry budget)
+        is not held against the account: UpstreamUnavailableError propagates without
+        counting a failure.
+        """
         max_attempts = self._settings.MAX_RETRIES
         last_error: Exception | None = None
 
         for attempt in range(1, max_attempts + 1):
+            if (
+                last_error is not None
+                and is_upstream_failure(last_error)
+                and self._retry_budget is not None
+            ):
+                self._retry_budget.spend(operation="login")
             try:
                 if attempt > 1:
                     # Clear stale cookies/session before retrying so we get a fresh PHP session
                     self._client.cookies.clear()
                     self._session.invalidate()
                 await self._login()
+                if self._account is not None:
+                    self._account.record_auth_success()
                 return
+            except UpstreamUnavailableError:
+                raise
             except AuthError as exc:
                 # Missing credentials → no point retrying
                 if "bilgileri eksik" in exc.message:
@@ -79,6 +176,8 @@ class AuthClient:
                 if attempt < max_attempts:
                     await asyncio.sleep(self._settings.RATE_LIMIT_DELAY * attempt)
 
+        if self._account is not None:
+            self._account.record_auth_failure()
         raise AuthError(
             message=f"TOBB login {max_attempts} denemede basarisiz",
             detail=str(last_error) if last_error else None,
@@ -86,8 +185,12 @@ class AuthClient:
 
     async def _login(self) -> None:
         base = self._settings.TOBB_BASE_URL
-        email = self._settings.TOBB_LOGIN_EMAIL
-        password = self._settings.TOBB_LOGIN_PASSWORD.get_secret_value()
+        if self._account is not None:
+            email = self._account.email
+            password = self._account.password.get_secret_value()
+        else:
+            email = self._settings.TOBB_LOGIN_EMAIL
+            password = self._settings.TOBB_LOGIN_PASSWORD.get_secret_value()
 
         if not email or not password:
             raise AuthError(
@@ -95,11 +198,9 @@ class AuthClient:
                 detail="TOBB_LOGIN_EMAIL ve TOBB_LOGIN_PASSWORD env degiskenleri gerekli",
             )
 
-        # Init PHP session
+        # Init PHP session (pacing is handled by the rate-limited transport)
         await self._client.get(base)
 
-        await asyncio.sleep(self._settings.RATE_LIMIT_DELAY)
-
         # Solve login captcha
         captcha_text = await self._captcha.solve(context="login")
 
@@ -8,9 +8,10 @@ import pytesseract
 from PIL import Image
 
 from app.config import Settings
-from app.core.exceptions import CaptchaError
+from app.core.exceptions import CaptchaError, UpstreamUnavailableError
 from app.core.logging import get_logger
 from app.utils.image_processing import preprocess_captcha
+from app.utils.retry import RetryBudget, is_upstream_failure
 
 logger = get_logger(__name__)
 
@@ -22,19 +23,32 @@ CAPTCHA_ENDPOINTS = {
 
 
 class CaptchaHandler:
-    def __init__(self, client: httpx.AsyncClient, settings: Settings) -> None:
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        settings: Settings,
+        retry_budget: RetryBudget | None = None,
+    ) -> None:
         self._client = client
         self._settings = settings
+        self._retry_budget = retry_budget
 
     async def solve(self, context: str = "search") -> str:
         """Fetch and solve a CAPTCHA image with Tesseract OCR.
 
         Tries up to CAPTCHA_MAX_ATTEMPTS times, raising CaptchaError if all fail.
+        An attempt that follows an upstream failure (transport error or 5xx) spends a
+        retry-budget token; misreads retry for free. An open circuit breaker or an
+        empty budget ends the loop with UpstreamUnavailableError.
         """
         endpoint = CAPTCHA_ENDPOINTS.get(context, CAPTCHA_ENDPOINTS["search"])
         max_attempts = self._settings.CAPTCHA_MAX_ATTEMPTS
 
+        upstream_failed = False
         for attempt in range(1, max_attempts + 1):
+            if upstream_failed and self._retry_budget is not None:
+                self._retry_budget.spend(operation="captcha")
+            upstream_failed = False
             try:
                 text = await self._fetch_and_ocr(endpoint)
                 if text:
@@ -43,7 +57,10 @@ class CaptchaHandler:
                     )
                     return text
                 logger.warning("captcha_empty", context=context, attempt=attempt)
-            except Exception:
+            except UpstreamUnavailableError:
+                raise
+            except Exception as exc:
+                upstream_failed = is_upstream_failure(exc)
                 logger.warning(
                     "captcha_attempt_failed", context=context, attempt=attempt, exc_info=True
                 )
@@ -1,35 +1,170 @@
 from __future__ import annotations
 
-from app.core.exceptions import AuthError, PDFFetchError
+import asyncio
+import hashlib
+from collections.abc import AsyncIterator
+from functools import partial
+from urllib.parse import parse_qsl, urlsplit
+
+from app.core.exceptions import PDFFetchError
 from app.core.logging import get_logger
 from app.schemas.responses import ExtractResult
 from app.services.auth_client import AuthClient
-from app.services.ocr_pipeline import OCRPipeline
+from app.services.gazette_cache import GazetteRecordCache
+from app.services.ocr_pipeline import OCRPipeline, PDFData
+from app.services.page_index import GazettePage, GazettePageIndex, gazette_page
+from app.services.pdf_cache import PDFCache
 from app.services.pdf_fetcher import PDFFetcher
+from app.services.text_index import GazetteTextIndex
+from app.utils.single_flight import SingleFlight
 
 logger = get_logger(__name__)
 
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
 
 class Extractor:
-    """Orchestrator: auth -> pdf fetch -> ocr -> raw text."""
+    """Orchestrator: auth -> pdf fetch -> ocr -> raw text.
+
+    OCR is CPU-bound and runs in a worker thread; `ocr_slots` bounds how many OCR
+    jobs run at once across the whole service. `flights` is shared service-wide so
+    concurrent requests for the same PDF Guid, or for PDFs with identical bytes,
+    wait on one fetch/OCR instead of repeating it. With a `pdf_cache`, PDFs already
+    on disk are OCR'd straight from the cache without logging in.
+
+    With a `page_index`, OCR output is shared across companies: a PDF whose
+    gazette page (looked up in `gazette_cache` by URL) is indexed is answered
+    without a download, and downloaded bytes OCR'd before under another Guid
+    are not OCR'd again.
+
+    With a `text_index`, every extracted text is indexed for full-text search
+    together with the URL's gazette record, when `gazette_cache` knows it.
+    """
 
     def __init__(
         self,
         auth_client: AuthClient,
         pdf_fetcher: PDFFetcher,
         ocr_pipeline: OCRPipeline,
+        ocr_slots: asyncio.Semaphore | None = None,
+        flights: SingleFlight | None = None,
+        pdf_cache: PDFCache | None = None,
+        page_index: GazettePageIndex | None = None,
+        gazette_cache: GazetteRecordCache | None = None,
+        text_index: GazetteTextIndex | None = None,
     ) -> None:
         self._auth = auth_client
         self._pdf = pdf_fetcher
         self._ocr = ocr_pipeline
+        self._ocr_slots = ocr_slots or asyncio.Semaphore(1)
+        self._flights = flights or SingleFlight()
+        self._pdf_cache = pdf_cache
+        self._page_index = page_index
+        self._gazette_cache = gazette_cache
+        self._text_index = text_index
 
     async def extract_from_url(self, pdf_url: str) -> ExtractResult:
-        """Extract raw OCR text from a single gazette PDF by its direct URL."""
-        await self._ensure_auth_with_retry()
+        """Extract raw OCR text from a single gazette PDF by its direct URL.
+
+        If the same PDF is already being extracted, wait for that run instead of
+        logging in and downloading it again. The account's session is left open:
+        leases are shared, and the next request reuses it once it has been probed.
+        """
+        result = await self._flights.do(
+            ("pdf", pdf_flight_key(pdf_url)), lambda: self._extract_with_session(pdf_url)
+        )
+        if result.source_pdf_url != pdf_url:
+            result = result.model_copy(update={"source_pdf_url": pdf_url})
+        return result
 
+    async def _extract_with_session(self, pdf_url: str) -> ExtractResult:
+        if not self._is_local(pdf_url):
+            await self._auth.ensure_authenticated_with_retry(operation="extract")
+        return await self._extract_one(pdf_url)
+
+    async def extract_many(
+        self, pdf_urls: list[str], download_concurrency: int
+    ) -> AsyncIterator[ExtractResult]:
+        """Extract several PDFs over one session, yielding results as they complete.
+
+        Duplicate URLs are processed once. Downloads run up to download_concurrency
+        at a time and each PDF is handed to OCR as soon as it arrives, so downloads
+        and OCR overlap. A failing URL yields an ExtractResult with its error. No
+        login happens when every PDF is already cached.
+        """
+        unique_urls = list(dict.fromkeys(pdf_urls))
+        needs_session = not all(self._is_local(url) for url in unique_urls)
+        if needs_session:
+            await self._auth.ensure_authenticated_with_retry(operation="extract")
+
+        download_slots = asyncio.Semaphore(download_concurrency)
+        tasks = [asyncio.create_task(self._extract_one(url, download_slots)) for url in unique_urls]
         try:
-            pdf_data = await self._fetch_pdf_with_reauth(pdf_url)
-            raw_text = self._ocr.extract_text(pdf_data)
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def prefetch(self, pdf_urls: list[str], ocr: bool) -> None:
+        """Warm the PDF cache for URLs that are not cached yet, optionally OCR'ing them too.
+
+        Work goes through the same in-flight keys as extract_from_url, so a user
+        request for a PDF that is being prefetched waits for it rather than repeating it.
+        """
+        if self._pdf_cache is None:
+            return
+        todo = [
+            url
+            for url in dict.fromkeys(pdf_urls)
+            if (key := pdf_key(url))
+            and not (
+                self._pdf_cache.has_text(key) or self._page_indexed(url)
+                if ocr
+                else self._pdf_cache.contains(key)
+            )
+        ]
+        if not todo:
+            return
+
+        needs_session = not all(self._is_cached(url) for url in todo)
+        if needs_session:
+            await self._auth.ensure_authenticated_with_retry(operation="extract")
+        for url in todo:
+            if ocr:
+                await self._flights.do(
+                    ("pdf", pdf_flight_key(url)), partial(self._extract_one, url)
+                )
+                continue
+            key = pdf_key(url)
+            try:
+                await self._flights.do(("download", key), partial(self._download, url, key))
+            except Exception:
+                logger.warning("pdf_prefetch_failed", url=url, exc_info=True)
+
+    async def _extract_one(
+        self, pdf_url: str, download_slots: asyncio.Semaphore | None = None
+    ) -> ExtractResult:
+        key = pdf_key(pdf_url)
+        try:
+            if key and self._is_cached(pdf_url):
+                raw_text = await self._flights.do(
+                    ("cached-ocr", key), lambda: self._ocr_cached(key)
+                )
+                if raw_text is not None:
+                    logger.info("pdf_cache_hit", url=pdf_url)
+                    self._index_text(pdf_url, raw_text)
+                    return ExtractResult(source_pdf_url=pdf_url, raw_text=raw_text)
+
+            page = self._page_of(pdf_url)
+            if page is None:
+                raw_text = await self._fetch_and_ocr(pdf_url, key, download_slots)
+            else:
+                raw_text = await self._flights.do(
+                    ("page", *page),
+                    lambda: self._extract_page(pdf_url, key, page, download_slots),
+                )
+            self._index_text(pdf_url, raw_text)
 
             return ExtractResult(
                 source_pdf_url=pdf_url,
@@ -46,26 +181,157 @@ class Extractor:
                 source_pdf_url=pdf_url,
                 error=str(exc),
             )
-        finally:
-            await self._auth.logout()
 
-    async def _ensure_auth_with_retry(self) -> None:
-        """Authenticate, and on failure clear session state and retry once."""
+    async def _extract_page(
+        self,
+        pdf_url: str,
+        key: str | None,
+        page: GazettePage,
+        download_slots: asyncio.Semaphore | None,
+    ) -> str:
+        """Text of a gazette page, shared by every company noticed on it."""
+        assert self._page_index is not None
+        raw_text = self._page_index.text_for_page(page)
+        if raw_text is not None:
+            logger.info("page_index_hit", url=pdf_url, sayi=page[0], sayfa=page[1])
+            return raw_text
+        return await self._fetch_and_ocr(pdf_url, key, download_slots, page)
+
+    async def _fetch_and_ocr(
+        self,
+        pdf_url: str,
+        key: str | None,
+        download_slots: asyncio.Semaphore | None,
+        page: GazettePage | None = None,
+    ) -> str:
+        pdf_data = await self._flights.do(
+            ("download", key or pdf_url),
+            lambda: self._download(pdf_url, key, download_slots),
+        )
+        raw_text = await self._ocr_once(pdf_data, page)
+        if key and self._pdf_cache is not None:
+            await self._pdf_cache.put_text(key, raw_text)
+        return raw_text
+
+    def _index_text(self, pdf_url: str, raw_text: str) -> None:
+        if self._text_index is None:
+            return
+        record = self._gazette_cache.find_by_pdf_url(pdf_url) if self._gazette_cache else None
         try:
-            await self._auth.ensure_authenticated()
-        except AuthError:
-            logger.warning("auth_failed_clearing_session_and_retrying")
-            await self._auth.logout()
-            await self._auth.ensure_authenticated()
+            self._text_index.add(pdf_url, raw_text, record)
+        except Exception:
+            # The index is a by-product; never fail an extraction over it
+            logger.warning("text_index_add_failed", url=pdf_url, exc_info=True)
+
+    def _is_cached(self, pdf_url: str) -> bool:
+        key = pdf_key(pdf_url)
+        return key is not None and self._pdf_cache is not None and self._pdf_cache.contains(key)
+
+    def _is_local(self, pdf_url: str) -> bool:
+        """True if the URL can be answered without a TOBB session."""
+        return self._is_cached(pdf_url) or self._page_indexed(pdf_url)
+
+    def _page_of(self, pdf_url: str) -> GazettePage | None:
+        if self._page_index is None or self._gazette_cache is None:
+            return None
+        record = self._gazette_cache.find_by_pdf_url(pdf_url)
+        return gazette_page(record.sayi, record.sayfa) if record is not None else None
+
+    def _page_indexed(self, pdf_url: str) -> bool:
+        page = self._page_of(pdf_url)
+        return page is not None and self._page_index is not None and self._page_index.has_page(page)
+
+    async def _ocr_once(self, pdf_data: bytes, page: GazettePage | None = None) -> str:
+        """OCR, sharing the run with any concurrent job on byte-identical content.
+
+        Content OCR'd before (under any Guid) is served from the page index.
+        """
+        digest = hashlib.sha256(pdf_data).hexdigest()
+        if self._page_index is not None:
+            raw_text = self._page_index.text_for_hash(digest)
+            if raw_text is not None:
+                logger.info("page_index_hash_hit", sha256=digest)
+                self._page_index.put(digest, raw_text, page)
+                return raw_text
+        raw_text = await self._flights.do(("ocr", digest), lambda: self._run_ocr(pdf_data))
+        if self._page_index is not None:
+            self._page_index.put(digest, raw_text, page)
+        return raw_text
+
+    async def _download(
+        self, pdf_url: str, key: str | None, download_slots: asyncio.Semaphore | None = None
+    ) -> bytes:
+        if download_slots is None:
+            pdf_data = await self._fetch_pdf_with_reauth(pdf_url)
+        else:
+            async with download_slots:
+                pdf_data = await self._fetch_pdf_with_reauth(pdf_url)
+        if key and self._pdf_cache is not None:
+            await self._pdf_cache.put(key, pdf_data)
+        return pdf_data
+
+    async def _ocr_cached(self, key: str) -> str | None:
+        """Text of a cached PDF: stored OCR output, or OCR through a read-only mmap.
+
+        Returns None if the PDF was evicted meanwhile.
+        """
+        assert self._pdf_cache is not None
+        text = self._pdf_cache.get_text(key)
+        if text is not None:
+            logger.info("ocr_text_cache_hit", key=key)
+            return text
+        with self._pdf_cache.open(key) as data:
+            if data is None:
+                return None
+            text = await self._run_ocr(data)
+        await self._pdf_cache.put_text(key, text)
+        return text
+
+    async def _run_ocr(self, pdf_data: PDFData) -> str:
+        async with self._ocr_slots:
+            return await asyncio.to_thread(self._ocr.extract_text, pdf_data)
 
     async def _fetch_pdf_with_reauth(self, url: str) -> bytes:
-        """Fetch PDF, re-authenticate and retry once if session seems expired."""
+        """Fetch PDF, re-authenticate and retry once if session seems expired.
+
+        Older sessions are probed first so an expired one does not cost a wasted download.
+        Probing and re-login are serialised per account by the auth client.
+        """
+        await self._auth.ensure_session_valid()
         try:
             return await self._pdf.fetch(url)
         except PDFFetchError as exc:
             if "HTML sayfasinda bulunamadi" not in exc.message:
                 raise
             logger.warning("pdf_fetch_session_expired_suspected", url=url)
-            await self._auth.logout()
-            await self._auth.ensure_authenticated()
+            await self._auth.relogin()
             return await self._pdf.fetch(url)
+
+
+def pdf_guid(pdf_url: str) -> str | None:
+    """The Guid query parameter of a pdf_goster.php URL, if present."""
+    for name, value in parse_qsl(urlsplit(pdf_url).query):
+        if name.lower() == "guid" and value:
+            return value
+    return None
+
+
+def pdf_key(pdf_url: str) -> str | None:
+    """Normalised scheme://host/path?Guid= identity of a Guid link, None without a Guid.
+
+    Only the Guid is kept from the query, but scheme, host and path are part of
+    the key, so a Guid on a foreign URL never stands in for TOBB's PDF.
+    """
+    guid = pdf_guid(pdf_url)
+    if guid is None:
+        return None
+    parts = urlsplit(pdf_url)
+    host = parts.hostname or ""
+    if parts.port is not None and parts.port != _DEFAULT_PORTS.get(parts.scheme.lower()):
+        host = f"{host}:{parts.port}"
+    return f"{parts.scheme.lower()}://{host}{parts.path or '/'}?Guid={guid}"
+
+
+def pdf_flight_key(pdf_url: str) -> str:
+    """Identify a gazette PDF by its normalised Guid link, falling back to the full URL."""
+    return pdf_key(pdf_url) or pdf_url
@@ -0,0 +1,113 @@
+"""Per-company cache of gazette announcement lists.
+
+Keyed by (SicilMudurluguId, TicSicNo). A company's announcement history only
+grows, so once cached it is refreshed incrementally: GazetteClient asks TOBB
+only for announcements published on or after the newest cached yayin_tarihi
+and merges them in.
+
+Records are also indexed by pdf_url, so a PDF link handed back by a client can
+be traced to its notice type and publication date without asking TOBB.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+
+from app.schemas.responses import GazetteRecord
+
+
+def parse_gazette_date(value: str | None) -> datetime | None:
+    """Parse a yayin_tarihi value (DD/MM/YYYY or DD.MM.YYYY)."""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value.replace(".", "/"), "%d/%m/%Y")
+    except (ValueError, TypeError):
+        return None
+
+
+def gazette_date_sort_key(record: GazetteRecord) -> datetime:
+    """Sort key for newest-first ordering of records; unknown dates go last."""
+    return parse_gazette_date(record.yayin_tarihi) or datetime.min
+
+
+def _record_key(record: GazetteRecord) -> tuple[str | None, ...]:
+    if record.pdf_url:
+        return (record.pdf_url,)
+    return (record.yayin_tarihi, record.sayi, record.sayfa, record.ilan_turu)
+
+
+@dataclass
+class _Entry:
+    records: list[GazetteRecord]
+    refreshed_at: float
+
+
+class GazetteRecordCache:
+    """LRU of GazetteRecord lists with a freshness window before incremental refresh."""
+
+    def __init__(self, fresh_ttl: float, max_entries: int) -> None:
+        self._fresh_ttl = fresh_ttl
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], _Entry] = OrderedDict()
+        self._by_pdf_url: dict[str, GazetteRecord] = {}
+
+    def get(self, sicil_mudurlugu_id: str, tic_sic_no: str) -> list[GazetteRecord] | None:
+        entry = self._entries.get((sicil_mudurlugu_id, tic_sic_no))
+        if entry is None:
+            return None
+        self._entries.move_to_end((sicil_mudurlugu_id, tic_sic_no))
+        return list(entry.records)
+
+    def find_by_pdf_url(self, pdf_url: str) -> GazetteRecord | None:
+        """The cached record carrying this PDF link, if any company entry holds it."""
+        return self._by_pdf_url.get(pdf_url)
+
+    def is_fresh(self, sicil_mudurlugu_id: str, tic_sic_no: str) -> bool:
+        entry = self._entries.get((sicil_mudurlugu_id, tic_sic_no))
+        return entry is not None and time.monotonic() - entry.refreshed_at < self._fresh_ttl
+
+    def latest_date(self, sicil_mudurlugu_id: str, tic_sic_no: str) -> datetime | None:
+        """Newest yayin_tarihi among the cached records, if any can be parsed."""
+        entry = self._entries.get((sicil_mudurlugu_id, tic_sic_no))
+        if entry is None:
+            return None
+        dates = [d for r in entry.records if (d := parse_gazette_date(r.yayin_tarihi))]
+        return max(dates, default=None)
+
+    def put(self, sicil_mudurlugu_id: str, tic_sic_no: str, records: list[GazetteRecord]) -> None:
+        key = (sicil_mudurlugu_id, tic_sic_no)
+        previous = self._entries.get(key)
+        if previous is not None:
+            self._unindex(previous)
+        entry = _Entry(records=list(records), refreshed_at=time.monotonic())
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        for record in entry.records:
+            if record.pdf_url:
+                self._by_pdf_url[record.pdf_url] = record
+        while len(self._entries) > self._max_entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._unindex(evicted)
+
+    def merge(
+        self, sicil_mudurlugu_id: str, tic_sic_no: str, new_records: list[GazetteRecord]
+    ) -> list[GazetteRecord]:
+        """Add newly fetched records to the cached list (deduplicated) and return it."""
+        merged = self.get(sicil_mudurlugu_id, tic_sic_no) or []
+        seen = {_record_key(r) for r in merged}
+        for record in new_records:
+            key = _record_key(record)
+            if key not in seen:
+                seen.add(key)
+                merged.append(record)
+        self.put(sicil_mudurlugu_id, tic_sic_no, merged)
+        return merged
+
+    def _unindex(self, entry: _Entry) -> None:
+        for record in entry.records:
+            if record.pdf_url and self._by_pdf_url.get(record.pdf_url) is record:
+                del self._by_pdf_url[record.pdf_url]
@@ -7,45 +7,124 @@ Results contain gazette announcements with PDF download links.
 
 from __future__ import annotations
 
-import asyncio
 import re
+from datetime import date
 
 import httpx
-from bs4 import BeautifulSoup
 
 from app.config import Settings
 from app.core.logging import get_logger
 from app.schemas.responses import GazetteRecord
-from app.services import selectors
+from app.services import html_parsing as hp
+from app.services.gazette_cache import GazetteRecordCache, parse_gazette_date
+from app.utils.turkish import normalize_turkish
 
 logger = get_logger(__name__)
 
 # Base URL fragment for resolving relative PDF links
 _PDF_BASE = "view/hizlierisim/"
 
+# "Yayinlanmis ... Ilanlari (92 Adet)" above the results table
+_TOTAL_COUNT = re.compile(r"\((\d+)\s*Adet\)", re.IGNORECASE)
+
+# Date format of the Tarih1/Tarih2 (date window) form fields
+_FORM_DATE_FORMAT = "%d.%m.%Y"
+
 
 class GazetteClient:
     """Searches the ilan goruntuleme page for gazette announcements (requires login)."""
 
-    def __init__(self, client: httpx.AsyncClient, settings: Settings) -> None:
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        settings: Settings,
+        cache: GazetteRecordCache | None = None,
+    ) -> None:
         self._client = client
         self._settings = settings
+        self._cache = cache
+
+    async def search_company(self, sicil_mudurlugu_id: str, tic_sic_no: str) -> list[GazetteRecord]:
+        """Return a company's full announcement list, using the record cache if available.
+
+        Fresh cache entries are returned as-is. Older ones are refreshed by requesting
+        only announcements from the newest cached yayin_tarihi onwards and merging them.
+        """
+        cache = self._cache
+        if cache is None:
+            return await self.search(sicil_mudurlugu_id=sicil_mudurlugu_id, tic_sic_no=tic_sic_no)
+
+        if cache.is_fresh(sicil_mudurlugu_id, tic_sic_no):
+            logger.debug("gazette_cache_hit", sicil_mudurlugu_id=sicil_mudurlugu_id)
+            return cache.get(sicil_mudurlugu_id, tic_sic_no) or []
+
+        latest = cache.latest_date(sicil_mudurlugu_id, tic_sic_no)
+        if latest is None:
+            records = await self.search(
+                sicil_mudurlugu_id=sicil_mudurlugu_id, tic_sic_no=tic_sic_no
+            )
+            cache.put(sicil_mudurlugu_id, tic_sic_no, records)
+            return records
+
+        # Same-day announcements may have been added since, so the window includes `latest`
+        new_records = await self.search(
+            sicil_mudurlugu_id=sicil_mudurlugu_id,
+            tic_sic_no=tic_sic_no,
+            date_from=latest.strftime(_FORM_DATE_FORMAT),
+        )
+        logger.info(
+            "gazette_cache_incremental_refresh",
+            sicil_mudurlugu_id=sicil_mudurlugu_id,
+            tic_sic_no=tic_sic_no,
+            since=latest.date().isoformat(),
+            fetched=len(new_records),
+        )
+        return cache.merge(sicil_mudurlugu_id, tic_sic_no, new_records)
+
+    async def search_window(
+        self,
+        sicil_mudurlugu_id: str,
+        tic_sic_no: str,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> list[GazetteRecord]:
+        """A company's announcements published between date_from and date_to (inclusive).
+
+        Without a window this is search_company. With one, a fresh record cache entry is
+        filtered locally; otherwise the window goes to TOBB as Tarih1/Tarih2 so only the
+        matching rows are sent back. Such a partial result is not cached.
+        """
+        if date_from is None and date_to is None:
+            return await self.search_company(sicil_mudurlugu_id, tic_sic_no)
+
+        if self._cache is not None and self._cache.is_fresh(sicil_mudurlugu_id, tic_sic_no):
+            records = self._cache.get(sicil_mudurlugu_id, tic_sic_no) or []
+        else:
+            records = await self.search(
+                sicil_mudurlugu_id=sicil_mudurlugu_id,
+                tic_sic_no=tic_sic_no,
+                date_from=date_from.strftime(_FORM_DATE_FORMAT) if date_from else "",
+                date_to=date_to.strftime(_FORM_DATE_FORMAT) if date_to else "",
+            )
+        return filter_records(records, date_from=date_from, date_to=date_to)
 
     async def search(
         self,
         sicil_mudurlugu_id: str,
         tic_sic_no: str = "",
         ticaret_unvani: str = "",
+        date_from: str = "",
+        date_to: str = "",
     ) -> list[GazetteRecord]:
         """Search ilan goruntuleme and return gazette records.
 
         At least one of tic_sic_no or ticaret_unvani must be provided.
         ticaret_unvani requires minimum 5 characters on the TOBB side.
+        date_from/date_to (DD.MM.YYYY) restrict results to a publication window.
+        Request pacing is handled by the client's rate-limited transport.
         """
         base = self._settings.TOBB_BASE_URL
 
-        await asyncio.sleep(self._settings.RATE_LIMIT_DELAY)
-
         resp = await self._client.post(
             f"{base}/{_PDF_BASE}ilangoruntuleme_ok.php",
             data={
@@ -54,8 +133,8 @@ class GazetteClient:
                 "TicaretUnvani": ticaret_unvani,
                 "BagliIlan": "",
                 "Tarih": "",
-                "Tarih1": "",
-                "Tarih2": "",
+                "Tarih1": date_from,
+                "Tarih2": date_to,
             },
         )
         resp.raise_for_status()
@@ -79,38 +158,35 @@ class GazetteClient:
         8: Sepete Ekle, 9: Geri Bildirim
         """
         base = self._settings.TOBB_BASE_URL
-        soup = BeautifulSoup(html, "lxml")
         records: list[GazetteRecord] = []
 
-        table = soup.select_one(selectors.ILAN_RESULT_TABLE)
-        if not table:
+        root = hp.parse_html(html)
+        table = hp.first(hp.ILAN_RESULT_TABLE, root) if root is not None else None
+        if table is None:
             return records
 
-        # Log total count from the span if present
-        total_span = soup.find("span", string=re.compile(r"Adet\)", re.IGNORECASE))
-        if total_span:
-            match = re.search(r"\((\d+)\s*Adet\)", total_span.get_text())
-            if match:
-                logger.info("gazette_total_results", total=int(match.group(1)))
+        # Log total count ("... Ilanlari (92 Adet)") if present
+        match = _TOTAL_COUNT.search(html)
+        if match:
+            logger.info("gazette_total_results", total=int(match.group(1)))
 
-        rows = table.select(selectors.ILAN_RESULT_ROW)
-        for row in rows:
-            cells = row.find_all("td")
+        for row in hp.ILAN_RESULT_ROW(table):
+            cells = hp.TABLE_CELL(row)
             if len(cells) < 8:
                 continue
 
-            mudurluk = cells[0].get_text(strip=True)
-            sicil_no = cells[1].get_text(strip=True)
-            unvan = cells[2].get_text(strip=True)
-            yayin_tarihi = cells[3].get_text(strip=True) or None
-            sayi = cells[4].get_text(strip=True) or None
-            sayfa = cells[5].get_text(strip=True) or None
-            ilan_turu = cells[6].get_text(strip=True) or None
+            mudurluk = hp.text_of(cells[0])
+            sicil_no = hp.text_of(cells[1])
+            unvan = hp.text_of(cells[2])
+            yayin_tarihi = hp.text_of(cells[3]) or None
+            sayi = hp.text_of(cells[4]) or None
+            sayfa = hp.text_of(cells[5]) or None
+            ilan_turu = hp.text_of(cells[6]) or None
 
             # Extract PDF link from column 7
             pdf_url: str | None = None
-            pdf_link = cells[7].select_one(selectors.ILAN_PDF_LINK)
-            if pdf_link:
+            pdf_link = hp.first(hp.ILAN_PDF_LINK, cells[7])
+            if pdf_link is not None:
                 href = pdf_link.get("href", "")
                 if href:
                     # href is like "pdf_goster.php?Guid=..."
@@ -134,3 +210,34 @@ class GazetteClient:
             )
 
         return records
+
+
+def filter_records(
+    records: list[GazetteRecord],
+    ilan_turu: list[str] | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> list[GazetteRecord]:
+    """Keep records matching any of the notice types and published within the window.
+
+    Notice types match as Turkish case-insensitive substrings of ilan_turu, so
+    "sermaye" matches "Sermaye Artırımı". With a window set, records without a
+    readable yayin_tarihi are dropped.
+    """
+    wanted = [normalize_turkish(kind) for kind in ilan_turu or []]
+    kept: list[GazetteRecord] = []
+    for record in records:
+        if wanted:
+            kind = normalize_turkish(record.ilan_turu or "")
+            if not any(w in kind for w in wanted):
+                continue
+        if date_from is not None or date_to is not None:
+            published = parse_gazette_date(record.yayin_tarihi)
+            if published is None:
+                continue
+            if date_from is not None and published.date() < date_from:
+                continue
+            if date_to is not None and published.date() > date_to:
+                continue
+        kept.append(record)
+    return kept
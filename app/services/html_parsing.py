@@ -0,0 +1,177 @@
+"""lxml-based extraction helpers for TOBB HTML pages.
+
+Result tables and PDF viewer pages are parsed straight into an lxml tree and
+queried with the XPath expressions from app.services.selectors, compiled once
+at import. Cell text matches BeautifulSoup's get_text(strip=True), which the
+parsers used before: every text node is stripped and they are joined without
+a separator, comments excluded.
+
+PDF viewer pages nearly always carry a plain <embed>/<iframe>/<object> tag, so
+find_pdf_link first scans the raw markup for one. The scan only answers when
+the answer is certain to match the tree walk (first tag of its kind, simple
+quoted or bare attribute value, no comment or raw-text element before it);
+anything less plain falls through to the full parse.
+"""
+
+from __future__ import annotations
+
+import re
+
+from lxml import etree
+from lxml import html as lxml_html
+
+from app.services import selectors
+
+SEARCH_RESULT_TABLE = etree.XPath(selectors.SEARCH_RESULT_TABLE)
+SEARCH_RESULT_ROW = etree.XPath(selectors.SEARCH_RESULT_ROW)
+SEARCH_TOTAL_HEADER = etree.XPath(selectors.SEARCH_TOTAL_HEADER)
+ILAN_RESULT_TABLE = etree.XPath(selectors.ILAN_RESULT_TABLE)
+ILAN_RESULT_ROW = etree.XPath(selectors.ILAN_RESULT_ROW)
+ILAN_PDF_LINK = etree.XPath(selectors.ILAN_PDF_LINK)
+TABLE_CELL = etree.XPath(selectors.TABLE_CELL)
+
+_PDF_EMBED = etree.XPath(selectors.GAZETTE_PDF_EMBED)
+_PDF_IFRAME = etree.XPath(selectors.GAZETTE_PDF_IFRAME)
+_PDF_OBJECT = etree.XPath(selectors.GAZETTE_PDF_OBJECT)
+_META_REFRESH = etree.XPath(selectors.GAZETTE_META_REFRESH)
+_LINKS = etree.XPath(selectors.GAZETTE_LINK)
+_SCRIPTS = etree.XPath(selectors.GAZETTE_SCRIPT)
+
+_META_URL = re.compile(r"url\s*=\s*(.+)", re.IGNORECASE)
+_SCRIPT_REDIRECTS = tuple(
+    re.compile(pattern)
+    for pattern in (
+        r'(?:window|document)\.location(?:\.href)?\s*=\s*["\']([^"\']+)["\']',
+        r"window\.open\s*\(\s*[\"']([^\"']+)[\"']",
+        r"location\.replace\s*\(\s*[\"']([^\"']+)[\"']",
+        r"location\.assign\s*\(\s*[\"']([^\"']+)[\"']",
+    )
+)
+_QUOTED_PDF = re.compile(r'["\']([^"\']*\.pdf(?:\?[^"\']*)?)["\']', re.IGNORECASE)
+
+# Fast path: (tag, attribute, compiled tree fallback) in the order they are tried
+_EMBED_TAGS = (
+    ("embed", "src", _PDF_EMBED),
+    ("iframe", "src", _PDF_IFRAME),
+    ("object", "data", _PDF_OBJECT),
+)
+_TAG_OPEN = {tag: re.compile(rf"<{tag}(?=[\s/>])", re.IGNORECASE) for tag, _, _ in _EMBED_TAGS}
+_ATTRIBUTE = re.compile(
+    r"""\s+([^\s"'>/=]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`]+)))?""", re.DOTALL
+)
+_TAG_END = re.compile(r"\s*/?>")
+_OTHER_SOURCES = re.compile(r"<(?:meta|a|script)(?=[\s/>])", re.IGNORECASE)
+# Markup whose content the tree does not treat as elements
+_OPAQUE = re.compile(
+    r"<(?:!--|!\[CDATA\[|script|style|textarea|title|xmp|noembed|noframes)", re.IGNORECASE
+)
+
+
+def parse_html(markup: str) -> etree._Element | None:
+    """Parse an HTML document; None for an empty body."""
+    if not markup.strip():
+        return None
+    try:
+        return lxml_html.document_fromstring(markup)
+    except ValueError:
+        # str input carrying an XML encoding declaration
+        return lxml_html.document_fromstring(markup.encode("utf-8"))
+    except etree.ParserError:
+        return None
+
+
+def first(xpath: etree.XPath, node: etree._Element) -> etree._Element | None:
+    found = xpath(node)
+    return found[0] if found else None
+
+
+def text_of(element: etree._Element) -> str:
+    """Text of an element and its descendants, each text node stripped."""
+    return "".join(text.strip() for text in element.itertext())
+
+
+def find_pdf_link(markup: str) -> str | None:
+    """Raw (unresolved) PDF link from a pdf_goster.php HTML page, if any.
+
+    Tries in order: <embed>, <iframe>, <object>, <meta> refresh, <a> with .pdf,
+    JavaScript redirects, then any quoted .pdf URL in the page.
+    """
+    for tag, attribute, _ in _EMBED_TAGS:
+        found, value = _scan_first_tag(markup, tag, attribute)
+        if value:
+            return value
+        if found:
+            break
+    else:
+        if not _OTHER_SOURCES.search(markup):
+            # No tag the tree walk could use: skip the parse
+            return _quoted_pdf(markup)
+
+    root = parse_html(markup)
+    if root is not None:
+        link = _find_in_tree(root)
+        if link is not None:
+            return link
+    return _quoted_pdf(markup)
+
+
+def _find_in_tree(root: etree._Element) -> str | None:
+    for _, attribute, xpath in _EMBED_TAGS:
+        element = first(xpath, root)
+        if element is not None and element.get(attribute, ""):
+            return str(element.get(attribute))
+
+    meta = first(_META_REFRESH, root)
+    if meta is not None:
+        match = _META_URL.search(meta.get("content", ""))
+        if match:
+            return match.group(1).strip().strip("'\"")
+
+    for anchor in _LINKS(root):
+        href = anchor.get("href", "")
+        if href and ".pdf" in href.lower():
+            return str(href)
+
+    for script in _SCRIPTS(root):
+        text = script.text or ""
+        for pattern in _SCRIPT_REDIRECTS:
+            match = pattern.search(text)
+            if match:
+                return match.group(1)
+    return None
+
+
+def _quoted_pdf(markup: str) -> str | None:
+    match = _QUOTED_PDF.search(markup)
+    return match.group(1) if match else None
+
+
+def _scan_first_tag(markup: str, tag: str, attribute: str) -> tuple[bool, str | None]:
+    """Look at the first <tag> in the raw markup.
+
+    Returns (False, None) when the tag does not occur at all, (True, value) when
+    its attribute value is known for certain, and (True, None) when only a full
+    parse can tell.
+    """
+    match = _TAG_OPEN[tag].search(markup)
+    if match is None:
+        return False, None
+    if _OPAQUE.search(markup, 0, match.start()):
+        return True, None
+
+    values: dict[str, str] = {}
+    pos = match.end()
+    while _TAG_END.match(markup, pos) is None:
+        attr = _ATTRIBUTE.match(markup, pos)
+        if attr is None:
+            return True, None
+        name = attr.group(1).lower()
+        if name in values:
+            return True, None
+        values[name] = next((v for v in attr.group(2, 3, 4) if v is not None), "")
+        pos = attr.end()
+
+    value = values.get(attribute)
+    if not value or "&" in value or "\r" in value:
+        return True, None
+    return True, value
@@ -0,0 +1,354 @@
+"""Asynchronous extraction jobs backed by a local SQLite store.
+
+POST /jobs/extract records a job and returns immediately; a small pool of
+background workers runs the extraction. Results are polled by job id or
+POSTed to an optional callback URL. Queued and interrupted jobs are picked
+up again on startup, so restarts do not lose work. Submitting a URL that
+already has a queued or running job returns that job instead of starting
+a duplicate; the new caller's callback URL is added to it, and every
+registered callback receives the result.
+
+Callback URLs are checked before a job is accepted and again before
+delivery: http(s) only, and either on WEBHOOK_ALLOWED_HOSTS or, with no
+allow-list, resolving only to public addresses. Without an allow-list the
+webhook is sent to the address that was checked, so a DNS answer that
+changes between the check and the connection cannot redirect it inward.
+
+The store assumes a single API process owns the queue.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import socket
+import sqlite3
+import uuid
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+from datetime import UTC, datetime
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.exceptions import InvalidRequestError
+from app.core.logging import get_logger
+from app.schemas.enums import JobStatus
+from app.schemas.responses import ExtractResult, JobResponse
+from app.services.extractor import Extractor
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    pdf_url TEXT NOT NULL,
+    callback_url TEXT,
+    status TEXT NOT NULL,
+    result TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status);
+CREATE INDEX IF NOT EXISTS jobs_pdf_url ON jobs (pdf_url);
+CREATE TABLE IF NOT EXISTS job_callbacks (
+    job_id TEXT NOT NULL REFERENCES jobs (id),
+    callback_url TEXT NOT NULL,
+    PRIMARY KEY (job_id, callback_url)
+);
+"""
+
+
+def _now() -> str:
+    return datetime.now(UTC).isoformat(timespec="seconds")
+
+
+class JobStore:
+    """SQLite persistence for extraction jobs."""
+
+    def __init__(self, path: str) -> None:
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(_SCHEMA)
+
+    def create(self, pdf_url: str, callback_url: str | None) -> JobResponse:
+        now = _now()
+        job_id = uuid.uuid4().hex
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (id, pdf_url, callback_url, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, pdf_url, callback_url, JobStatus.QUEUED.value, now, now),
+            )
+            if callback_url is not None:
+                self._insert_callback(job_id, callback_url)
+        return self.get(job_id)  # type: ignore[return-value]
+
+    def add_callback(self, job_id: str, callback_url: str) -> JobResponse | None:
+        """Register another callback URL on an existing job."""
+        with self._conn:
+            self._insert_callback(job_id, callback_url)
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> JobResponse | None:
+        row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _to_response(row, self._callbacks(row)) if row else None
+
+    def find_active(self, pdf_url: str) -> JobResponse | None:
+        """A queued or running job for the same URL, if any."""
+        row = self._conn.execute(
+            "SELECT * FROM jobs WHERE pdf_url = ? AND status IN (?, ?) ORDER BY created_at LIMIT 1",
+            (pdf_url, JobStatus.QUEUED.value, JobStatus.RUNNING.value),
+        ).fetchone()
+        return _to_response(row, self._callbacks(row)) if row else None
+
+    def claim(self, job_id: str) -> bool:
+        """Move a queued job to RUNNING; False if another worker got it first."""
+        with self._conn:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND status = ?",
+                (JobStatus.RUNNING.value, _now(), job_id, JobStatus.QUEUED.value),
+            )
+        return cursor.rowcount == 1
+
+    def finish(self, job_id: str, result: ExtractResult) -> JobResponse | None:
+        status = JobStatus.FAILED if result.error else JobStatus.COMPLETED
+        with self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, updated_at = ? WHERE id = ?",
+                (status.value, result.model_dump_json(), _now(), job_id),
+            )
+        return self.get(job_id)
+
+    def requeue_unfinished(self) -> list[str]:
+        """Reset jobs interrupted by a restart and return all queued job ids, oldest first."""
+        with self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE status = ?",
+                (JobStatus.QUEUED.value, _now(), JobStatus.RUNNING.value),
+            )
+        rows = self._conn.execute(
+            "SELECT id FROM jobs WHERE status = ? ORDER BY created_at",
+            (JobStatus.QUEUED.value,),
+        ).fetchall()
+        return [row["id"] for row in rows]
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _insert_callback(self, job_id: str, callback_url: str) -> None:
+        self._conn.execute(
+            "INSERT OR IGNORE INTO job_callbacks (job_id, callback_url) VALUES (?, ?)",
+            (job_id, callback_url),
+        )
+
+    def _callbacks(self, row: sqlite3.Row) -> list[str]:
+        urls = [
+            r["callback_url"]
+            for r in self._conn.execute(
+                "SELECT callback_url FROM job_callbacks WHERE job_id = ? ORDER BY rowid",
+                (row["id"],),
+            )
+        ]
+        # Jobs stored before job_callbacks existed only have the column
+        if row["callback_url"] and row["callback_url"] not in urls:
+            urls.insert(0, row["callback_url"])
+        return urls
+
+
+def _to_response(row: sqlite3.Row, callback_urls: list[str]) -> JobResponse:
+    return JobResponse(
+        job_id=row["id"],
+        status=JobStatus(row["status"]),
+        pdf_url=row["pdf_url"],
+        callback_url=row["callback_url"],
+        callback_urls=callback_urls,
+        result=ExtractResult.model_validate_json(row["result"]) if row["result"] else None,
+        created_at=row["created_at"],
+        updated_at=row["updated_at"],
+    )
+
+
+def check_callback_url(url: str, allowed_hosts: list[str]) -> None:
+    """Raise InvalidRequestError unless the service may POST job results to url."""
+    parts = urlsplit(url)
+    host = (parts.hostname or "").rstrip(".")
+    if parts.scheme not in ("http", "https") or not host:
+        raise InvalidRequestError(
+            message="callback_url bir http(s) adresi olmali", detail=f"callback_url={url}"
+        )
+    if allowed_hosts:
+        allowed = [h.lower().rstrip(".") for h in allowed_hosts]
+        if not any(host == h or host.endswith("." + h) for h in allowed):
+            raise InvalidRequestError(
+                message="callback_url izin verilen adreslerden biri degil",
+                detail=f"host={host}",
+            )
+        return
+    if host == "localhost" or host.endswith(".localhost"):
+        raise InvalidRequestError(
+            message="callback_url yerel bir adres olamaz", detail=f"host={host}"
+        )
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return
+    if not address.is_global:
+        raise InvalidRequestError(
+            message="callback_url yerel bir adres olamaz", detail=f"host={host}"
+        )
+
+
+async def resolve_callback_url(url: str, allowed_hosts: list[str]) -> str | None:
+    """Check url like check_callback_url and resolve its host to a public address.
+
+    Returns the address to connect to, or None when the host is on the allow-list
+    (the operator vouches for it, internal or not). Raises InvalidRequestError if
+    the host does not resolve or any of its addresses is not global.
+    """
+    check_callback_url(url, allowed_hosts)
+    if allowed_hosts:
+        return None
+    parts = urlsplit(url)
+    host = (parts.hostname or "").rstrip(".")
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    try:
+        addresses = await _resolve_host(host, port)
+    except OSError as exc:
+        raise InvalidRequestError(
+            message="callback_url adresi cozumlenemedi", detail=f"host={host}"
+        ) from exc
+    if not addresses:
+        raise InvalidRequestError(
+            message="callback_url adresi cozumlenemedi", detail=f"host={host}"
+        )
+    for address in addresses:
+        if not address.is_global:
+            raise InvalidRequestError(
+                message="callback_url yerel bir adres olamaz",
+                detail=f"host={host} address={address}",
+            )
+    return str(addresses[0])
+
+
+async def _resolve_host(
+    host: str, port: int
+) -> list[ipaddress.IPv4Address | ipaddress.IPv6Address]:
+    infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    # IPv6 link-local answers carry a "%scope" suffix
+    return [ipaddress.ip_address(str(info[4][0]).split("%")[0]) for info in infos]
+
+
+def _pin_address(request: httpx.Request, address: str) -> None:
+    """Send request to address while keeping the host name for Host, SNI and TLS checks."""
+    request.extensions["sni_hostname"] = request.url.host
+    request.url = request.url.copy_with(host=address)
+
+
+class JobQueue:
+    """Runs queued extraction jobs on a fixed number of background workers."""
+
+    def __init__(
+        self,
+        store: JobStore,
+        extractor_factory: Callable[[], AbstractAsyncContextManager[Extractor]],
+        webhook_client: httpx.AsyncClient,
+        workers: int,
+        allowed_callback_hosts: list[str] | None = None,
+    ) -> None:
+        self._store = store
+        self._extractor_factory = extractor_factory
+        self._webhook = webhook_client
+        self._worker_count = workers
+        self._allowed_callback_hosts = list(allowed_callback_hosts or [])
+        self._queue: asyncio.Queue[str] = asyncio.Queue()
+        self._workers: list[asyncio.Task[None]] = []
+
+    def start(self) -> None:
+        for job_id in self._store.requeue_unfinished():
+            self._queue.put_nowait(job_id)
+        self._workers = [
+            asyncio.create_task(self._work(), name=f"extract-job-worker-{i}")
+            for i in range(self._worker_count)
+        ]
+        logger.info("job_queue_started", workers=self._worker_count, queued=self._queue.qsize())
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def submit(self, pdf_url: str, callback_url: str | None = None) -> JobResponse:
+        if callback_url is not None:
+            await resolve_callback_url(callback_url, self._allowed_callback_hosts)
+        active = self._store.find_active(pdf_url)
+        if active is not None:
+            logger.info("job_already_active", job_id=active.job_id, pdf_url=pdf_url)
+            if callback_url is not None and callback_url not in active.callback_urls:
+                return self._store.add_callback(active.job_id, callback_url) or active
+            return active
+        job = self._store.create(pdf_url, callback_url)
+        self._queue.put_nowait(job.job_id)
+        logger.info("job_queued", job_id=job.job_id, pdf_url=pdf_url)
+        return job
+
+    def get(self, job_id: str) -> JobResponse | None:
+        return self._store.get(job_id)
+
+    async def _work(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except Exception:
+                logger.exception("job_worker_error", job_id=job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str) -> None:
+        if not self._store.claim(job_id):
+            return
+        job = self._store.get(job_id)
+        if job is None:
+            return
+
+        try:
+            async with self._extractor_factory() as extractor:
+                result = await extractor.extract_from_url(job.pdf_url)
+        except Exception as exc:
+            # Auth failures etc. are raised rather than reported per URL
+            result = ExtractResult(source_pdf_url=job.pdf_url, error=str(exc))
+
+        finished = self._store.finish(job_id, result)
+        logger.info("job_finished", job_id=job_id, failed=result.error is not None)
+        if finished is not None:
+            for callback_url in finished.callback_urls:
+                await self._notify(finished, callback_url)
+
+    async def _notify(self, job: JobResponse, callback_url: str) -> None:
+        try:
+            # Checked again: the policy or the host's DNS records may have changed
+            address = await resolve_callback_url(callback_url, self._allowed_callback_hosts)
+        except InvalidRequestError as exc:
+            logger.warning(
+                "job_webhook_rejected", job_id=job.job_id, url=callback_url, reason=exc.detail
+            )
+            return
+        request = self._webhook.build_request(
+            "POST",
+            callback_url,
+            content=job.model_dump_json(),
+            headers={"Content-Type": "application/json"},
+        )
+        if address is not None:
+            _pin_address(request, address)
+        try:
+            resp = await self._webhook.send(request)
+            resp.raise_for_status()
+            logger.info("job_webhook_delivered", job_id=job.job_id)
+        except httpx.HTTPError:
+            logger.warning("job_webhook_failed", job_id=job.job_id, exc_info=True)
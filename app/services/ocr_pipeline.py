@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import io
+import mmap
 import subprocess
 import tempfile
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import pdfplumber
 import pytesseract
@@ -13,10 +16,51 @@ from app.core.exceptions import OCRError
 from app.core.logging import get_logger
 from app.utils.image_processing import detect_columns, preprocess_gazette_page, split_columns
 
+if TYPE_CHECKING:
+    from _typeshed import WriteableBuffer
+
 logger = get_logger(__name__)
 
 MIN_TEXT_LENGTH = 50  # Minimum chars to consider text layer sufficient
 
+PDFData = bytes | mmap.mmap
+
+
+class _MmapReader(io.RawIOBase):
+    """Read-only raw stream over an mmap, so a cached PDF is never copied whole."""
+
+    def __init__(self, data: mmap.mmap) -> None:
+        self._data = data
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: WriteableBuffer) -> int:
+        view = memoryview(buffer).cast("B")
+        chunk = self._data[self._pos : self._pos + len(view)]
+        view[: len(chunk)] = chunk
+        self._pos += len(chunk)
+        return len(chunk)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._data)}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+
+def _as_stream(pdf_data: PDFData) -> io.BufferedReader | io.BytesIO:
+    """Seekable file object for pdfplumber without writing a temp file."""
+    if isinstance(pdf_data, mmap.mmap):
+        return io.BufferedReader(_MmapReader(pdf_data))
+    return io.BytesIO(pdf_data)
+
 
 class OCRPipeline:
     """Three-tier OCR: pdfplumber text layer, column-aware pytesseract, OCRmyPDF fallback."""
@@ -24,8 +68,8 @@ class OCRPipeline:
     def __init__(self, settings: Settings) -> None:
         self._settings = settings
 
-    def extract_text(self, pdf_data: bytes) -> str:
-        """Extract text from PDF bytes.
+    def extract_text(self, pdf_data: PDFData) -> str:
+        """Extract text from PDF bytes or a read-only mmap of a cached PDF.
 
         Tier 1: pdfplumber text layer (layout-aware).
         Tier 1.5: Column-aware pytesseract (image render + column split).
@@ -45,16 +89,11 @@ class OCRPipeline:
         logger.info("ocr_tier1_5_insufficient, falling back to OCRmyPDF")
         return self._try_ocrmypdf(pdf_data)
 
-    def _try_text_layer(self, pdf_data: bytes) -> str:
+    def _try_text_layer(self, pdf_data: PDFData) -> str:
         """Tier 1: Extract embedded text layer with pdfplumber (layout-aware)."""
-        tmp_path = None
         try:
-            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
-                tmp.write(pdf_data)
-                tmp_path = tmp.name
-
             pages_text: list[str] = []
-            with pdfplumber.open(tmp_path) as pdf:
+            with pdfplumber.open(_as_stream(pdf_data)) as pdf:
                 for page in pdf.pages:
                     page_text = page.extract_text(layout=True)
                     if page_text:
@@ -64,20 +103,12 @@ class OCRPipeline:
         except Exception:
             logger.warning("pdfplumber_failed", exc_info=True)
             return ""
-        finally:
-            if tmp_path:
-                Path(tmp_path).unlink(missing_ok=True)
 
-    def _try_column_aware_ocr(self, pdf_data: bytes) -> str:
+    def _try_column_aware_ocr(self, pdf_data: PDFData) -> str:
         """Tier 1.5: Render PDF to images, detect/split columns, preprocess, OCR each."""
-        tmp_path = None
         try:
-            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
-                tmp.write(pdf_data)
-                tmp_path = tmp.name
-
             all_pages_text: list[str] = []
-            with pdfplumber.open(tmp_path) as pdf:
+            with pdfplumber.open(_as_stream(pdf_data)) as pdf:
                 for page_num, page in enumerate(pdf.pages):
                     page_text = self._ocr_single_page(page, page_num)
                     if page_text:
@@ -87,9 +118,6 @@ class OCRPipeline:
         except Exception:
             logger.warning("column_aware_ocr_failed", exc_info=True)
             return ""
-        finally:
-            if tmp_path:
-                Path(tmp_path).unlink(missing_ok=True)
 
     def _ocr_single_page(self, page: pdfplumber.page.Page, page_num: int) -> str:
         """Render a single PDF page, detect columns, preprocess, and OCR."""
@@ -132,7 +160,7 @@ class OCRPipeline:
 
         return "\n".join(column_texts)
 
-    def _try_ocrmypdf(self, pdf_data: bytes) -> str:
+    def _try_ocrmypdf(self, pdf_data: PDFData) -> str:
         """Tier 2: OCRmyPDF subprocess for image-based PDFs."""
         input_path = None
         output_path = None
@@ -0,0 +1,104 @@
+"""Cross-company index of OCR output per gazette page, backed by SQLite.
+
+One issue page (sayi + sayfa) of the gazette carries notices for many
+companies, and each company's pdf_goster.php Guid serves the same page. The
+index stores every OCR result once under the SHA-256 of the PDF bytes and
+maps (sayi, sayfa) to that hash, so:
+
+- a PDF whose page is already indexed is answered without downloading it;
+- a downloaded PDF whose bytes were OCR'd before, under any Guid, skips OCR.
+
+The page of a PDF link comes from the GazetteRecord it was listed with, so only
+links seen in a search or registry lookup can be answered before download.
+OCR output of a page never changes, so entries are not expired.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import UTC, datetime
+from pathlib import Path
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS texts (
+    sha256 TEXT PRIMARY KEY,
+    raw_text TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    sayi TEXT NOT NULL,
+    sayfa TEXT NOT NULL,
+    sha256 TEXT NOT NULL REFERENCES texts (sha256),
+    PRIMARY KEY (sayi, sayfa)
+);
+"""
+
+GazettePage = tuple[str, str]  # (sayi, sayfa)
+
+
+class GazettePageIndex:
+    """SQLite store of OCR text keyed by PDF content hash, with a (sayi, sayfa) lookup."""
+
+    def __init__(self, path: str) -> None:
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self.page_hits = 0
+        self.hash_hits = 0
+
+    def text_for_page(self, page: GazettePage) -> str | None:
+        row = self._conn.execute(
+            "SELECT t.raw_text FROM pages p JOIN texts t ON t.sha256 = p.sha256 "
+            "WHERE p.sayi = ? AND p.sayfa = ?",
+            page,
+        ).fetchone()
+        if row is None:
+            return None
+        self.page_hits += 1
+        return str(row[0])
+
+    def has_page(self, page: GazettePage) -> bool:
+        row = self._conn.execute(
+            "SELECT 1 FROM pages WHERE sayi = ? AND sayfa = ?", page
+        ).fetchone()
+        return row is not None
+
+    def text_for_hash(self, sha256: str) -> str | None:
+        row = self._conn.execute(
+            "SELECT raw_text FROM texts WHERE sha256 = ?", (sha256,)
+        ).fetchone()
+        if row is None:
+            return None
+        self.hash_hits += 1
+        return str(row[0])
+
+    def put(self, sha256: str, raw_text: str, page: GazettePage | None = None) -> None:
+        """Store OCR text for a PDF hash and, when known, point its page at it."""
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO texts (sha256, raw_text, created_at) VALUES (?, ?, ?)",
+                (sha256, raw_text, datetime.now(UTC).isoformat(timespec="seconds")),
+            )
+            if page is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO pages (sayi, sayfa, sha256) VALUES (?, ?, ?)",
+                    (*page, sha256),
+                )
+
+    def counts(self) -> tuple[int, int]:
+        """Number of (indexed pages, stored texts)."""
+        pages = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+        texts = self._conn.execute("SELECT COUNT(*) FROM texts").fetchone()[0]
+        return pages, texts
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def gazette_page(sayi: str | None, sayfa: str | None) -> GazettePage | None:
+    """(sayi, sayfa) key of a gazette record, None if either is missing."""
+    sayi, sayfa = (sayi or "").strip(), (sayfa or "").strip()
+    if not sayi or not sayfa:
+        return None
+    return sayi, sayfa
@@ -0,0 +1,165 @@
+"""Size-bounded on-disk cache of gazette PDFs, keyed by normalised pdf_goster.php link.
+
+Keys come from extractor.pdf_key: scheme, host, path and Guid, so a Guid on a
+foreign URL cannot plant a file that is later served for TOBB's link. A Guid
+always serves the same PDF, so a cached file never goes stale. Files
+are written atomically (temp file + os.replace) and evicted least-recently-
+used once the directory grows past its byte budget. Cached PDFs are handed to
+OCR as read-only mmaps, so a repeat extract neither downloads the file nor
+copies it into Python memory. The OCR text of a cached PDF can be stored next
+to it (same name, .txt) and is evicted together with the PDF.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import mmap
+import os
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class PDFCache:
+    """LRU directory of PDFs with a total size limit."""
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self._dir = Path(directory)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        self._sizes: OrderedDict[str, int] = OrderedDict()
+        self._total = 0
+        self._load_index()
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total
+
+    def contains(self, key: str) -> bool:
+        return self._name(key) in self._sizes
+
+    def path_for(self, key: str) -> Path | None:
+        """Path of the cached PDF, marking it recently used; None on a miss."""
+        name = self._name(key)
+        if name not in self._sizes:
+            return None
+        path = self._dir / name
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            self._forget(name)
+            return None
+        self._sizes.move_to_end(name)
+        return path
+
+    @contextmanager
+    def open(self, key: str) -> Iterator[mmap.mmap | None]:
+        """Map the cached PDF read-only for the duration of the block (None on a miss)."""
+        path = self.path_for(key)
+        data = self._map(path) if path is not None else None
+        if data is None:
+            yield None
+            return
+        with data:
+            yield data
+
+    def _map(self, path: Path) -> mmap.mmap | None:
+        try:
+            with path.open("rb") as fh:
+                return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            # Evicted between lookup and open, or truncated on disk
+            self._forget(path.name)
+            return None
+
+    def has_text(self, key: str) -> bool:
+        name = self._name(key)
+        return name in self._sizes and (self._dir / name).with_suffix(".txt").exists()
+
+    def get_text(self, key: str) -> str | None:
+        """Stored OCR text for a cached PDF, if any."""
+        if self.path_for(key) is None:
+            return None
+        try:
+            return (self._dir / self._name(key)).with_suffix(".txt").read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    async def put_text(self, key: str, text: str) -> None:
+        """Store OCR text alongside an already cached PDF."""
+        name = self._name(key)
+        if name not in self._sizes or not text:
+            return
+        data = text.encode("utf-8")
+        path = (self._dir / name).with_suffix(".txt")
+        try:
+            await asyncio.to_thread(self._write, path, data)
+        except OSError:
+            logger.warning("pdf_cache_write_failed", key=key, exc_info=True)
+            return
+        if name in self._sizes:
+            self._sizes[name] += len(data)
+            self._total += len(data)
+            self._evict()
+
+    async def put(self, key: str, data: bytes) -> None:
+        if not data or len(data) > self._max_bytes:
+            return
+        name = self._name(key)
+        try:
+            await asyncio.to_thread(self._write, self._dir / name, data)
+        except OSError:
+            logger.warning("pdf_cache_write_failed", key=key, exc_info=True)
+            return
+        self._forget(name)
+        (self._dir / name).with_suffix(".txt").unlink(missing_ok=True)
+        self._sizes[name] = len(data)
+        self._total += len(data)
+        self._evict()
+
+    def _write(self, path: Path, data: bytes) -> None:
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        while self._total > self._max_bytes and self._sizes:
+            name, _ = next(iter(self._sizes.items()))
+            (self._dir / name).unlink(missing_ok=True)
+            (self._dir / name).with_suffix(".txt").unlink(missing_ok=True)
+            self._forget(name)
+            logger.debug("pdf_cache_evicted", name=name)
+
+    def _forget(self, name: str) -> None:
+        size = self._sizes.pop(name, None)
+        if size is not None:
+            self._total -= size
+
+    def _load_index(self) -> None:
+        """Rebuild the LRU order from file mtimes left by a previous run."""
+        files = []
+        for path in self._dir.glob("*.pdf"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            text_path = path.with_suffix(".txt")
+            text_size = text_path.stat().st_size if text_path.exists() else 0
+            files.append((stat.st_mtime, path.name, stat.st_size + text_size))
+        for _, name, size in sorted(files):
+            self._sizes[name] = size
+            self._total += size
+        self._evict()
+
+    @staticmethod
+    def _name(key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest() + ".pdf"
@@ -1,16 +1,21 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Callable
 
 import httpx
-from bs4 import BeautifulSoup
 
 from app.config import Settings
 from app.core.exceptions import PDFFetchError
 from app.core.logging import get_logger
+from app.services.html_parsing import find_pdf_link
+from app.utils.hedging import Hedger
 
 logger = get_logger(__name__)
 
+_CHUNK_SIZE = 64 * 1024
+_CONTENT_RANGE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)")
+
 
 class PDFFetcher:
     """Downloads PDF files from TOBB with streaming, size limits, and retry.
@@ -20,62 +25,52 @@ class PDFFetcher:
     - HTML page with embedded PDF (embed/iframe/object tag)
     """
 
-    def __init__(self, client: httpx.AsyncClient, settings: Settings) -> None:
+    def __init__(
+        self, client: httpx.AsyncClient, settings: Settings, hedger: Hedger | None = None
+    ) -> None:
         self._client = client
         self._settings = settings
+        self._hedger = hedger
 
     async def fetch(self, url: str) -> bytes:
+        """Download a PDF; with a hedger, a slow download gets a racing duplicate."""
+        if self._hedger is not None:
+            return await self._hedger.run("pdf", lambda: self._fetch(url))
+        return await self._fetch(url)
+
+    async def _fetch(self, url: str) -> bytes:
         max_bytes = self._settings.MAX_PDF_MB * 1024 * 1024
 
         try:
-            # First, do a non-streaming GET to check content type
-            resp = await self._client.get(url)
-            resp.raise_for_status()
-
-            content_type = resp.headers.get("content-type", "")
+            async with self._client.stream("GET", url) as resp:
+                resp.raise_for_status()
+                content_type = resp.headers.get("content-type", "")
 
-            if "application/pdf" in content_type:
-                # Direct PDF response
-                pdf_data = resp.content
-                if len(pdf_data) > max_bytes:
-                    raise PDFFetchError(
-                        message=f"PDF boyutu limiti asildi ({len(pdf_data)} bytes)",
-                        detail=f"max={self._settings.MAX_PDF_MB}MB, url={url}",
-                    )
-                logger.info("pdf_fetched", url=url, size_bytes=len(pdf_data), mode="direct")
-                return pdf_data
+                if "text/html" not in content_type:
+                    # Direct PDF, or an unlabelled body that must start with %PDF
+                    mode = "direct" if "application/pdf" in content_type else "raw"
+                    pdf_data = await self._read_pdf_body(resp, url, max_bytes, content_type)
+                    logger.info("pdf_fetched", url=url, size_bytes=len(pdf_data), mode=mode)
+                    return pdf_data
 
-            if "text/html" in content_type:
                 # HTML page - look for embedded PDF URL
-                pdf_url = self._extract_pdf_url_from_html(resp.text, url)
-                if pdf_url:
-                    return await self._stream_pdf(pdf_url, max_bytes)
-
-                # Log a snippet of the HTML for debugging
-                snippet = resp.text[:500].replace("\n", " ")
-                logger.warning(
-                    "pdf_html_no_embed_found",
-                    url=url,
-                    html_snippet=snippet,
-                )
-                raise PDFFetchError(
-                    message="PDF linki HTML sayfasinda bulunamadi",
-                    detail=f"url={url}",
+                html = (await self._read_body(resp, url, max_bytes)).decode(
+                    resp.encoding or "utf-8", errors="replace"
                 )
 
-            # Unknown content type - try treating as PDF
-            pdf_data = resp.content
-            if pdf_data[:4] == b"%PDF":
-                if len(pdf_data) > max_bytes:
-                    raise PDFFetchError(
-                        message=f"PDF boyutu limiti asildi ({len(pdf_data)} bytes)",
-                        detail=f"max={self._settings.MAX_PDF_MB}MB, url={url}",
-                    )
-                logger.info("pdf_fetched", url=url, size_bytes=len(pdf_data), mode="raw")
-                return pdf_data
+            pdf_url = self._extract_pdf_url_from_html(html, url)
+            if pdf_url:
+                return await self._stream_pdf(pdf_url, max_bytes)
 
+            # Log a snippet of the HTML for debugging
+            snippet = html[:500].replace("\n", " ")
+            logger.warning(
+                "pdf_html_no_embed_found",
+                url=url,
+                html_snippet=snippet,
+            )
             raise PDFFetchError(
-                message=f"Beklenmeyen icerik tipi: {content_type}",
+                message="PDF linki HTML sayfasinda bulunamadi",
                 detail=f"url={url}",
             )
 
@@ -102,67 +97,15 @@ class PDFFetcher:
         3. <a> tags with .pdf in href
         4. JavaScript redirects (window.location, document.location, etc.)
         5. Regex fallback for any quoted .pdf URL in the HTML
+
+        Plain embed/iframe/object pages are answered by a regex scan without
+        building a tree; see app.services.html_parsing.
         """
-        soup = BeautifulSoup(html, "lxml")
-
-        # 1. Check embed tag
-        embed = soup.select_one("embed[src]")
-        if embed:
-            src = embed.get("src", "")
-            if src:
-                return _resolve_url(src, base_url)
-
-        # 2. Check iframe tag
-        iframe = soup.select_one("iframe[src]")
-        if iframe:
-            src = iframe.get("src", "")
-            if src:
-                return _resolve_url(src, base_url)
-
-        # 3. Check object tag
-        obj = soup.select_one("object[data]")
-        if obj:
-            data = obj.get("data", "")
-            if data:
-                return _resolve_url(data, base_url)
-
-        # 4. Check meta refresh redirect
-        meta = soup.select_one('meta[http-equiv="refresh" i]')
-        if meta:
-            content = meta.get("content", "")
-            match = re.search(r"url\s*=\s*(.+)", content, re.IGNORECASE)
-            if match:
-                url = match.group(1).strip().strip("'\"")
-                return _resolve_url(url, base_url)
-
-        # 5. Check <a> tags with .pdf in href
-        for a_tag in soup.select("a[href]"):
-            href = a_tag.get("href", "")
-            if href and ".pdf" in href.lower():
-                return _resolve_url(href, base_url)
-
-        # 6. Check JavaScript for redirect patterns
-        for script in soup.select("script"):
-            text = script.string or ""
-            for pattern in (
-                r'(?:window|document)\.location(?:\.href)?\s*=\s*["\']([^"\']+)["\']',
-                r"window\.open\s*\(\s*[\"']([^\"']+)[\"']",
-                r"location\.replace\s*\(\s*[\"']([^\"']+)[\"']",
-                r"location\.assign\s*\(\s*[\"']([^\"']+)[\"']",
-            ):
-                match = re.search(pattern, text)
-                if match:
-                    return _resolve_url(match.group(1), base_url)
-
-        # 7. Last resort: regex scan entire HTML for quoted .pdf URLs
-        pdf_match = re.search(r'["\']([^"\']*\.pdf(?:\?[^"\']*)?)["\']', html, re.IGNORECASE)
-        if pdf_match:
-            return _resolve_url(pdf_match.group(1), base_url)
-
-        return None
+        link = find_pdf_link(html)
+        return _resolve_url(link, base_url) if link is not None else None
 
     async def _stream_pdf(self, url: str, max_bytes: int) -> bytes:
-        """Stream-download a PDF with size limit enforcement."""
+        """Stream-download an embedded PDF with size limit enforcement."""
         async with self._client.stream("GET", url) as resp:
             resp.raise_for_status()
 
@@ -172,35 +115,154 @@ class PDFFetcher:
                     message="PDF linki HTML sayfasinda bulunamadi",
                     detail=f"embedded URL returned HTML, url={url}",
                 )
+            try:
+                pdf_data = await self._read_pdf_body(resp, url, max_bytes, content_type)
+            except PDFFetchError as exc:
+                if not exc.message.startswith("Beklenmeyen icerik tipi"):
+                    raise
+                raise PDFFetchError(
+                    message="PDF linki HTML sayfasinda bulunamadi",
+                    detail=f"embedded content is not a valid PDF, url={url}",
+                ) from exc
 
-            content_length = resp.headers.get("content-length")
-            if content_length and int(content_length) > max_bytes:
+        logger.info("pdf_fetched", url=url, size_bytes=len(pdf_data), mode="embedded")
+        return pdf_data
+
+    async def _read_pdf_body(
+        self, resp: httpx.Response, url: str, max_bytes: int, content_type: str
+    ) -> bytes:
+        """Read a PDF body, rejecting it on the first chunk if it lacks the %PDF magic."""
+
+        def check_magic(head: bytes) -> None:
+            if head[:4] != b"%PDF":
                 raise PDFFetchError(
-                    message=f"PDF boyutu limiti asildi ({content_length} bytes)",
-                    detail=f"max={self._settings.MAX_PDF_MB}MB, url={url}",
+                    message=f"Beklenmeyen icerik tipi: {content_type}",
+                    detail=f"url={url}",
                 )
 
-            chunks: list[bytes] = []
-            total = 0
-            async for chunk in resp.aiter_bytes(chunk_size=64 * 1024):
-                total += len(chunk)
-                if total > max_bytes:
+        return await self._read_body(resp, url, max_bytes, first_chunk_check=check_magic)
+
+    async def _read_body(
+        self,
+        resp: httpx.Response,
+        url: str,
+        max_bytes: int,
+        first_chunk_check: Callable[[bytes], None] | None = None,
+    ) -> bytes:
+        """Read a streamed body into one buffer, failing as soon as it exceeds max_bytes.
+
+        When Content-Length is known the buffer is allocated once up front instead of
+        growing chunk by chunk. If the connection drops midway, the download resumes
+        from the received offset with a Range request (up to PDF_RESUME_ATTEMPTS
+        times); a server that ignores the range restarts it from zero.
+        """
+        expected = _content_length(resp)
+        if expected > max_bytes:
+            raise self._too_large(expected, url)
+        validator = resp.headers.get("etag") or resp.headers.get("last-modified")
+        resumable = "content-encoding" not in resp.headers
+
+        buffer = bytearray(expected)
+        size = 0
+        current = resp
+        attempts = 0
+        while True:
+            try:
+                async for chunk in current.aiter_bytes(chunk_size=_CHUNK_SIZE):
+                    if size == 0 and first_chunk_check is not None:
+                        first_chunk_check(chunk)
+                    end = size + len(chunk)
+                    if end > max_bytes:
+                        raise self._too_large(end, url)
+                    if end <= len(buffer):
+                        buffer[size:end] = chunk
+                    else:
+                        # Content-Length was missing or too small
+                        del buffer[size:]
+                        buffer += chunk
+                    size = end
+                break
+            except (httpx.ReadError, httpx.ReadTimeout, httpx.RemoteProtocolError):
+                attempts += 1
+                if attempts > self._settings.PDF_RESUME_ATTEMPTS:
+                    raise
+                logger.warning(
+                    "pdf_download_interrupted",
+                    url=url,
+                    received_bytes=size,
+                    expected_bytes=expected or None,
+                    attempt=attempts,
+                )
+            finally:
+                if current is not resp:
+                    await current.aclose()
+
+            current = await self._reopen(resp, size if resumable else 0, validator)
+            if current.status_code == 206 and _range_start(current) == size:
+                total = _range_total(current)
+                if expected and total and total != expected:
+                    await current.aclose()
                     raise PDFFetchError(
-                        message=f"PDF boyutu limiti asildi ({total} bytes)",
-                        detail=f"max={self._settings.MAX_PDF_MB}MB, url={url}",
+                        message="PDF indirme hatasi",
+                        detail=f"devam edilen indirmede boyut degisti, url={url}",
                     )
-                chunks.append(chunk)
-
-        pdf_data = b"".join(chunks)
-
-        if pdf_data[:4] != b"%PDF":
+                logger.info("pdf_download_resumed", url=url, offset=size)
+                continue
+            # Range not honoured (or not attempted): start over with the new response
+            expected = _content_length(current)
+            if expected > max_bytes:
+                await current.aclose()
+                raise self._too_large(expected, url)
+            buffer = bytearray(expected)
+            size = 0
+
+        if size == 0 and first_chunk_check is not None:
+            first_chunk_check(b"")
+        if expected and size < expected:
             raise PDFFetchError(
-                message="PDF linki HTML sayfasinda bulunamadi",
-                detail=f"embedded content is not a valid PDF, url={url}",
+                message="PDF eksik indirildi",
+                detail=f"{size}/{expected} bytes, url={url}",
             )
-
-        logger.info("pdf_fetched", url=url, size_bytes=len(pdf_data), mode="embedded")
-        return pdf_data
+        del buffer[size:]
+        return bytes(buffer)
+
+    async def _reopen(
+        self, resp: httpx.Response, offset: int, validator: str | None
+    ) -> httpx.Response:
+        """Re-request the same URL, asking for the bytes from `offset` onwards."""
+        headers: dict[str, str] = {}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            if validator:
+                headers["If-Range"] = validator
+        request = self._client.build_request("GET", resp.url, headers=headers)
+        new_resp = await self._client.send(request, stream=True)
+        if new_resp.status_code not in (200, 206):
+            await new_resp.aclose()
+            new_resp.raise_for_status()
+        return new_resp
+
+    def _too_large(self, size: int, url: str) -> PDFFetchError:
+        return PDFFetchError(
+            message=f"PDF boyutu limiti asildi ({size} bytes)",
+            detail=f"max={self._settings.MAX_PDF_MB}MB, url={url}",
+        )
+
+
+def _content_length(resp: httpx.Response) -> int:
+    value = resp.headers.get("content-length", "")
+    return int(value) if value.isdigit() else 0
+
+
+def _range_start(resp: httpx.Response) -> int | None:
+    """Start offset from a `Content-Range: bytes start-end/total` header."""
+    match = _CONTENT_RANGE.match(resp.headers.get("content-range", ""))
+    return int(match.group(1)) if match else None
+
+
+def _range_total(resp: httpx.Response) -> int | None:
+    match = _CONTENT_RANGE.match(resp.headers.get("content-range", ""))
+    return int(match.group(3)) if match and match.group(3) != "*" else None
 
 
 def _resolve_url(src: str, base_url: str) -> str:
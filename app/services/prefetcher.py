@@ -0,0 +1,126 @@
+"""Background prefetch of gazette PDFs right after a search.
+
+Clients nearly always extract the newest one or two PDFs of a search result
+straight away. When enabled, /search hands its enriched records to the
+Prefetcher, which downloads (and optionally OCRs) the top-K pdf_urls of each
+record into the PDF cache so the follow-up /extract is a cache hit.
+
+Prefetching is low priority: the worker only starts a batch while the global
+rate limiter has no waiters and a token to spare, and the number of pending
+PDFs is capped - surplus URLs are dropped, not queued.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+
+from app.core.logging import get_logger
+from app.schemas.responses import SearchRecord
+from app.services.extractor import Extractor, pdf_key
+from app.services.pdf_cache import PDFCache
+from app.utils.rate_limit import TokenBucket
+
+logger = get_logger(__name__)
+
+_IDLE_POLL_SECONDS = 0.5
+
+
+class Prefetcher:
+    """Single background worker that warms the PDF cache from search results."""
+
+    def __init__(
+        self,
+        extractor_factory: Callable[[], AbstractAsyncContextManager[Extractor]],
+        pdf_cache: PDFCache,
+        top_k: int,
+        max_pending: int,
+        ocr: bool,
+        limiter: TokenBucket | None = None,
+    ) -> None:
+        self._extractor_factory = extractor_factory
+        self._pdf_cache = pdf_cache
+        self._top_k = top_k
+        self._max_pending = max_pending
+        self._ocr = ocr
+        self._limiter = limiter
+        self._queue: asyncio.Queue[str] = asyncio.Queue()
+        self._pending: set[str] = set()
+        self._worker: asyncio.Task[None] | None = None
+        self._current: asyncio.Task[None] | None = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def start(self) -> None:
+        self._worker = asyncio.create_task(self._work(), name="pdf-prefetch-worker")
+
+    async def stop(self) -> None:
+        self.cancel()
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+
+    def schedule(self, records: list[SearchRecord]) -> int:
+        """Queue the newest top-K PDFs of each record; returns how many were accepted."""
+        accepted = 0
+        for record in records:
+            for url in record.pdf_urls[: self._top_k]:
+                key = pdf_key(url)
+                if not key or key in self._pending or self._is_warm(key):
+                    continue
+                if len(self._pending) >= self._max_pending:
+                    logger.info("pdf_prefetch_queue_full", pending=len(self._pending))
+                    return accepted
+                self._pending.add(key)
+                self._queue.put_nowait(url)
+                accepted += 1
+        return accepted
+
+    def cancel(self) -> None:
+        """Drop everything still queued and abort the batch in progress.
+
+        The running download or OCR is cancelled through its in-flight key unless a
+        user request is waiting on the same PDF, in which case it runs on for them.
+        """
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._pending.clear()
+        if self._current is not None:
+            self._current.cancel()
+
+    async def _work(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            await self._wait_until_idle()
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            self._current = asyncio.create_task(self._run(batch))
+            await asyncio.gather(self._current, return_exceptions=True)
+            self._current = None
+            for url in batch:
+                self._pending.discard(pdf_key(url) or "")
+
+    async def _run(self, batch: list[str]) -> None:
+        try:
+            async with self._extractor_factory() as extractor:
+                await extractor.prefetch(batch, ocr=self._ocr)
+            logger.info("pdf_prefetch_done", count=len(batch), ocr=self._ocr)
+        except Exception:
+            logger.warning("pdf_prefetch_batch_failed", count=len(batch), exc_info=True)
+
+    async def _wait_until_idle(self) -> None:
+        """Let user traffic go first: wait while others are queued on the rate limiter."""
+        if self._limiter is None:
+            return
+        while self._limiter.queue_depth > 0 or self._limiter.available < 1:
+            await asyncio.sleep(_IDLE_POLL_SECONDS)
+
+    def _is_warm(self, key: str) -> bool:
+        if self._ocr:
+            return self._pdf_cache.has_text(key)
+        return self._pdf_cache.contains(key)
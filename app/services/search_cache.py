@@ -0,0 +1,206 @@
+"""TTL + LRU cache for public trade-name search results.
+
+Keys are NFC-normalized, whitespace-collapsed and Turkish-case-folded, so
+"Altınkaya", "ALTINKAYA" and "ALTİNKAYA" share one entry (the same variants
+_search_with_retry would try). Entries past their TTL are still served for
+a stale window while a background refresh runs. An optional on-disk tier
+keeps entries across restarts.
+
+Queries that came back empty after the full retry ladder are remembered in a
+short-TTL negative cache so repeated misses skip TOBB entirely.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.core.logging import get_logger
+from app.schemas.responses import SearchRecord
+from app.utils.turkish import normalize_turkish
+
+logger = get_logger(__name__)
+
+
+def normalize_query_key(query: str) -> str:
+    """Cache key for a trade-name query: NFC, collapsed whitespace, Turkish case fold."""
+    return normalize_turkish(query)
+
+
+@dataclass
+class CachedSearch:
+    results: list[SearchRecord]
+    total: int
+    stale: bool
+
+
+@dataclass
+class _Entry:
+    results: list[dict[str, object]]
+    total: int
+    stored_at: float
+
+
+class SearchCache:
+    """In-memory LRU of search results with TTL, stale-while-revalidate and disk tier."""
+
+    def __init__(
+        self,
+        ttl: float,
+        stale_ttl: float,
+        max_entries: int,
+        disk_dir: str = "",
+        negative_ttl: float = 0,
+    ) -> None:
+        self._ttl = ttl
+        self._stale_ttl = stale_ttl
+        self._max_entries = max_entries
+        self._disk_dir = Path(disk_dir) if disk_dir else None
+        self._negative_ttl = negative_ttl
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._negatives: OrderedDict[str, float] = OrderedDict()
+        self._refreshing: dict[str, asyncio.Task[None]] = {}
+        if self._disk_dir is not None:
+            self._disk_dir.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl > 0
+
+    def get(self, query: str) -> CachedSearch | None:
+        """Return cached results, flagged stale if past TTL but within the stale window."""
+        if not self.enabled:
+            return None
+        key = normalize_query_key(query)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._load_from_disk(key)
+            if entry is None:
+                return None
+            self._store(key, entry)
+
+        age = time.time() - entry.stored_at
+        if age > self._ttl + self._stale_ttl:
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return CachedSearch(
+            results=[SearchRecord.model_validate(r) for r in entry.results],
+            total=entry.total,
+            stale=age > self._ttl,
+        )
+
+    def put(self, query: str, results: list[SearchRecord], total: int) -> None:
+        if not self.enabled:
+            return
+        key = normalize_query_key(query)
+        entry = _Entry(
+            results=[r.model_dump(exclude={"pdf_urls"}) for r in results],
+            total=total,
+            stored_at=time.time(),
+        )
+        self._negatives.pop(key, None)
+        self._store(key, entry)
+        self._save_to_disk(key, entry)
+
+    def is_known_missing(self, query: str) -> bool:
+        """True if the query recently returned no results after all retries."""
+        key = normalize_query_key(query)
+        stored_at = self._negatives.get(key)
+        if stored_at is None:
+            return False
+        if time.monotonic() - stored_at > self._negative_ttl:
+            del self._negatives[key]
+            return False
+        return True
+
+    def put_negative(self, *queries: str) -> None:
+        """Remember queries (e.g. original and I→İ variant) as not found."""
+        if self._negative_ttl <= 0:
+            return
+        now = time.monotonic()
+        for query in queries:
+            key = normalize_query_key(query)
+            self._negatives[key] = now
+            self._negatives.move_to_end(key)
+        while len(self._negatives) > self._max_entries:
+            self._negatives.popitem(last=False)
+
+    def invalidate(self, query: str) -> None:
+        """Drop both positive and negative entries for a query."""
+        key = normalize_query_key(query)
+        self._entries.pop(key, None)
+        self._negatives.pop(key, None)
+        if self._disk_dir is not None:
+            self._disk_path(key).unlink(missing_ok=True)
+
+    def refresh_in_background(
+        self,
+        query: str,
+        fetch: Callable[[], Awaitable[tuple[list[SearchRecord], int]]],
+    ) -> None:
+        """Re-run a search for a stale entry unless a refresh is already in flight."""
+        key = normalize_query_key(query)
+        if key in self._refreshing:
+            return
+
+        async def refresh() -> None:
+            try:
+                results, total = await fetch()
+                if results:
+                    self.put(query, results, total)
+            except Exception:
+                logger.warning("search_cache_refresh_failed", query=query, exc_info=True)
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    def _store(self, key: str, entry: _Entry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_path(self, key: str) -> Path:
+        assert self._disk_dir is not None
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self._disk_dir / f"{digest}.json"
+
+    def _load_from_disk(self, key: str) -> _Entry | None:
+        if self._disk_dir is None:
+            return None
+        path = self._disk_path(key)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            return _Entry(results=data["results"], total=data["total"], stored_at=data["stored_at"])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError):
+            logger.warning("search_cache_disk_read_failed", path=str(path), exc_info=True)
+            return None
+
+    def _save_to_disk(self, key: str, entry: _Entry) -> None:
+        if self._disk_dir is None:
+            return
+        path = self._disk_path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            tmp_path.write_text(
+                json.dumps(
+                    {"results": entry.results, "total": entry.total, "stored_at": entry.stored_at},
+                    ensure_ascii=False,
+                ),
+                encoding="utf-8",
+            )
+            os.replace(tmp_path, path)
+        except OSError:
+            logger.warning("search_cache_disk_write_failed", path=str(path), exc_info=True)
+            tmp_path.unlink(missing_ok=True)
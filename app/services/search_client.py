@@ -1,15 +1,13 @@
 from __future__ import annotations
 
-import asyncio
 import re
 
 import httpx
-from bs4 import BeautifulSoup
 
 from app.config import Settings
 from app.core.logging import get_logger
 from app.schemas.responses import SearchRecord
-from app.services import selectors
+from app.services import html_parsing as hp
 from app.services.captcha_handler import CaptchaHandler
 
 logger = get_logger(__name__)
@@ -32,11 +30,9 @@ class SearchClient:
         """Search and return (results, total_records)."""
         base = self._settings.TOBB_BASE_URL
 
-        # Init session by hitting the search page
+        # Init session by hitting the search page (pacing is handled by the transport)
         await self._client.get(f"{base}/view/hizlierisim/unvansorgulama.php")
 
-        await asyncio.sleep(self._settings.RATE_LIMIT_DELAY)
-
         # Solve search captcha
         captcha_text = await self._captcha.solve(context="search")
 
@@ -58,31 +54,30 @@ class SearchClient:
 
     @staticmethod
     def _parse_results(html: str) -> tuple[list[SearchRecord], int]:
-        soup = BeautifulSoup(html, "lxml")
         records: list[SearchRecord] = []
         total = 0
 
-        table = soup.select_one(selectors.SEARCH_RESULT_TABLE)
-        if not table:
+        root = hp.parse_html(html)
+        table = hp.first(hp.SEARCH_RESULT_TABLE, root) if root is not None else None
+        if table is None:
             return records, total
 
         # "Toplam Kayıt Sayısı: 384" header'dan toplam sayiyi cek
-        header = table.select_one(selectors.SEARCH_TOTAL_HEADER)
-        if header:
-            match = re.search(r"(\d+)", header.get_text())
+        header = hp.first(hp.SEARCH_TOTAL_HEADER, table)
+        if header is not None:
+            match = re.search(r"(\d+)", hp.text_of(header))
             if match:
                 total = int(match.group(1))
 
         # Satirlari parse et: #, Unvan, Sicil No, Tsm
-        rows = table.select(selectors.SEARCH_RESULT_ROW)
-        for row in rows:
-            cells = row.find_all("td")
+        for row in hp.SEARCH_RESULT_ROW(table):
+            cells = hp.TABLE_CELL(row)
             if len(cells) < 4:
                 continue
 
-            title = cells[1].get_text(strip=True)
-            registry_no = cells[2].get_text(strip=True)
-            tsm = cells[3].get_text(strip=True)
+            title = hp.text_of(cells[1])
+            registry_no = hp.text_of(cells[2])
+            tsm = hp.text_of(cells[3])
 
             records.append(
                 SearchRecord(
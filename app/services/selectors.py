@@ -1,23 +1,42 @@
-"""HTML CSS selectors for TOBB website parsing.
+"""HTML XPath selectors for TOBB website parsing.
 
 Centralized here so that when TOBB changes their markup,
-only this file needs updating.
+only this file needs updating. Expressions are compiled once in
+app.services.html_parsing and evaluated directly on lxml trees; the CSS
+selector each one replaces is noted alongside.
 """
 
 from __future__ import annotations
 
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
 # Unvan sorgulama (public search) result selectors
-SEARCH_RESULT_TABLE = "table.table.table-bordered.table-striped"
-SEARCH_RESULT_ROW = "tbody tr"
-SEARCH_TOTAL_HEADER = "thead th[colspan]"
+# table.table.table-bordered.table-striped
+SEARCH_RESULT_TABLE = (
+    f"(//table[{_has_class('table')} and {_has_class('table-bordered')}"
+    f" and {_has_class('table-striped')}])[1]"
+)
+SEARCH_RESULT_ROW = ".//tbody//tr"  # tbody tr
+SEARCH_TOTAL_HEADER = "(.//thead//th[@colspan])[1]"  # thead th[colspan]
 
 # Ilan goruntuleme (authenticated gazette search) result selectors
-ILAN_RESULT_TABLE = "#tblIlanGoruntuleme"
-ILAN_RESULT_ROW = "tbody tr"
-ILAN_TOTAL_SPAN = "span"  # "Yayinlanmis ... Ilanlari (92 Adet)"
-ILAN_PDF_LINK = 'a[href*="pdf_goster"]'
-
-# PDF viewer selectors (pdf_goster.php may return HTML with embedded PDF)
-GAZETTE_PDF_EMBED = "embed[src*='.pdf']"
-GAZETTE_PDF_IFRAME = "iframe[src*='.pdf']"
-GAZETTE_PDF_OBJECT = "object[data*='.pdf']"
+ILAN_RESULT_TABLE = "(//*[@id='tblIlanGoruntuleme'])[1]"  # #tblIlanGoruntuleme
+ILAN_RESULT_ROW = ".//tbody//tr"  # tbody tr
+ILAN_PDF_LINK = "(.//a[contains(@href, 'pdf_goster')])[1]"  # a[href*="pdf_goster"]
+
+# Table cells of a result row (find_all("td") also matched nested cells)
+TABLE_CELL = ".//td"
+
+# PDF viewer selectors (pdf_goster.php may return HTML with embedded PDF),
+# in the order they are tried
+GAZETTE_PDF_EMBED = "(//embed[@src])[1]"  # embed[src]
+GAZETTE_PDF_IFRAME = "(//iframe[@src])[1]"  # iframe[src]
+GAZETTE_PDF_OBJECT = "(//object[@data])[1]"  # object[data]
+GAZETTE_META_REFRESH = (  # meta[http-equiv="refresh" i]
+    "(//meta[translate(@http-equiv, 'REFSH', 'refsh') = 'refresh'])[1]"
+)
+GAZETTE_LINK = "//a[@href]"  # a[href]
+GAZETTE_SCRIPT = "//script"  # script
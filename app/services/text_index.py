@@ -0,0 +1,255 @@
+"""Local full-text index of extracted gazette text (SQLite FTS5).
+
+Every successful extraction is stored with the GazetteRecord it was listed
+with (company, registry office, publication date, notice type), so questions
+like "which companies mentioned X last month" are answered from disk instead
+of TOBB.
+
+FTS5's unicode61 tokenizer lowercases and strips diacritics but leaves the
+Turkish dotless ı as a letter of its own, and lowercases I to i, so "ARTIRIMI"
+and "artırımı" would index as different words. Text is therefore folded
+before indexing and querying: ı/I/İ become i, ç ğ ö ş ü (and â î û) lose
+their marks. The fold maps one character to one, so match positions in the
+folded text are also positions in the original, which the snippets rely on.
+"""
+
+from __future__ import annotations
+
+import html
+import re
+import sqlite3
+from dataclasses import dataclass
+from datetime import UTC, date, datetime
+from pathlib import Path
+
+from app.schemas.responses import GazetteRecord
+from app.services.gazette_cache import parse_gazette_date
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notices (
+    id INTEGER PRIMARY KEY,
+    pdf_url TEXT NOT NULL UNIQUE,
+    mudurluk TEXT,
+    sicil_no TEXT,
+    unvan TEXT,
+    yayin_tarihi TEXT,
+    published_on TEXT,
+    sayi TEXT,
+    sayfa TEXT,
+    ilan_turu TEXT,
+    raw_text TEXT NOT NULL,
+    indexed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS notices_published_on ON notices (published_on);
+CREATE VIRTUAL TABLE IF NOT EXISTS notices_fts USING fts5(
+    unvan, ilan_turu, body, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+_TURKISH_FOLD = str.maketrans("İIıÇĞÖŞÜÂÎÛçğöşüâîû", "iiicgosuaiucgosuaiu")
+_TERM = re.compile(r"\w+\*?")
+# highlight() markers; control characters never produced by OCR
+_OPEN, _CLOSE = "\x02", "\x03"
+_HIGHLIGHT = re.compile(f"{_OPEN}(.*?){_CLOSE}", re.DOTALL)
+_SNIPPET_CONTEXT = 80  # characters shown on each side of the first match
+
+
+def fold_text(text: str) -> str:
+    """Turkish-insensitive lowercase form used on both sides of a match."""
+    return text.translate(_TURKISH_FOLD).lower()
+
+
+def match_expression(query: str, ilan_turu: list[str] | None = None) -> str | None:
+    """FTS5 MATCH expression for a free-text query; None if it has no searchable words.
+
+    Every word must occur (in any column); a trailing * makes it a prefix.
+    Notice types restrict the ilan_turu column to any of the given phrases,
+    matched as word prefixes.
+    """
+    terms = [_phrase(term) for term in _TERM.findall(fold_text(query))]
+    if not terms:
+        return None
+    expression = " AND ".join(terms)
+    kinds = [f'"{" ".join(words)}"*' for kind in ilan_turu or [] if (words := _words(kind))]
+    if kinds:
+        expression += f" AND ilan_turu : ({' OR '.join(kinds)})"
+    return expression
+
+
+def _words(text: str) -> list[str]:
+    return [term.rstrip("*") for term in _TERM.findall(fold_text(text))]
+
+
+def _phrase(term: str) -> str:
+    if term.endswith("*"):
+        return f'"{term[:-1]}"*'
+    return f'"{term}"'
+
+
+@dataclass
+class TextHit:
+    pdf_url: str
+    record: GazetteRecord | None
+    snippet: str
+    score: float
+    raw_text: str
+
+
+class GazetteTextIndex:
+    """SQLite FTS5 store of extracted notice text with its gazette metadata."""
+
+    def __init__(self, path: str) -> None:
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(_SCHEMA)
+
+    def add(self, pdf_url: str, raw_text: str, record: GazetteRecord | None = None) -> bool:
+        """Index a notice's text; False if it was already indexed with what is known.
+
+        A notice indexed without metadata is updated once its record turns up.
+        """
+        if not raw_text.strip():
+            return False
+        existing = self._conn.execute(
+            "SELECT id, sicil_no FROM notices WHERE pdf_url = ?", (pdf_url,)
+        ).fetchone()
+        if existing is not None and (record is None or existing["sicil_no"] is not None):
+            return False
+
+        meta = _metadata(record)
+        with self._conn:
+            if existing is not None:
+                self._conn.execute("DELETE FROM notices WHERE id = ?", (existing["id"],))
+                self._conn.execute("DELETE FROM notices_fts WHERE rowid = ?", (existing["id"],))
+            cursor = self._conn.execute(
+                "INSERT INTO notices (pdf_url, mudurluk, sicil_no, unvan, yayin_tarihi, "
+                "published_on, sayi, sayfa, ilan_turu, raw_text, indexed_at) "
+                "VALUES (:pdf_url, :mudurluk, :sicil_no, :unvan, :yayin_tarihi, "
+                ":published_on, :sayi, :sayfa, :ilan_turu, :raw_text, :indexed_at)",
+                {
+                    **meta,
+                    "pdf_url": pdf_url,
+                    "raw_text": raw_text,
+                    "indexed_at": datetime.now(UTC).isoformat(timespec="seconds"),
+                },
+            )
+            self._conn.execute(
+                "INSERT INTO notices_fts (rowid, unvan, ilan_turu, body) VALUES (?, ?, ?, ?)",
+                (
+                    cursor.lastrowid,
+                    fold_text(meta["unvan"] or ""),
+                    fold_text(meta["ilan_turu"] or ""),
+                    fold_text(raw_text),
+                ),
+            )
+        return True
+
+    def search(
+        self,
+        query: str,
+        ilan_turu: list[str] | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        limit: int = 20,
+    ) -> list[TextHit]:
+        """Best-matching notices first (bm25). A date window drops undated notices."""
+        expression = match_expression(query, ilan_turu)
+        if expression is None:
+            return []
+        sql = (
+            "SELECT n.*, bm25(notices_fts) AS score, "
+            f"highlight(notices_fts, 2, '{_OPEN}', '{_CLOSE}') AS marked "
+            "FROM notices_fts JOIN notices n ON n.id = notices_fts.rowid "
+            "WHERE notices_fts MATCH ?"
+        )
+        params: list[object] = [expression]
+        if date_from is not None:
+            sql += " AND n.published_on >= ?"
+            params.append(date_from.isoformat())
+        if date_to is not None:
+            sql += " AND n.published_on <= ?"
+            params.append(date_to.isoformat())
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+
+        return [
+            TextHit(
+                pdf_url=row["pdf_url"],
+                record=_record(row),
+                snippet=_snippet(row["raw_text"], row["marked"]),
+                score=-row["score"],
+                raw_text=row["raw_text"],
+            )
+            for row in self._conn.execute(sql, params)
+        ]
+
+    def count(self) -> int:
+        return int(self._conn.execute("SELECT COUNT(*) FROM notices").fetchone()[0])
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def _metadata(record: GazetteRecord | None) -> dict[str, str | None]:
+    fields = ("mudurluk", "sicil_no", "unvan", "yayin_tarihi", "sayi", "sayfa", "ilan_turu")
+    if record is None:
+        return dict.fromkeys((*fields, "published_on"))
+    published = parse_gazette_date(record.yayin_tarihi)
+    return {
+        **{name: getattr(record, name) for name in fields},
+        "published_on": published.date().isoformat() if published else None,
+    }
+
+
+def _record(row: sqlite3.Row) -> GazetteRecord | None:
+    if row["sicil_no"] is None:
+        return None
+    return GazetteRecord(
+        mudurluk=row["mudurluk"] or "",
+        sicil_no=row["sicil_no"],
+        unvan=row["unvan"] or "",
+        yayin_tarihi=row["yayin_tarihi"],
+        sayi=row["sayi"],
+        sayfa=row["sayfa"],
+        ilan_turu=row["ilan_turu"],
+        pdf_url=row["pdf_url"],
+    )
+
+
+def _snippet(raw_text: str, marked: str) -> str:
+    """HTML excerpt of raw_text around the first body match, matches wrapped in <em>.
+
+    `marked` is the folded body with matches between the highlight markers.
+    Matches only in the title or notice type yield the start of the text.
+    """
+    spans: list[tuple[int, int]] = []
+    for i, match in enumerate(_HIGHLIGHT.finditer(marked or "")):
+        start = match.start() - 2 * i
+        spans.append((start, start + len(match.group(1))))
+    folded_length = len(marked or "") - 2 * len(spans)
+    # The fold keeps lengths, except for rare characters lower() expands
+    text = raw_text if folded_length == len(raw_text) else _HIGHLIGHT.sub(r"\1", marked)
+
+    if not spans:
+        return html.escape(text[: 2 * _SNIPPET_CONTEXT].strip(), quote=False)
+    begin = max(0, spans[0][0] - _SNIPPET_CONTEXT)
+    end = min(len(text), spans[0][1] + _SNIPPET_CONTEXT)
+    parts: list[str] = []
+    cursor = begin
+    for start, stop in spans:
+        if start < begin or stop > end:
+            continue
+        parts.extend(
+            (
+                html.escape(text[cursor:start], quote=False),
+                "<em>",
+                html.escape(text[start:stop], quote=False),
+                "</em>",
+            )
+        )
+        cursor = stop
+    parts.append(html.escape(text[cursor:end], quote=False))
+    snippet = "".join(parts).strip()
+    return ("..." if begin > 0 else "") + snippet + ("..." if end < len(text) else "")
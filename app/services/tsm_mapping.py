@@ -7,6 +7,8 @@ numeric ID needed for the ilan goruntuleme POST form.
 
 from __future__ import annotations
 
+from app.utils.turkish import fold_turkish_case
+
 TSM_TO_ID: dict[str, str] = {
     "ACIPAYAM": "1",
     "ADANA": "2",
@@ -249,23 +251,8 @@ TSM_TO_ID: dict[str, str] = {
 }
 
 
-def _normalize_turkish(text: str) -> str:
-    """Normalize Turkish characters for case-insensitive comparison.
-
-    Handles Turkish-specific letters: İ/i and I/ı mapping.
-    Converts to uppercase and normalizes Turkish dotted/dotless I variants
-    to their ASCII equivalents for reliable lookup.
-    """
-    result = text.upper()
-    # Turkish İ (U+0130) -> I
-    result = result.replace("\u0130", "I")
-    # Turkish ı (U+0131) uppercase is I, but just in case
-    result = result.replace("\u0131", "I")
-    return result
-
-
 # Build a normalized lookup (Turkish-aware uppercase keys)
-_NORMALIZED_LOOKUP: dict[str, str] = {_normalize_turkish(k): v for k, v in TSM_TO_ID.items()}
+_NORMALIZED_LOOKUP: dict[str, str] = {fold_turkish_case(k): v for k, v in TSM_TO_ID.items()}
 
 
 def resolve_tsm_id(tsm_name: str) -> str | None:
@@ -276,4 +263,4 @@ def resolve_tsm_id(tsm_name: str) -> str | None:
     """
     if not tsm_name:
         return None
-    return _NORMALIZED_LOOKUP.get(_normalize_turkish(tsm_name.strip()))
+    return _NORMALIZED_LOOKUP.get(fold_turkish_case(tsm_name.strip()))
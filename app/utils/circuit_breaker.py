@@ -0,0 +1,116 @@
+"""Circuit breakers for TOBB, one per endpoint class.
+
+Requests are classified by URL path (captcha, login, search, ilan, pdf). After
+`failure_threshold` consecutive failures - transport errors or 5xx - a class's
+breaker opens and its requests fail immediately with UpstreamUnavailableError
+instead of walking their retry ladders. After `recovery_timeout` one probe
+request is let through (half-open); its outcome closes or re-opens the breaker.
+"""
+
+from __future__ import annotations
+
+import time
+from enum import Enum
+
+import httpx
+
+from app.core.exceptions import UpstreamUnavailableError
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+ENDPOINT_CLASSES = ("captcha", "login", "search", "ilan", "pdf", "other")
+
+
+def classify_endpoint(url: httpx.URL) -> str:
+    """Map a TOBB URL to its endpoint class."""
+    path = url.path.lower()
+    if "captcha" in path:
+        return "captcha"
+    if "uyegirisi" in path or path in ("", "/"):
+        return "login"
+    if "unvansorgulama" in path:
+        return "search"
+    if "ilangoruntuleme" in path:
+        return "ilan"
+    if "pdf_goster" in path or "tmp_gazete" in path or path.endswith(".pdf"):
+        return "pdf"
+    return "other"
+
+
+class BreakerState(str, Enum):
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a single half-open probe."""
+
+    def __init__(self, name: str, failure_threshold: int, recovery_timeout: float) -> None:
+        self.name = name
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._state = BreakerState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.rejected = 0
+
+    @property
+    def state(self) -> BreakerState:
+        if (
+            self._state is BreakerState.OPEN
+            and time.monotonic() - self._opened_at >= self._recovery_timeout
+        ):
+            self._state = BreakerState.HALF_OPEN
+        return self._state
+
+    def before_request(self) -> None:
+        """Raise UpstreamUnavailableError unless a request may go out now."""
+        state = self.state
+        if state is BreakerState.CLOSED:
+            return
+        if state is BreakerState.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            logger.info("circuit_half_open_probe", endpoint=self.name)
+            return
+        self.rejected += 1
+        retry_in = max(0.0, self._opened_at + self._recovery_timeout - time.monotonic())
+        raise UpstreamUnavailableError(
+            message="TOBB servisine su an ulasilamiyor",
+            detail=f"endpoint={self.name}, tekrar deneme {retry_in:.0f} sn sonra",
+        )
+
+    def record_success(self) -> None:
+        if self._state is not BreakerState.CLOSED:
+            logger.info("circuit_closed", endpoint=self.name)
+        self._state = BreakerState.CLOSED
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._state is BreakerState.HALF_OPEN or self._failures >= self._failure_threshold:
+            if self._state is not BreakerState.OPEN:
+                logger.warning("circuit_opened", endpoint=self.name, failures=self._failures)
+            self._state = BreakerState.OPEN
+            self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """Free the half-open slot when a probe ended without an outcome (e.g. cancelled)."""
+        self._probe_in_flight = False
+
+
+class CircuitBreakerRegistry:
+    """One breaker per endpoint class, shared by every TOBB client."""
+
+    def __init__(self, failure_threshold: int, recovery_timeout: float) -> None:
+        self.breakers = {
+            name: CircuitBreaker(name, failure_threshold, recovery_timeout)
+            for name in ENDPOINT_CLASSES
+        }
+
+    def for_url(self, url: httpx.URL) -> CircuitBreaker:
+        return self.breakers[classify_endpoint(url)]
@@ -0,0 +1,108 @@
+"""Hedged requests for idempotent upstream calls.
+
+If a call has not finished after the recent p-th percentile latency for its
+kind, a second identical call is started and whichever succeeds first wins;
+the other is cancelled. Hedges are budgeted: at most `max_ratio` of calls may
+be hedged, and only while the shared rate limiter has a spare token and no
+waiters, so hedging never delays regular traffic.
+
+Only use this for calls with no server-side side effects. TOBB captcha images
+are not such calls - every fetch re-rolls the code stored in the PHP session,
+so two racing fetches leave the session holding an unknown one of the codes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import defaultdict, deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import TypeVar
+
+from app.core.logging import get_logger
+from app.utils.rate_limit import TokenBucket
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+_MIN_SAMPLES = 20
+
+
+@dataclass
+class HedgeStats:
+    requests: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+
+
+class Hedger:
+    """Runs calls with a percentile-delayed backup request."""
+
+    def __init__(
+        self,
+        percentile: float,
+        min_delay: float,
+        max_ratio: float,
+        limiter: TokenBucket | None = None,
+        window: int = 200,
+    ) -> None:
+        self._percentile = percentile
+        self._min_delay = min_delay
+        self._max_ratio = max_ratio
+        self._limiter = limiter
+        self._latencies: defaultdict[str, deque[float]] = defaultdict(lambda: deque(maxlen=window))
+        self.stats: defaultdict[str, HedgeStats] = defaultdict(HedgeStats)
+
+    def delay_for(self, kind: str) -> float:
+        """Hedge delay: the recent latency percentile, never below min_delay."""
+        samples = self._latencies[kind]
+        if len(samples) < _MIN_SAMPLES:
+            return self._min_delay
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(len(ordered) * self._percentile / 100))
+        return max(self._min_delay, ordered[index])
+
+    async def run(self, kind: str, call: Callable[[], Awaitable[T]]) -> T:
+        stats = self.stats[kind]
+        stats.requests += 1
+        delay = self.delay_for(kind)
+        started = time.monotonic()
+        primary = asyncio.ensure_future(call())
+        hedge: asyncio.Future[T] | None = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or not self._may_hedge(stats):
+                result = await primary
+                self._latencies[kind].append(time.monotonic() - started)
+                return result
+
+            stats.hedged += 1
+            logger.info("request_hedged", kind=kind, delay=round(delay, 3))
+            hedge = asyncio.ensure_future(call())
+            pending: set[asyncio.Future[T]] = {primary, hedge}
+            first_error: BaseException | None = None
+            while pending:
+                finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in finished:
+                    error = future.exception()
+                    if error is None:
+                        if future is hedge:
+                            stats.hedge_wins += 1
+                        self._latencies[kind].append(time.monotonic() - started)
+                        return future.result()
+                    first_error = first_error or error
+            assert first_error is not None
+            raise first_error
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    def _may_hedge(self, stats: HedgeStats) -> bool:
+        if stats.hedged >= self._max_ratio * stats.requests:
+            return False
+        if self._limiter is None:
+            return True
+        return self._limiter.queue_depth == 0 and self._limiter.available >= 1
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, bursting up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._waiting = 0
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @property
+    def available(self) -> float:
+        self._refill()
+        return self._tokens
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of callers currently waiting for a token."""
+        return self._waiting
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        self._waiting += 1
+        try:
+            async with self._lock:
+                self._refill()
+                while self._tokens < 1:
+                    await asyncio.sleep((1 - self._tokens) / self._rate)
+                    self._refill()
+                self._tokens -= 1
+        finally:
+            self._waiting -= 1
+
+    def record(self, status_code: int | None, latency: float) -> None:
+        """Feedback hook for adaptive limiters; a fixed-rate bucket ignores it."""
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+
+
+class AdaptiveRateLimiter(TokenBucket):
+    """Token bucket whose rate follows AIMD feedback from upstream responses.
+
+    Every fast, clean response raises the rate by `increase_step` (up to `max_rate`).
+    A 429, a 5xx, a transport error (status None) or a response slower than
+    `latency_threshold` multiplies the rate by `decrease_factor` (down to `min_rate`).
+    Decreases are spaced by `decrease_cooldown` so one burst of concurrent failures
+    only counts once.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        min_rate: float,
+        max_rate: float,
+        increase_step: float,
+        decrease_factor: float,
+        latency_threshold: float,
+        decrease_cooldown: float = 1.0,
+    ) -> None:
+        super().__init__(rate=rate, capacity=capacity)
+        self._min_rate = min_rate
+        self._max_rate = max_rate
+        self._increase_step = increase_step
+        self._decrease_factor = decrease_factor
+        self._latency_threshold = latency_threshold
+        self._decrease_cooldown = decrease_cooldown
+        self._last_decrease_at = float("-inf")
+
+    def record(self, status_code: int | None, latency: float) -> None:
+        self._refill()
+        congested = (
+            status_code is None
+            or status_code == 429
+            or status_code >= 500
+            or latency > self._latency_threshold
+        )
+        if not congested:
+            self._rate = min(self._max_rate, self._rate + self._increase_step)
+            return
+
+        now = time.monotonic()
+        if now - self._last_decrease_at < self._decrease_cooldown:
+            return
+        self._last_decrease_at = now
+        previous = self._rate
+        self._rate = max(self._min_rate, self._rate * self._decrease_factor)
+        logger.info(
+            "rate_limit_decreased",
+            status_code=status_code,
+            latency=round(latency, 3),
+            previous_rate=round(previous, 3),
+            rate=round(self._rate, 3),
+        )
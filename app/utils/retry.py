@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import time
+
 import httpx
 from tenacity import (
     retry,
@@ -8,6 +10,80 @@ from tenacity import (
     wait_exponential,
 )
 
+from app.core.exceptions import UpstreamUnavailableError
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class RetryBudget:
+    """Process-wide cap on retries as a share of recent upstream requests.
+
+    Every outbound request deposits `ratio` tokens and tokens also trickle in at
+    `min_per_second`, so a quiet service can still retry now and then. Each retry
+    spends one token. While TOBB is failing, retries are therefore limited to
+    about `ratio` of the traffic instead of multiplying it by every nested
+    retry loop.
+    """
+
+    def __init__(self, ratio: float, min_per_second: float, max_tokens: float = 10.0) -> None:
+        self._ratio = ratio
+        self._min_per_second = min_per_second
+        self._max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._updated = time.monotonic()
+        self.requests = 0
+        self.retries = 0
+        self.denied = 0
+
+    @property
+    def available(self) -> float:
+        self._refill(0.0)
+        return self._tokens
+
+    def record_request(self) -> None:
+        self.requests += 1
+        self._refill(self._ratio)
+
+    def try_spend(self) -> bool:
+        """Take one retry token; False when the budget is exhausted."""
+        self._refill(0.0)
+        if self._tokens >= 1:
+            self._tokens -= 1
+            self.retries += 1
+            return True
+        self.denied += 1
+        return False
+
+    def spend(self, operation: str) -> None:
+        """Take one retry token or fail fast with UpstreamUnavailableError."""
+        if self.try_spend():
+            return
+        logger.warning("retry_budget_exhausted", operation=operation)
+        raise UpstreamUnavailableError(
+            message="TOBB yeniden deneme butcesi tukendi",
+            detail=f"operation={operation}",
+        )
+
+    def _refill(self, deposit: float) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(
+            self._max_tokens, self._tokens + deposit + elapsed * self._min_per_second
+        )
+
+
+def is_upstream_failure(exc: BaseException) -> bool:
+    """True if the error means TOBB itself is failing: a transport error or a 5xx.
+
+    Only these spend retry-budget tokens; a misread captcha or an empty result
+    is a normal answer and retrying it does not add load to a struggling TOBB.
+    """
+    if isinstance(exc, httpx.TransportError):
+        return True
+    return isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code >= 500
+
 
 def with_retry(max_retries: int = 3, backoff_factor: float = 0.5):
     """Exponential backoff retry decorator for HTTP operations."""
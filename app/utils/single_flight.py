@@ -0,0 +1,62 @@
+"""In-flight deduplication of identical async work.
+
+The first caller for a key starts the work in its own task; callers arriving
+while it runs await the same task and get the same result (or exception).
+The task is shielded, so one caller disconnecting does not cancel the work
+for the others; once the last caller has left, the work is cancelled too.
+Keys are forgotten as soon as the work finishes - this is not a cache.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one running task."""
+
+    def __init__(self) -> None:
+        self._tasks: dict[Hashable, asyncio.Task[Any]] = {}
+        self._waiters: dict[Hashable, int] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._tasks
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            logger.info("single_flight_joined", key=str(key))
+        self._waiters[key] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._leave(key, task)
+
+    def _leave(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        if self._tasks.get(key) is not task:
+            return  # finished and forgotten already
+        self._waiters[key] -= 1
+        if self._waiters[key] == 0:
+            logger.info("single_flight_abandoned", key=str(key))
+            task.cancel()
+
+    def _forget(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+            del self._waiters[key]
+        # Retrieve the exception so it is not reported as unhandled when every waiter left
+        if not task.cancelled():
+            task.exception()
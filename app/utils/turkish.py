@@ -0,0 +1,25 @@
+"""Turkish-aware text normalisation for comparing names typed by users with TOBB's.
+
+Python's str.upper() maps i to I and leaves İ as its own letter, so "istanbul",
+"İSTANBUL" and "ISTANBUL" would all compare different. Both dotted and dotless
+I are folded to ASCII I instead.
+"""
+
+from __future__ import annotations
+
+import unicodedata
+
+
+def fold_turkish_case(text: str) -> str:
+    """Uppercase text and fold Turkish dotted/dotless I variants to ASCII I."""
+    result = text.upper()
+    # Turkish İ (U+0130) -> I
+    result = result.replace("İ", "I")
+    # Turkish ı (U+0131) uppercase is I, but just in case
+    return result.replace("ı", "I")
+
+
+def normalize_turkish(text: str) -> str:
+    """Comparison key for free text: NFC, collapsed whitespace, Turkish case fold."""
+    text = unicodedata.normalize("NFC", text)
+    return fold_turkish_case(" ".join(text.split()))
@@ -0,0 +1,141 @@
+"""Compare the lxml parsers with the BeautifulSoup ones they replaced.
+
+Skipped unless BENCHMARK=1. Run with:
+
+    BENCHMARK=1 python -m pytest tests/benchmarks -s
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import timeit
+
+import pytest
+from bs4 import BeautifulSoup
+
+from app.config import Settings
+from app.services.gazette_client import GazetteClient
+from app.services.pdf_fetcher import PDFFetcher
+from app.services.search_client import SearchClient
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(not os.environ.get("BENCHMARK"), reason="set BENCHMARK=1 to run"),
+]
+
+_ROWS = 500
+
+
+def _ilan_table(rows: int) -> str:
+    body = "".join(
+        f"<tr><td>ISTANBUL</td><td>{100000 + i}</td><td>ORNEK {i} <b>A.S.</b></td>"
+        f"<td>{1 + i % 28:02d}/03/2024</td><td>{11000 + i}</td><td>{i}</td><td>Genel Kurul</td>"
+        f'<td><a href="pdf_goster.php?Guid={i:032x}">Gazete</a></td><td></td><td></td></tr>'
+        for i in range(rows)
+    )
+    return (
+        f"<span>Yayinlanmis Ilanlari ({rows} Adet)</span>"
+        f'<table id="tblIlanGoruntuleme"><thead><tr><th>x</th></tr></thead><tbody>{body}</tbody></table>'
+    )
+
+
+def _search_table(rows: int) -> str:
+    body = "".join(
+        f"<tr><td>{i}</td><td>ORNEK {i} TICARET A.S.</td><td>{i}</td><td>ANKARA</td></tr>"
+        for i in range(rows)
+    )
+    return (
+        '<table class="table table-bordered table-striped"><thead><tr>'
+        f'<th colspan="4">Toplam Kayit Sayisi: {rows}</th></tr></thead><tbody>{body}</tbody></table>'
+    )
+
+
+_EMBED_PAGE = (
+    "<html><head><title>Gazete</title></head><body>"
+    + '<div class="nav"><a href="/">Ana Sayfa</a></div>' * 20
+    + '<embed src="/tmp_gazete/2024/abc.pdf" type="application/pdf" width="100%"></body></html>'
+)
+
+
+def _bs4_ilan(html: str, base: str) -> list[tuple]:
+    soup = BeautifulSoup(html, "lxml")
+    table = soup.select_one("#tblIlanGoruntuleme")
+    soup.find("span", string=re.compile(r"Adet\)", re.IGNORECASE))
+    out = []
+    for row in table.select("tbody tr"):
+        cells = row.find_all("td")
+        if len(cells) < 8:
+            continue
+        link = cells[7].select_one('a[href*="pdf_goster"]')
+        href = link.get("href", "") if link else ""
+        out.append(
+            (*(cells[i].get_text(strip=True) for i in range(7)), f"{base}/view/hizlierisim/{href}")
+        )
+    return out
+
+
+def _bs4_search(html: str) -> list[tuple]:
+    soup = BeautifulSoup(html, "lxml")
+    table = soup.select_one("table.table.table-bordered.table-striped")
+    table.select_one("thead th[colspan]").get_text()
+    return [
+        tuple(cells[i].get_text(strip=True) for i in (1, 2, 3))
+        for cells in (row.find_all("td") for row in table.select("tbody tr"))
+        if len(cells) >= 4
+    ]
+
+
+def _bs4_embed(html: str) -> str | None:
+    embed = BeautifulSoup(html, "lxml").select_one("embed[src]")
+    return embed.get("src") if embed else None
+
+
+def _report(name: str, old: float, new: float) -> None:
+    print(f"\n{name}: bs4 {old * 1000:.2f} ms, lxml {new * 1000:.2f} ms, x{old / new:.1f}")
+
+
+def _best_of(fn, number: int = 5) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def test_ilan_table():
+    settings = Settings()
+    client = GazetteClient(client=None, settings=settings)
+    html = _ilan_table(_ROWS)
+
+    new_records = client._parse_results(html)
+    old_rows = _bs4_ilan(html, settings.TOBB_BASE_URL)
+    assert [
+        (r.mudurluk, r.sicil_no, r.unvan, r.yayin_tarihi, r.sayi, r.sayfa, r.ilan_turu, r.pdf_url)
+        for r in new_records
+    ] == old_rows
+
+    old = _best_of(lambda: _bs4_ilan(html, settings.TOBB_BASE_URL))
+    new = _best_of(lambda: client._parse_results(html))
+    _report(f"ilan table ({_ROWS} rows)", old, new)
+    assert new < old
+
+
+def test_search_table():
+    html = _search_table(_ROWS)
+
+    records, _ = SearchClient._parse_results(html)
+    assert [(r.title, r.registry_no, r.tsm) for r in records] == _bs4_search(html)
+
+    old = _best_of(lambda: _bs4_search(html))
+    new = _best_of(lambda: SearchClient._parse_results(html))
+    _report(f"search table ({_ROWS} rows)", old, new)
+    assert new < old
+
+
+def test_pdf_embed_page():
+    base = "https://www.ticaretsicil.gov.tr/view/hizlierisim/pdf_goster.php"
+    assert PDFFetcher._extract_pdf_url_from_html(_EMBED_PAGE, base).endswith(
+        _bs4_embed(_EMBED_PAGE)
+    )
+
+    old = _best_of(lambda: _bs4_embed(_EMBED_PAGE), number=50)
+    new = _best_of(lambda: PDFFetcher._extract_pdf_url_from_html(_EMBED_PAGE, base), number=50)
+    _report("pdf embed page", old, new)
+    assert new < old
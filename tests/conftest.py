@@ -1,11 +1,20 @@
 from __future__ import annotations
 
+import os
+
 import pytest
 from fastapi.testclient import TestClient
 
 from app.config import Settings
 from app.main import create_app
 
+# Keep app startup in tests from opening connections to TOBB
+os.environ.setdefault("HTTP_PREWARM", "false")
+# ...or from reusing indexes and requeuing jobs left behind by an earlier run
+os.environ.setdefault("PAGE_INDEX_DB_PATH", ":memory:")
+os.environ.setdefault("TEXT_INDEX_DB_PATH", ":memory:")
+os.environ.setdefault("JOB_DB_PATH", ":memory:")
+
 
 @pytest.fixture
 def settings() -> Settings:
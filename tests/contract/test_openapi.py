@@ -37,3 +37,26 @@ class TestOpenAPISchema:
         paths = resp.json()["paths"]
         assert "/api/v1/extract" in paths
         assert "post" in paths["/api/v1/extract"]
+
+    def test_batch_endpoints_in_schema(self):
+        resp = self.client.get("/openapi.json")
+        paths = resp.json()["paths"]
+        assert "post" in paths["/api/v1/search/batch"]
+        assert "post" in paths["/api/v1/extract/batch"]
+
+    def test_notice_search_in_schema(self):
+        resp = self.client.get("/openapi.json")
+        paths = resp.json()["paths"]
+        assert "post" in paths["/api/v1/notices/search"]
+
+    def test_stats_endpoint_in_schema(self):
+        resp = self.client.get("/openapi.json")
+        paths = resp.json()["paths"]
+        assert "/api/v1/stats" in paths
+        assert "get" in paths["/api/v1/stats"]
+
+    def test_job_endpoints_in_schema(self):
+        resp = self.client.get("/openapi.json")
+        paths = resp.json()["paths"]
+        assert "post" in paths["/api/v1/jobs/extract"]
+        assert "get" in paths["/api/v1/jobs/{job_id}"]
@@ -22,6 +22,14 @@ class TestPayloadValidation:
         resp = self.client.post("/api/v1/search", json={"trade_name": "A"})
         assert resp.status_code == 422
 
+    def test_batch_search_empty_list(self):
+        resp = self.client.post("/api/v1/search/batch", json={"trade_names": []})
+        assert resp.status_code == 422
+
+    def test_batch_search_name_too_short(self):
+        resp = self.client.post("/api/v1/search/batch", json={"trade_names": ["ACME", "A"]})
+        assert resp.status_code == 422
+
     def test_extract_missing_pdf_url(self):
         resp = self.client.post("/api/v1/extract", json={})
         assert resp.status_code == 422
@@ -30,6 +38,52 @@ class TestPayloadValidation:
         resp = self.client.post("/api/v1/extract", json={"pdf_url": "short"})
         assert resp.status_code == 422
 
+    def test_batch_extract_empty_list(self):
+        resp = self.client.post("/api/v1/extract/batch", json={"pdf_urls": []})
+        assert resp.status_code == 422
+
+    def test_job_callback_must_be_http(self):
+        resp = self.client.post(
+            "/api/v1/jobs/extract",
+            json={"pdf_url": "https://example.com/x.pdf", "callback_url": "file:///etc/passwd"},
+        )
+        assert resp.status_code == 422
+
+    def test_job_callback_rejects_internal_address(self):
+        resp = self.client.post(
+            "/api/v1/jobs/extract",
+            json={
+                "pdf_url": "https://example.com/x.pdf",
+                "callback_url": "http://169.254.169.254/",
+            },
+        )
+        assert resp.status_code == 400
+        assert resp.json()["error_code"] == "INVALID_REQUEST"
+
+    def test_notice_search_rejects_oversized_limit(self):
+        resp = self.client.post("/api/v1/notices/search", json={"query": "sermaye", "limit": 500})
+        assert resp.status_code == 422
+
+    def test_registry_lookup_requires_office(self):
+        resp = self.client.post("/api/v1/registry/lookup", json={"registry_no": "123456"})
+        assert resp.status_code == 422
+
+    def test_registry_lookup_rejects_inverted_window(self):
+        resp = self.client.post(
+            "/api/v1/registry/lookup",
+            json={
+                "sicil_mudurlugu_id": "18",
+                "registry_no": "123456",
+                "date_from": "2024-06-01",
+                "date_to": "2024-01-01",
+            },
+        )
+        assert resp.status_code == 422
+
+    def test_job_unknown_id_returns_404(self):
+        resp = self.client.get("/api/v1/jobs/does-not-exist")
+        assert resp.status_code == 404
+
     def test_health_response_shape(self):
         resp = self.client.get("/api/v1/health")
         assert resp.status_code == 200
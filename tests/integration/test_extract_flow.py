@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 from unittest.mock import patch
 
 import pytest
@@ -7,7 +8,7 @@ from fastapi.testclient import TestClient
 
 from app.core.exceptions import AuthError
 from app.main import create_app
-from app.schemas.responses import ExtractResult
+from app.schemas.responses import ExtractResult, GazetteRecord
 
 
 @pytest.mark.integration
@@ -65,3 +66,82 @@ class TestExtractFlow:
             assert resp.status_code == 401
             data = resp.json()
             assert data["error_code"] == "AUTH_FAILED"
+
+    def test_streamed_batch_reports_login_failure_per_url(self):
+        urls = ["https://example.com/a.pdf", "https://example.com/b.pdf"]
+        with patch(
+            "app.services.auth_client.AuthClient.ensure_authenticated_with_retry",
+            side_effect=AuthError(message="TOBB login basarisiz"),
+        ):
+            resp = self.client.post(
+                "/api/v1/extract/batch", json={"pdf_urls": urls, "stream": True}
+            )
+
+        assert resp.status_code == 200
+        lines = [json.loads(line) for line in resp.text.splitlines()]
+        assert [line["source_pdf_url"] for line in lines] == urls
+        assert all(line["error"] == "TOBB login basarisiz" for line in lines)
+
+    def test_batch_login_failure_without_stream_is_401(self):
+        with patch(
+            "app.services.auth_client.AuthClient.ensure_authenticated_with_retry",
+            side_effect=AuthError(message="TOBB login basarisiz"),
+        ):
+            resp = self.client.post(
+                "/api/v1/extract/batch", json={"pdf_urls": ["https://example.com/a.pdf"]}
+            )
+
+        assert resp.status_code == 401
+        assert resp.json()["error_code"] == "AUTH_FAILED"
+
+    def test_batch_skips_urls_outside_filters(self):
+        pdf = "https://www.ticaretsicil.gov.tr/view/hizlierisim/pdf_goster.php?Guid="
+        self.app.state.gazette_cache.put(
+            "18",
+            "123",
+            [
+                GazetteRecord(
+                    mudurluk="ANKARA",
+                    sicil_no="123",
+                    unvan="ACME A.S.",
+                    yayin_tarihi="01/02/2024",
+                    ilan_turu="Sermaye Artırımı",
+                    pdf_url=f"{pdf}a",
+                ),
+                GazetteRecord(
+                    mudurluk="ANKARA",
+                    sicil_no="123",
+                    unvan="ACME A.S.",
+                    yayin_tarihi="01/03/2024",
+                    ilan_turu="Adres Değişikliği",
+                    pdf_url=f"{pdf}b",
+                ),
+                GazetteRecord(
+                    mudurluk="ANKARA",
+                    sicil_no="123",
+                    unvan="ACME A.S.",
+                    yayin_tarihi="01/03/2019",
+                    ilan_turu="Sermaye Artırımı",
+                    pdf_url=f"{pdf}c",
+                ),
+            ],
+        )
+
+        async def extract_many(self, pdf_urls, download_concurrency):
+            for url in pdf_urls:
+                yield ExtractResult(source_pdf_url=url, raw_text="text")
+
+        with patch("app.services.extractor.Extractor.extract_many", extract_many):
+            resp = self.client.post(
+                "/api/v1/extract/batch",
+                json={
+                    "pdf_urls": [f"{pdf}a", f"{pdf}b", f"{pdf}c", f"{pdf}unknown"],
+                    "ilan_turu": ["sermaye"],
+                    "date_from": "2024-01-01",
+                },
+            )
+
+        assert resp.status_code == 200
+        data = resp.json()
+        assert [r["source_pdf_url"] for r in data["results"]] == [f"{pdf}a", f"{pdf}unknown"]
+        assert data["skipped"] == [f"{pdf}b", f"{pdf}c"]
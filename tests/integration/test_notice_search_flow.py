@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_text_index
+from app.main import create_app
+from app.schemas.responses import GazetteRecord
+
+_PDF = "https://www.ticaretsicil.gov.tr/view/hizlierisim/pdf_goster.php?Guid="
+
+
+@pytest.mark.integration
+class TestNoticeSearch:
+    def setup_method(self):
+        self.app = create_app()
+        self.ctx = TestClient(self.app)
+        self.client = self.ctx.__enter__()
+
+    def teardown_method(self):
+        self.ctx.__exit__(None, None, None)
+
+    def test_extracted_notice_is_searchable_with_its_record(self):
+        record = GazetteRecord(
+            mudurluk="ANKARA",
+            sicil_no="123456",
+            unvan="ACME A.S.",
+            yayin_tarihi="15/06/2024",
+            ilan_turu="Sermaye Artırımı",
+            pdf_url=f"{_PDF}abc",
+        )
+        with (
+            patch("app.services.gazette_client.GazetteClient.search", return_value=[record]),
+            patch("app.services.auth_client.AuthClient.ensure_authenticated", new=AsyncMock()),
+            patch("app.services.auth_client.AuthClient.ensure_session_valid", new=AsyncMock()),
+            patch("app.services.auth_client.AuthClient.logout", new=AsyncMock()),
+            patch("app.services.pdf_fetcher.PDFFetcher.fetch", return_value=b"%PDF-1.4"),
+            patch(
+                "app.services.ocr_pipeline.OCRPipeline.extract_text",
+                return_value="Şirketin sermayesi ARTIRILMIŞTIR.",
+            ),
+        ):
+            lookup = self.client.post(
+                "/api/v1/registry/lookup", json={"tsm": "ANKARA", "registry_no": "123456"}
+            )
+            extract = self.client.post("/api/v1/extract", json={"pdf_url": f"{_PDF}abc"})
+
+        assert lookup.status_code == 200
+        assert extract.json()["raw_text"] == "Şirketin sermayesi ARTIRILMIŞTIR."
+
+        resp = self.client.post(
+            "/api/v1/notices/search",
+            json={"query": "artirilmistir", "ilan_turu": ["sermaye"], "include_text": True},
+        )
+
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["total_results"] == 1
+        hit = data["results"][0]
+        assert hit["source_pdf_url"] == f"{_PDF}abc"
+        assert hit["record"]["unvan"] == "ACME A.S."
+        assert "<em>ARTIRILMIŞTIR</em>" in hit["snippet"]
+        assert hit["raw_text"] == "Şirketin sermayesi ARTIRILMIŞTIR."
+
+    def test_no_match_returns_empty(self):
+        resp = self.client.post("/api/v1/notices/search", json={"query": "bulunmayan"})
+
+        assert resp.status_code == 200
+        assert resp.json() == {"query": "bulunmayan", "total_results": 0, "results": []}
+
+    def test_disabled_index_returns_503(self):
+        self.app.dependency_overrides[get_text_index] = lambda: None
+
+        resp = self.client.post("/api/v1/notices/search", json={"query": "sermaye"})
+
+        assert resp.status_code == 503
+        assert resp.json()["error_code"] == "FEATURE_DISABLED"
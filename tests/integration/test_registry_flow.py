@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+from app.schemas.responses import GazetteRecord
+
+_PDF = "https://www.ticaretsicil.gov.tr/view/hizlierisim/pdf_goster.php?Guid="
+
+
+def _record(date: str, kind: str, guid: str) -> GazetteRecord:
+    return GazetteRecord(
+        mudurluk="ANKARA",
+        sicil_no="123456",
+        unvan="ACME A.S.",
+        yayin_tarihi=date,
+        ilan_turu=kind,
+        pdf_url=_PDF + guid,
+    )
+
+
+@pytest.mark.integration
+class TestRegistryLookup:
+    def setup_method(self):
+        self.app = create_app()
+        self.ctx = TestClient(self.app)
+        self.client = self.ctx.__enter__()
+
+    def teardown_method(self):
+        self.ctx.__exit__(None, None, None)
+
+    def test_lookup_by_city_skips_trade_name_search(self):
+        records = [
+            _record("01/02/2020", "Kuruluş", "a"),
+            _record("15/06/2024", "Sermaye Artırımı", "b"),
+            _record("20/03/2023", "Genel Kurul", "c"),
+        ]
+        with (
+            patch("app.services.search_client.SearchClient.search") as trade_name_search,
+            patch(
+                "app.services.auth_client.AuthClient.ensure_authenticated", new_callable=AsyncMock
+            ),
+            patch(
+                "app.services.gazette_client.GazetteClient.search", return_value=records
+            ) as gazette_search,
+        ):
+            resp = self.client.post(
+                "/api/v1/registry/lookup", json={"tsm": "ankara", "registry_no": "123456"}
+            )
+
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["sicil_mudurlugu_id"] == "18"
+        assert [r["pdf_url"][-1] for r in data["records"]] == ["b", "c", "a"]
+        trade_name_search.assert_not_called()
+        assert gazette_search.call_args.kwargs["tic_sic_no"] == "123456"
+
+    def test_date_window_is_sent_to_tobb_and_types_filtered(self):
+        records = [
+            _record("15/06/2024", "Sermaye Artırımı", "b"),
+            _record("20/03/2024", "Genel Kurul", "c"),
+        ]
+        with (
+            patch(
+                "app.services.auth_client.AuthClient.ensure_authenticated", new_callable=AsyncMock
+            ),
+            patch(
+                "app.services.gazette_client.GazetteClient.search", return_value=records
+            ) as gazette_search,
+        ):
+            resp = self.client.post(
+                "/api/v1/registry/lookup",
+                json={
+                    "sicil_mudurlugu_id": "18",
+                    "registry_no": "123456",
+                    "date_from": "2024-01-01",
+                    "date_to": "2024-12-31",
+                    "ilan_turu": ["SERMAYE"],
+                },
+            )
+
+        assert resp.status_code == 200
+        assert [r["ilan_turu"] for r in resp.json()["records"]] == ["Sermaye Artırımı"]
+        kwargs = gazette_search.call_args.kwargs
+        assert (kwargs["date_from"], kwargs["date_to"]) == ("01.01.2024", "31.12.2024")
+
+    def test_unknown_city_returns_404(self):
+        resp = self.client.post(
+            "/api/v1/registry/lookup", json={"tsm": "ATLANTIS", "registry_no": "1"}
+        )
+
+        assert resp.status_code == 404
+        assert resp.json()["error_code"] == "NOT_FOUND"
@@ -1,13 +1,20 @@
 from __future__ import annotations
 
+import asyncio
+import json
 from unittest.mock import AsyncMock, patch
 
+import httpx
 import pytest
 from fastapi.testclient import TestClient
 
-from app.core.exceptions import NotFoundError
+from app.api.deps import get_settings
+from app.api.v1.search import _search_with_retry
+from app.config import Settings
+from app.core.exceptions import NotFoundError, UpstreamUnavailableError
 from app.main import create_app
-from app.schemas.responses import GazetteRecord, SearchRecord
+from app.schemas.responses import ExtractResult, GazetteRecord, SearchRecord
+from app.utils.retry import RetryBudget
 
 
 @pytest.mark.integration
@@ -73,6 +80,111 @@ class TestSearchFlow:
             assert "Guid=new" in data["results"][0]["pdf_urls"][0]
             assert "Guid=old" in data["results"][0]["pdf_urls"][1]
 
+    def test_search_filters_pushed_down_and_applied(self):
+        pdf = "https://www.ticaretsicil.gov.tr/view/hizlierisim/pdf_goster.php?Guid="
+        gazette_records = [
+            GazetteRecord(
+                mudurluk="ANKARA",
+                sicil_no="1",
+                unvan="ACME A.S.",
+                yayin_tarihi="10/03/2024",
+                ilan_turu="Sermaye Artırımı",
+                pdf_url=f"{pdf}a",
+            ),
+            GazetteRecord(
+                mudurluk="ANKARA",
+                sicil_no="1",
+                unvan="ACME A.S.",
+                yayin_tarihi="12/03/2024",
+                ilan_turu="Adres Değişikliği",
+                pdf_url=f"{pdf}b",
+            ),
+            GazetteRecord(
+                mudurluk="ANKARA",
+                sicil_no="1",
+                unvan="ACME A.S.",
+                yayin_tarihi="20/05/2024",
+                ilan_turu="Sermaye Artırımı",
+                pdf_url=f"{pdf}c",
+            ),
+        ]
+
+        with (
+            patch(
+                "app.services.search_client.SearchClient.search",
+                return_value=([SearchRecord(title="ACME A.S.", registry_no="1", tsm="ANKARA")], 1),
+            ),
+            patch(
+                "app.services.auth_client.AuthClient.ensure_authenticated", new_callable=AsyncMock
+            ),
+            patch(
+                "app.services.gazette_client.GazetteClient.search", return_value=gazette_records
+            ) as gazette_search,
+        ):
+            resp = self.client.post(
+                "/api/v1/search",
+                json={
+                    "trade_name": "ACME",
+                    "ilan_turu": ["SERMAYE"],
+                    "date_from": "2024-03-01",
+                    "date_to": "2024-04-30",
+                },
+            )
+
+        assert resp.status_code == 200
+        assert resp.json()["results"][0]["pdf_urls"] == [f"{pdf}a"]
+        kwargs = gazette_search.call_args.kwargs
+        assert (kwargs["date_from"], kwargs["date_to"]) == ("01.03.2024", "30.04.2024")
+
+    def test_search_rejects_inverted_window(self):
+        resp = self.client.post(
+            "/api/v1/search",
+            json={"trade_name": "ACME", "date_from": "2024-05-01", "date_to": "2024-04-01"},
+        )
+        assert resp.status_code == 422
+
+    def test_slow_enrichment_returns_empty_pdf_urls(self):
+        mock_search_results = (
+            [
+                SearchRecord(title="SLOW A.S.", registry_no="1", tsm="ISTANBUL"),
+                SearchRecord(title="FAST A.S.", registry_no="2", tsm="ISTANBUL"),
+            ],
+            2,
+        )
+
+        async def gazette_search(sicil_mudurlugu_id, tic_sic_no="", ticaret_unvani=""):
+            if tic_sic_no == "1":
+                await asyncio.sleep(5)
+            return [
+                GazetteRecord(
+                    mudurluk="ISTANBUL",
+                    sicil_no=tic_sic_no,
+                    unvan="X",
+                    pdf_url=f"https://example.com/pdf_goster.php?Guid={tic_sic_no}",
+                )
+            ]
+
+        self.app.dependency_overrides[get_settings] = lambda: Settings(SEARCH_ENRICH_TIMEOUT=0.2)
+        with (
+            patch(
+                "app.services.search_client.SearchClient.search", return_value=mock_search_results
+            ),
+            patch(
+                "app.services.auth_client.AuthClient.ensure_authenticated", new_callable=AsyncMock
+            ),
+            patch(
+                "app.services.gazette_client.GazetteClient.search",
+                side_effect=gazette_search,
+            ),
+        ):
+            resp = self.client.post("/api/v1/search", json={"trade_name": "ACME"})
+        self.app.dependency_overrides.clear()
+
+        assert resp.status_code == 200
+        results = {r["registry_no"]: r for r in resp.json()["results"]}
+        assert results["1"]["pdf_urls"] == []
+        assert results["2"]["pdf_urls"] == ["https://example.com/pdf_goster.php?Guid=2"]
+
     def test_search_not_found(self):
         with patch("app.services.search_client.SearchClient.search") as mock_search:
             mock_search.side_effect = NotFoundError(message="bulunamadi")
@@ -81,3 +193,211 @@ class TestSearchFlow:
             assert resp.status_code == 404
             data = resp.json()
             assert data["error_code"] == "NOT_FOUND"
+
+    def test_search_transport_failure_is_upstream_unavailable(self):
+        with (
+            patch(
+                "app.services.search_client.SearchClient.search",
+                side_effect=httpx.ConnectError("baglanti kurulamadi"),
+            ),
+            patch("app.api.v1.search._RETRY_DELAY", 0),
+        ):
+            resp = self.client.post("/api/v1/search", json={"trade_name": "ACME"})
+
+        assert resp.status_code == 503
+        assert resp.json()["error_code"] == "UPSTREAM_UNAVAILABLE"
+
+    def test_repeated_miss_served_from_negative_cache(self):
+        with (
+            patch(
+                "app.services.search_client.SearchClient.search", return_value=([], 0)
+            ) as mock_search,
+            patch("app.api.v1.search._RETRY_DELAY", 0),
+        ):
+            first = self.client.post("/api/v1/search", json={"trade_name": "YOKBOYLEFIRMA"})
+            calls = mock_search.call_count
+            second = self.client.post("/api/v1/search", json={"trade_name": "yokboylefirma"})
+            assert mock_search.call_count == calls
+
+            self.client.delete("/api/v1/search/cache", params={"trade_name": "YOKBOYLEFIRMA"})
+            self.client.post("/api/v1/search", json={"trade_name": "YOKBOYLEFIRMA"})
+            assert mock_search.call_count == calls * 2
+
+        assert first.json()["total_results"] == 0
+        assert second.json()["total_results"] == 0
+
+    def test_batch_search_dedupes_and_streams_per_name(self):
+        async def company_search(trade_name):
+            if "YOK" in trade_name:
+                return [], 0
+            return [SearchRecord(title=f"{trade_name} A.S.", registry_no="1", tsm="ANKARA")], 1
+
+        with (
+            patch(
+                "app.services.search_client.SearchClient.search", side_effect=company_search
+            ) as mock_search,
+            patch(
+                "app.services.auth_client.AuthClient.ensure_authenticated", new_callable=AsyncMock
+            ),
+            patch("app.services.gazette_client.GazetteClient.search", return_value=[]),
+            patch("app.api.v1.search._RETRY_DELAY", 0),
+        ):
+            resp = self.client.post(
+                "/api/v1/search/batch",
+                json={"trade_names": ["ACME", "acme", "YOKFIRMA"]},
+            )
+
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+        items = {item["query"]: item for item in map(json.loads, resp.text.splitlines())}
+        assert set(items) == {"ACME", "acme", "YOKFIRMA"}
+        assert items["ACME"]["result"]["total_results"] == 1
+        assert items["acme"]["result"]["results"] == items["ACME"]["result"]["results"]
+        assert items["YOKFIRMA"]["result"]["total_results"] == 0
+        # "ACME" and "acme" share one search; the miss walks the retry ladder
+        searched = [call.args[0] for call in mock_search.call_args_list]
+        assert searched.count("ACME") == 1
+
+    def test_latest_notice_streams_match_extract_and_search(self):
+        pdf = "https://www.ticaretsicil.gov.tr/view/hizlierisim/pdf_goster.php?Guid="
+
+        async def gazette_search(sicil_mudurlugu_id, tic_sic_no, **kwargs):
+            dates = {"1": ["01/01/2020", "15/06/2024"], "2": ["03/03/2023"]}[tic_sic_no]
+            return [
+                GazetteRecord(
+                    mudurluk="ANKARA",
+                    sicil_no=tic_sic_no,
+                    unvan="ACME",
+                    yayin_tarihi=date,
+                    pdf_url=f"{pdf}{tic_sic_no}-{date[-4:]}",
+                )
+                for date in dates
+            ]
+
+        async def extract(pdf_url):
+            return ExtractResult(source_pdf_url=pdf_url, raw_text="SERMAYE ARTIRIMI")
+
+        with (
+            patch(
+                "app.services.search_client.SearchClient.search",
+                return_value=(
+                    [
+                        SearchRecord(title="ACME A.S.", registry_no="1", tsm="ANKARA"),
+                        SearchRecord(title="ACME LTD.", registry_no="2", tsm="ANKARA"),
+                    ],
+                    2,
+                ),
+            ),
+            patch(
+                "app.services.auth_client.AuthClient.ensure_authenticated", new_callable=AsyncMock
+            ),
+            patch("app.services.auth_client.AuthClient.logout", new_callable=AsyncMock) as logout,
+            patch("app.services.gazette_client.GazetteClient.search", side_effect=gazette_search),
+            patch(
+                "app.services.extractor.Extractor.extract_from_url", side_effect=extract
+            ) as extract_mock,
+        ):
+            resp = self.client.post("/api/v1/search/latest", json={"trade_name": "ACME"})
+
+        assert resp.status_code == 200
+        events = [json.loads(line) for line in resp.text.splitlines()]
+        assert events[0]["stage"] == "MATCH"
+        assert events[0]["record"]["pdf_urls"][0] == f"{pdf}1-2024"
+        assert {e["stage"] for e in events[1:]} == {"EXTRACT", "SEARCH"}
+        by_stage = {e["stage"]: e for e in events}
+        assert by_stage["EXTRACT"]["extract"]["source_pdf_url"] == f"{pdf}1-2024"
+        assert by_stage["EXTRACT"]["extract"]["raw_text"] == "SERMAYE ARTIRIMI"
+        assert by_stage["SEARCH"]["search"]["results"][1]["pdf_urls"] == [f"{pdf}2-2023"]
+        extract_mock.assert_called_once_with(f"{pdf}1-2024")
+        logout.assert_not_called()
+
+    def test_latest_notice_not_found(self):
+        with (
+            patch("app.services.search_client.SearchClient.search", return_value=([], 0)),
+            patch("app.api.v1.search._RETRY_DELAY", 0),
+        ):
+            resp = self.client.post("/api/v1/search/latest", json={"trade_name": "YOKFIRMA"})
+
+        events = [json.loads(line) for line in resp.text.splitlines()]
+        assert events == [
+            {
+                "stage": "ERROR",
+                "error_code": "NOT_FOUND",
+                "error": "'YOKFIRMA' icin sonuc bulunamadi",
+            }
+        ]
+
+    def test_latest_error_for_top_hit_without_notice_ends_stream(self):
+        with (
+            patch(
+                "app.services.search_client.SearchClient.search",
+                return_value=([SearchRecord(title="ACME A.S.", registry_no="1", tsm="ANKARA")], 1),
+            ),
+            patch(
+                "app.services.auth_client.AuthClient.ensure_authenticated", new_callable=AsyncMock
+            ),
+            patch("app.services.gazette_client.GazetteClient.search", return_value=[]),
+        ):
+            resp = self.client.post("/api/v1/search/latest", json={"trade_name": "ACME"})
+
+        events = [json.loads(line) for line in resp.text.splitlines()]
+        assert [e["stage"] for e in events] == ["MATCH", "ERROR"]
+        assert events[-1]["error_code"] == "NOT_FOUND"
+
+    def test_latest_transport_failure_is_error_line(self):
+        with (
+            patch(
+                "app.services.search_client.SearchClient.search",
+                side_effect=httpx.ConnectError("baglanti kurulamadi"),
+            ),
+            patch("app.api.v1.search._RETRY_DELAY", 0),
+        ):
+            resp = self.client.post("/api/v1/search/latest", json={"trade_name": "ACME"})
+
+        assert resp.status_code == 200
+        events = [json.loads(line) for line in resp.text.splitlines()]
+        assert [(e["stage"], e["error_code"]) for e in events] == [
+            ("ERROR", "UPSTREAM_UNAVAILABLE")
+        ]
+
+    def test_latest_raw_httpx_error_is_error_line(self):
+        with patch(
+            "app.api.v1.search._pooled_search", side_effect=httpx.ReadTimeout("zaman asimi")
+        ):
+            resp = self.client.post("/api/v1/search/latest", json={"trade_name": "ACME"})
+
+        events = [json.loads(line) for line in resp.text.splitlines()]
+        assert [(e["stage"], e["error_code"]) for e in events] == [
+            ("ERROR", "UPSTREAM_UNAVAILABLE")
+        ]
+
+
+@pytest.mark.integration
+class TestSearchRetryBudget:
+    @pytest.mark.asyncio
+    async def test_empty_results_retry_without_spending(self):
+        client = AsyncMock()
+        client.search.return_value = ([], 0)
+        budget = RetryBudget(ratio=0, min_per_second=0, max_tokens=0)
+
+        with patch("app.api.v1.search._RETRY_DELAY", 0):
+            assert await _search_with_retry(client, "ILKER", budget) == ([], 0)
+
+        assert client.search.await_count == 4
+        assert budget.retries == budget.denied == 0
+
+    @pytest.mark.asyncio
+    async def test_server_error_spends_budget_and_raises(self):
+        request = httpx.Request("POST", "https://tobb.test/search")
+        error = httpx.HTTPStatusError(
+            "503", request=request, response=httpx.Response(503, request=request)
+        )
+        client = AsyncMock()
+        client.search.side_effect = error
+        budget = RetryBudget(ratio=0, min_per_second=0, max_tokens=1)
+
+        with patch("app.api.v1.search._RETRY_DELAY", 0), pytest.raises(UpstreamUnavailableError):
+            await _search_with_retry(client, "ACME", budget)
+
+        assert client.search.await_count == 2
+        assert budget.retries == 1
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import pytest
+
+from app.clients.account_pool import AccountPool
+from app.config import Settings, TOBBCredentials
+from app.core.exceptions import AuthError
+
+
+@pytest.fixture
+def pool():
+    settings = Settings(
+        TOBB_ACCOUNTS=[
+            TOBBCredentials(email="a@test.com", password="pa"),
+            TOBBCredentials(email="b@test.com", password="pb"),
+        ],
+        ACCOUNT_QUARANTINE_AFTER_FAILURES=2,
+        ACCOUNT_QUARANTINE_SECONDS=60,
+    )
+    return AccountPool.from_settings(settings)
+
+
+class TestSettingsCredentials:
+    def test_falls_back_to_single_login(self):
+        settings = Settings(TOBB_LOGIN_EMAIL="x@test.com", TOBB_LOGIN_PASSWORD="px")
+        creds = settings.credentials()
+        assert len(creds) == 1
+        assert creds[0].email == "x@test.com"
+        assert creds[0].password.get_secret_value() == "px"
+
+
+class TestAccountPool:
+    @pytest.mark.asyncio
+    async def test_leases_least_loaded_account(self, pool):
+        async with pool.acquire() as first:
+            async with pool.acquire() as second:
+                assert first is not second
+                assert first.in_flight == 1
+                assert second.in_flight == 1
+        assert all(a.in_flight == 0 for a in pool.accounts)
+
+    @pytest.mark.asyncio
+    async def test_quarantines_after_repeated_auth_failures(self, pool):
+        bad = pool.accounts[0]
+        bad.record_auth_failure()
+        assert not bad.is_quarantined
+        bad.record_auth_failure()
+        assert bad.is_quarantined
+
+        for _ in range(3):
+            async with pool.acquire() as account:
+                assert account is not bad
+
+    @pytest.mark.asyncio
+    async def test_success_resets_failure_count(self, pool):
+        account = pool.accounts[0]
+        account.record_auth_failure()
+        account.record_auth_success()
+        account.record_auth_failure()
+        assert not account.is_quarantined
+
+    @pytest.mark.asyncio
+    async def test_all_quarantined_raises(self, pool):
+        for account in pool.accounts:
+            account.record_auth_failure()
+            account.record_auth_failure()
+        with pytest.raises(AuthError):
+            async with pool.acquire():
+                pass
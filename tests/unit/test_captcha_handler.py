@@ -2,11 +2,13 @@ from __future__ import annotations
 
 from unittest.mock import AsyncMock, patch
 
+import httpx
 import pytest
 
 from app.config import Settings
-from app.core.exceptions import CaptchaError
+from app.core.exceptions import CaptchaError, UpstreamUnavailableError
 from app.services.captcha_handler import CaptchaHandler
+from app.utils.retry import RetryBudget
 
 
 @pytest.fixture
@@ -70,3 +72,34 @@ class TestCaptchaHandler:
                 result = await handler.solve(context="search")
 
         assert result == "A1B2"
+
+    @pytest.mark.asyncio
+    async def test_solve_fails_fast_when_upstream_unavailable(self, handler, mock_client):
+        mock_client.get.side_effect = UpstreamUnavailableError("TOBB servisine su an ulasilamiyor")
+
+        with pytest.raises(UpstreamUnavailableError):
+            await handler.solve(context="search")
+        assert mock_client.get.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_misreads_do_not_spend_retry_budget(self, handler, mock_client):
+        mock_response = AsyncMock()
+        mock_response.content = b"fake-image-bytes"
+        mock_response.raise_for_status = lambda: None
+        mock_client.get.return_value = mock_response
+        handler._retry_budget = RetryBudget(ratio=0, min_per_second=0, max_tokens=0)
+
+        with patch("app.services.captcha_handler.preprocess_captcha") as mock_pp:
+            mock_pp.side_effect = Exception("bad image")
+            with pytest.raises(CaptchaError):
+                await handler.solve(context="search")
+        assert mock_client.get.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_upstream_errors_spend_retry_budget(self, handler, mock_client):
+        mock_client.get.side_effect = httpx.ConnectError("baglanti kurulamadi")
+        handler._retry_budget = RetryBudget(ratio=0, min_per_second=0, max_tokens=1)
+
+        with pytest.raises(UpstreamUnavailableError):
+            await handler.solve(context="search")
+        assert mock_client.get.await_count == 2
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from app.clients.http_client import CircuitBreakerTransport
+from app.core.exceptions import UpstreamUnavailableError
+from app.utils.circuit_breaker import (
+    BreakerState,
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    classify_endpoint,
+)
+from app.utils.retry import RetryBudget
+
+BASE = "https://www.ticaretsicil.gov.tr"
+
+
+class TestClassifyEndpoint:
+    @pytest.mark.parametrize(
+        ("path", "expected"),
+        [
+            ("/captcha/captcha.php?123", "captcha"),
+            ("/assets/captcha/captcha.php", "captcha"),
+            ("/", "login"),
+            ("/view/modal/uyegirisi_ok.php", "login"),
+            ("/view/hizlierisim/unvansorgulama_ok.php", "search"),
+            ("/view/hizlierisim/ilangoruntuleme_ok.php", "ilan"),
+            ("/view/hizlierisim/pdf_goster.php?Guid=abc", "pdf"),
+            ("/tmp_gazete/abc.pdf", "pdf"),
+            ("/view/other.php", "other"),
+        ],
+    )
+    def test_classifies_tobb_paths(self, path, expected):
+        assert classify_endpoint(httpx.URL(BASE + path)) == expected
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker("search", failure_threshold=3, recovery_timeout=60)
+        for _ in range(2):
+            breaker.record_failure()
+        breaker.before_request()
+        breaker.record_failure()
+
+        assert breaker.state is BreakerState.OPEN
+        with pytest.raises(UpstreamUnavailableError):
+            breaker.before_request()
+        assert breaker.rejected == 1
+
+    def test_success_resets_failure_count(self):
+        breaker = CircuitBreaker("search", failure_threshold=2, recovery_timeout=60)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state is BreakerState.CLOSED
+
+    def test_half_open_allows_single_probe(self):
+        breaker = CircuitBreaker("pdf", failure_threshold=1, recovery_timeout=0)
+        breaker.record_failure()
+
+        assert breaker.state is BreakerState.HALF_OPEN
+        breaker.before_request()
+        with pytest.raises(UpstreamUnavailableError):
+            breaker.before_request()
+
+        breaker.record_success()
+        assert breaker.state is BreakerState.CLOSED
+        breaker.before_request()
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker("pdf", failure_threshold=5, recovery_timeout=60)
+        for _ in range(5):
+            breaker.record_failure()
+        breaker._opened_at -= 60
+
+        breaker.before_request()
+        breaker.record_failure()
+
+        assert breaker.state is BreakerState.OPEN
+
+
+class _FlakyUpstream(httpx.AsyncBaseTransport):
+    def __init__(self, status_code: int = 503) -> None:
+        self.status_code = status_code
+        self.calls = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        return httpx.Response(self.status_code)
+
+
+class TestCircuitBreakerTransport:
+    @pytest.mark.asyncio
+    async def test_fails_fast_once_open(self):
+        upstream = _FlakyUpstream(503)
+        registry = CircuitBreakerRegistry(failure_threshold=2, recovery_timeout=60)
+        budget = RetryBudget(ratio=0.2, min_per_second=0)
+        transport = CircuitBreakerTransport(upstream, registry, budget)
+        async with httpx.AsyncClient(transport=transport) as client:
+            for _ in range(2):
+                await client.get(f"{BASE}/view/hizlierisim/unvansorgulama_ok.php")
+            with pytest.raises(UpstreamUnavailableError):
+                await client.get(f"{BASE}/view/hizlierisim/unvansorgulama_ok.php")
+            # Other endpoint classes are unaffected
+            await client.get(f"{BASE}/view/hizlierisim/pdf_goster.php?Guid=x")
+
+        assert upstream.calls == 3
+        assert registry.breakers["search"].state is BreakerState.OPEN
+        assert budget.requests == 3
+
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_trip(self):
+        upstream = _FlakyUpstream(404)
+        registry = CircuitBreakerRegistry(failure_threshold=1, recovery_timeout=60)
+        async with httpx.AsyncClient(transport=CircuitBreakerTransport(upstream, registry)) as c:
+            await c.get(f"{BASE}/view/hizlierisim/ilangoruntuleme_ok.php")
+            await c.get(f"{BASE}/view/hizlierisim/ilangoruntuleme_ok.php")
+
+        assert registry.breakers["ilan"].state is BreakerState.CLOSED
+
+
+class TestRetryBudget:
+    def test_retries_limited_to_ratio_of_requests(self):
+        budget = RetryBudget(ratio=0.5, min_per_second=0, max_tokens=10)
+        budget._tokens = 0
+        for _ in range(4):
+            budget.record_request()
+
+        assert budget.try_spend()
+        assert budget.try_spend()
+        assert not budget.try_spend()
+        assert (budget.retries, budget.denied) == (2, 1)
+
+    def test_spend_raises_when_exhausted(self):
+        budget = RetryBudget(ratio=0.1, min_per_second=0, max_tokens=1)
+        budget.spend(operation="login")
+
+        with pytest.raises(UpstreamUnavailableError):
+            budget.spend(operation="login")
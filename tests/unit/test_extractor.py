@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core.exceptions import PDFFetchError
+from app.services.extractor import Extractor, pdf_flight_key
+from app.services.pdf_cache import PDFCache
+from app.utils.single_flight import SingleFlight
+
+
+@pytest.fixture
+def extractor():
+    auth = AsyncMock()
+    pdf = AsyncMock()
+    ocr = MagicMock()
+    return Extractor(auth_client=auth, pdf_fetcher=pdf, ocr_pipeline=ocr)
+
+
+class TestExtractMany:
+    @pytest.mark.asyncio
+    async def test_dedupes_and_keeps_partial_failures(self, extractor):
+        async def fetch(url):
+            if url.endswith("bad"):
+                raise PDFFetchError(message="PDF indirilemedi (HTTP 500)")
+            return b"%PDF-" + url.encode()
+
+        extractor._pdf.fetch.side_effect = fetch
+        extractor._ocr.extract_text.side_effect = lambda data: data.decode()
+
+        urls = ["https://x/pdf?Guid=a", "https://x/pdf?Guid=bad", "https://x/pdf?Guid=a"]
+        results = [r async for r in extractor.extract_many(urls, download_concurrency=2)]
+
+        by_url = {r.source_pdf_url: r for r in results}
+        assert len(results) == 2
+        assert by_url["https://x/pdf?Guid=a"].raw_text == "%PDF-https://x/pdf?Guid=a"
+        assert by_url["https://x/pdf?Guid=bad"].error == "PDF indirilemedi (HTTP 500)"
+        assert extractor._pdf.fetch.await_count == 2
+        extractor._auth.ensure_authenticated_with_retry.assert_awaited_once()
+        extractor._auth.logout.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_single_extract_keeps_shared_session(self, extractor):
+        extractor._pdf.fetch.return_value = b"%PDF-1.4"
+        extractor._ocr.extract_text.return_value = "metin"
+
+        result = await extractor.extract_from_url("https://x/pdf?Guid=a")
+
+        assert result.raw_text == "metin"
+        assert result.error is None
+        extractor._auth.ensure_session_valid.assert_awaited_once()
+        extractor._auth.logout.assert_not_awaited()
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_same_guid_shares_one_run(self):
+        flights = SingleFlight()
+        gate = asyncio.Event()
+
+        def build():
+            auth = AsyncMock()
+            pdf = AsyncMock()
+
+            async def fetch(url):
+                await gate.wait()
+                return b"%PDF-same"
+
+            pdf.fetch.side_effect = fetch
+            ocr = MagicMock()
+            ocr.extract_text.return_value = "metin"
+            return Extractor(auth_client=auth, pdf_fetcher=pdf, ocr_pipeline=ocr, flights=flights)
+
+        first, second = build(), build()
+        url_a = "https://x/pdf_goster.php?Guid=abc"
+        url_b = "https://x/pdf_goster.php?guid=abc&x=1"
+        tasks = [
+            asyncio.create_task(first.extract_from_url(url_a)),
+            asyncio.create_task(second.extract_from_url(url_b)),
+        ]
+        await asyncio.sleep(0)
+        gate.set()
+        res_a, res_b = await asyncio.gather(*tasks)
+
+        assert res_a.raw_text == res_b.raw_text == "metin"
+        assert res_b.source_pdf_url == url_b
+        assert first._pdf.fetch.await_count == 1
+        second._pdf.fetch.assert_not_awaited()
+        second._auth.ensure_authenticated_with_retry.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_work_survives_one_waiter_leaving(self):
+        flights = SingleFlight()
+        gate = asyncio.Event()
+
+        async def work():
+            await gate.wait()
+            return "sonuc"
+
+        first = asyncio.create_task(flights.do("k", work))
+        second = asyncio.create_task(flights.do("k", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        gate.set()
+
+        assert await second == "sonuc"
+        assert first.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_work_cancelled_when_last_waiter_leaves(self):
+        flights = SingleFlight()
+        aborted = asyncio.Event()
+
+        async def work():
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                aborted.set()
+                raise
+
+        waiter = asyncio.create_task(flights.do("k", work))
+        await asyncio.sleep(0)
+        waiter.cancel()
+
+        await asyncio.wait_for(aborted.wait(), timeout=1)
+        await asyncio.sleep(0)
+        assert "k" not in flights
+
+    @pytest.mark.asyncio
+    async def test_identical_bytes_are_ocred_once(self, extractor):
+        extractor._pdf.fetch.return_value = b"%PDF-identical"
+        calls = []
+
+        def slow_ocr(data):
+            calls.append(data)
+            time.sleep(0.05)
+            return "metin"
+
+        extractor._ocr.extract_text.side_effect = slow_ocr
+        urls = ["https://x/pdf?Guid=a", "https://x/pdf?Guid=b"]
+        results = [r async for r in extractor.extract_many(urls, download_concurrency=2)]
+
+        assert [r.raw_text for r in results] == ["metin", "metin"]
+        assert len(calls) == 1
+
+    def test_flight_key_normalises_guid_links(self):
+        key = pdf_flight_key("https://x/pdf_goster.php?Guid=abc-123")
+        assert key == "https://x/pdf_goster.php?Guid=abc-123"
+        assert pdf_flight_key("HTTPS://X:443/pdf_goster.php?guid=abc-123&t=1") == key
+        assert pdf_flight_key("https://x/tmp_gazete/a.pdf") == "https://x/tmp_gazete/a.pdf"
+
+    def test_flight_key_keeps_host_and_path(self):
+        key = pdf_flight_key("https://x/pdf_goster.php?Guid=abc-123")
+        assert pdf_flight_key("https://evil.test/pdf_goster.php?Guid=abc-123") != key
+        assert pdf_flight_key("https://x/other.php?Guid=abc-123") != key
+
+
+class TestPDFCache:
+    @pytest.mark.asyncio
+    async def test_cached_pdf_skips_login_and_download(self, tmp_path):
+        cache = PDFCache(str(tmp_path), max_bytes=1024**2)
+        auth, pdf, ocr = AsyncMock(), AsyncMock(), MagicMock()
+        pdf.fetch.return_value = b"%PDF-cached"
+        ocr.extract_text.side_effect = lambda data: bytes(data[:]).decode()
+        url = "https://x/pdf_goster.php?Guid=abc"
+
+        first = Extractor(auth_client=auth, pdf_fetcher=pdf, ocr_pipeline=ocr, pdf_cache=cache)
+        assert (await first.extract_from_url(url)).raw_text == "%PDF-cached"
+        assert auth.ensure_authenticated_with_retry.await_count == 1
+
+        auth.reset_mock()
+        pdf.reset_mock()
+        second = Extractor(auth_client=auth, pdf_fetcher=pdf, ocr_pipeline=ocr, pdf_cache=cache)
+        result = await second.extract_from_url(url)
+
+        assert result.raw_text == "%PDF-cached"
+        pdf.fetch.assert_not_awaited()
+        auth.ensure_authenticated_with_retry.assert_not_awaited()
+        auth.logout.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_foreign_url_with_same_guid_is_not_served_from_cache(self, tmp_path):
+        cache = PDFCache(str(tmp_path), max_bytes=1024**2)
+        auth, pdf, ocr = AsyncMock(), AsyncMock(), MagicMock()
+        pdf.fetch.side_effect = lambda url: b"%PDF-" + url.encode()
+        ocr.extract_text.side_effect = lambda data: bytes(data[:]).decode()
+        extractor = Extractor(auth_client=auth, pdf_fetcher=pdf, ocr_pipeline=ocr, pdf_cache=cache)
+
+        await extractor.extract_from_url("https://evil.test/pdf_goster.php?Guid=abc")
+        result = await extractor.extract_from_url("https://x/pdf_goster.php?Guid=abc")
+
+        assert result.raw_text == "%PDF-https://x/pdf_goster.php?Guid=abc"
+        assert pdf.fetch.await_count == 2
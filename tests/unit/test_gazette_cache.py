@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.config import Settings
+from app.schemas.responses import GazetteRecord
+from app.services.gazette_cache import GazetteRecordCache, parse_gazette_date
+from app.services.gazette_client import GazetteClient
+
+
+def _record(date: str, guid: str) -> GazetteRecord:
+    return GazetteRecord(
+        mudurluk="ANKARA",
+        sicil_no="123",
+        unvan="ACME A.S.",
+        yayin_tarihi=date,
+        pdf_url=f"https://example.com/pdf_goster.php?Guid={guid}",
+    )
+
+
+class TestParseGazetteDate:
+    def test_formats(self):
+        assert parse_gazette_date("15/03/2024") == datetime(2024, 3, 15)
+        assert parse_gazette_date("15.03.2024") == datetime(2024, 3, 15)
+
+    def test_invalid(self):
+        assert parse_gazette_date(None) is None
+        assert parse_gazette_date("bilinmiyor") is None
+
+
+class TestGazetteRecordCache:
+    def test_latest_date_and_merge_dedupes(self):
+        cache = GazetteRecordCache(fresh_ttl=60, max_entries=10)
+        cache.put("18", "123", [_record("01/01/2020", "a"), _record("15/06/2024", "b")])
+        assert cache.latest_date("18", "123") == datetime(2024, 6, 15)
+
+        merged = cache.merge("18", "123", [_record("15/06/2024", "b"), _record("01/07/2024", "c")])
+        assert [r.pdf_url[-1] for r in merged] == ["a", "b", "c"]
+
+    def test_find_by_pdf_url_follows_replacement_and_eviction(self):
+        cache = GazetteRecordCache(fresh_ttl=60, max_entries=1)
+        cache.put("18", "123", [_record("01/01/2020", "a")])
+        url = "https://example.com/pdf_goster.php?Guid=a"
+        assert cache.find_by_pdf_url(url).yayin_tarihi == "01/01/2020"
+
+        cache.merge("18", "123", [_record("15/06/2024", "b")])
+        assert cache.find_by_pdf_url(url) is not None
+
+        cache.put("18", "456", [_record("01/07/2024", "c")])
+        assert cache.find_by_pdf_url(url) is None
+        assert cache.find_by_pdf_url(url[:-1] + "c") is not None
+
+    def test_freshness_window(self):
+        cache = GazetteRecordCache(fresh_ttl=60, max_entries=10)
+        with patch("app.services.gazette_cache.time.monotonic", return_value=100.0):
+            cache.put("18", "123", [])
+        with patch("app.services.gazette_cache.time.monotonic", return_value=130.0):
+            assert cache.is_fresh("18", "123")
+        with patch("app.services.gazette_cache.time.monotonic", return_value=170.0):
+            assert not cache.is_fresh("18", "123")
+
+
+class TestSearchCompany:
+    @pytest.mark.asyncio
+    async def test_incremental_refresh_requests_only_new_window(self):
+        cache = GazetteRecordCache(fresh_ttl=0, max_entries=10)
+        cache.put("18", "123", [_record("15/06/2024", "b")])
+        client = GazetteClient(client=AsyncMock(), settings=Settings(), cache=cache)
+
+        with patch.object(
+            client, "search", new_callable=AsyncMock, return_value=[_record("01/07/2024", "c")]
+        ) as search:
+            records = await client.search_company("18", "123")
+
+        search.assert_awaited_once_with(
+            sicil_mudurlugu_id="18", tic_sic_no="123", date_from="15.06.2024"
+        )
+        assert len(records) == 2
+
+    @pytest.mark.asyncio
+    async def test_fresh_entry_skips_request(self):
+        cache = GazetteRecordCache(fresh_ttl=600, max_entries=10)
+        cache.put("18", "123", [_record("15/06/2024", "b")])
+        client = GazetteClient(client=AsyncMock(), settings=Settings(), cache=cache)
+
+        with patch.object(client, "search", new_callable=AsyncMock) as search:
+            records = await client.search_company("18", "123")
+
+        search.assert_not_called()
+        assert len(records) == 1
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from datetime import date
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.config import Settings
+from app.schemas.responses import GazetteRecord
+from app.services.gazette_cache import GazetteRecordCache
+from app.services.gazette_client import GazetteClient, filter_records
+
+
+def _record(yayin_tarihi: str | None, ilan_turu: str | None = None) -> GazetteRecord:
+    return GazetteRecord(
+        mudurluk="ISTANBUL",
+        sicil_no="1",
+        unvan="ACME",
+        yayin_tarihi=yayin_tarihi,
+        ilan_turu=ilan_turu,
+        pdf_url=f"https://example.test/pdf_goster.php?Guid={yayin_tarihi}",
+    )
+
+
+class TestFilterRecords:
+    def test_notice_type_matches_turkish_case_insensitive_substring(self):
+        records = [_record("01/01/2024", "Sermaye Artırımı"), _record("02/01/2024", "Kuruluş")]
+
+        kept = filter_records(records, ilan_turu=["ARTIRIM", "genel kurul"])
+
+        assert [r.ilan_turu for r in kept] == ["Sermaye Artırımı"]
+
+    def test_date_window_is_inclusive_and_drops_undated(self):
+        records = [
+            _record("31.12.2023"),
+            _record("01/01/2024"),
+            _record("31/01/2024"),
+            _record(None),
+        ]
+
+        kept = filter_records(records, date_from=date(2024, 1, 1), date_to=date(2024, 1, 31))
+
+        assert [r.yayin_tarihi for r in kept] == ["01/01/2024", "31/01/2024"]
+
+    def test_no_filters_keeps_everything(self):
+        records = [_record(None), _record("01/01/2024")]
+
+        assert filter_records(records) == records
+
+
+class TestSearchWindow:
+    @pytest.mark.asyncio
+    async def test_fresh_cache_is_filtered_without_request(self):
+        cache = GazetteRecordCache(fresh_ttl=60, max_entries=10)
+        cache.put("18", "1", [_record("01/01/2023"), _record("01/01/2024")])
+        client = GazetteClient(client=None, settings=Settings(), cache=cache)
+        client.search = AsyncMock()
+
+        records = await client.search_window("18", "1", date_from=date(2023, 6, 1))
+
+        assert [r.yayin_tarihi for r in records] == ["01/01/2024"]
+        client.search.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_window_pushed_into_form_fields(self):
+        client = GazetteClient(client=None, settings=Settings())
+        client.search = AsyncMock(return_value=[_record("05/03/2024")])
+
+        records = await client.search_window("18", "1", date_to=date(2024, 3, 31))
+
+        assert len(records) == 1
+        client.search.assert_awaited_once_with(
+            sicil_mudurlugu_id="18", tic_sic_no="1", date_from="", date_to="31.03.2024"
+        )
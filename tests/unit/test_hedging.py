@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.utils.hedging import Hedger
+from app.utils.rate_limit import TokenBucket
+
+
+def _calls(*behaviours):
+    """Each call pops the next (delay, result-or-exception) pair."""
+    queue = list(behaviours)
+    state = {"cancelled": 0}
+
+    async def call():
+        delay, outcome = queue.pop(0)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            state["cancelled"] += 1
+            raise
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return call, state
+
+
+class TestHedger:
+    @pytest.mark.asyncio
+    async def test_fast_call_is_not_hedged(self):
+        hedger = Hedger(percentile=95, min_delay=0.05, max_ratio=1.0)
+        call, _ = _calls((0, "a"))
+        assert await hedger.run("pdf", call) == "a"
+        assert hedger.stats["pdf"].hedged == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_loses_to_hedge(self):
+        hedger = Hedger(percentile=95, min_delay=0.02, max_ratio=1.0)
+        call, state = _calls((5, "slow"), (0, "hedge"))
+
+        assert await hedger.run("pdf", call) == "hedge"
+        await asyncio.sleep(0)
+        stats = hedger.stats["pdf"]
+        assert (stats.requests, stats.hedged, stats.hedge_wins) == (1, 1, 1)
+        assert state["cancelled"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_primary_falls_back_to_hedge(self):
+        hedger = Hedger(percentile=95, min_delay=0.01, max_ratio=1.0)
+        call, _ = _calls((0.05, RuntimeError("boom")), (0.1, "hedge"))
+        assert await hedger.run("pdf", call) == "hedge"
+
+    @pytest.mark.asyncio
+    async def test_budget_and_busy_limiter_prevent_hedging(self):
+        no_budget = Hedger(percentile=95, min_delay=0.01, max_ratio=0.0)
+        call, _ = _calls((0.03, "a"))
+        assert await no_budget.run("pdf", call) == "a"
+        assert no_budget.stats["pdf"].hedged == 0
+
+        empty = TokenBucket(rate=0.001, capacity=1)
+        await empty.acquire()
+        busy = Hedger(percentile=95, min_delay=0.01, max_ratio=1.0, limiter=empty)
+        call, _ = _calls((0.03, "b"))
+        assert await busy.run("pdf", call) == "b"
+        assert busy.stats["pdf"].hedged == 0
+
+    def test_delay_tracks_percentile(self):
+        hedger = Hedger(percentile=90, min_delay=0.1, max_ratio=0.1)
+        hedger._latencies["pdf"].extend([0.2] * 90 + [3.0] * 10)
+        assert hedger.delay_for("pdf") == 3.0
+        assert hedger.delay_for("captcha") == 0.1
@@ -0,0 +1,83 @@
+"""Golden tests for the lxml parsers.
+
+tests/fixtures/html/golden.json holds the output of the BeautifulSoup-based
+parsers these replaced, recorded over the HTML fixtures next to it; the new
+parsers must reproduce it exactly.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from app.config import Settings
+from app.services import html_parsing
+from app.services.gazette_client import GazetteClient
+from app.services.pdf_fetcher import PDFFetcher
+from app.services.search_client import SearchClient
+
+FIXTURES = Path(__file__).parent.parent / "fixtures" / "html"
+GOLDEN = json.loads((FIXTURES / "golden.json").read_text(encoding="utf-8"))
+PDF_PAGES = json.loads((FIXTURES / "pdf_goster_pages.json").read_text(encoding="utf-8"))
+PDF_BASE_URL = "https://www.ticaretsicil.gov.tr/view/hizlierisim/pdf_goster.php?Guid=abc"
+
+
+def _fixture(name: str) -> str:
+    return (FIXTURES / f"{name}.html").read_text(encoding="utf-8")
+
+
+class TestSearchResults:
+    @pytest.mark.parametrize("name", sorted(GOLDEN["unvan_sorgulama"]))
+    def test_matches_golden(self, name):
+        records, total = SearchClient._parse_results(_fixture(name))
+
+        expected = GOLDEN["unvan_sorgulama"][name]
+        assert total == expected["total"]
+        assert [r.model_dump() for r in records] == expected["records"]
+
+    def test_empty_body(self):
+        assert SearchClient._parse_results("") == ([], 0)
+
+
+class TestGazetteResults:
+    @pytest.fixture
+    def client(self):
+        return GazetteClient(client=None, settings=Settings())
+
+    @pytest.mark.parametrize("name", sorted(GOLDEN["ilangoruntuleme"]))
+    def test_matches_golden(self, client, name):
+        records = client._parse_results(_fixture(name))
+
+        assert [r.model_dump() for r in records] == GOLDEN["ilangoruntuleme"][name]
+
+
+class TestPdfLink:
+    @pytest.mark.parametrize("name", sorted(PDF_PAGES))
+    def test_matches_golden(self, name):
+        url = PDFFetcher._extract_pdf_url_from_html(PDF_PAGES[name], PDF_BASE_URL)
+
+        assert url == GOLDEN["pdf_goster"][name]
+
+    @pytest.mark.parametrize("name", sorted(PDF_PAGES))
+    def test_fast_path_agrees_with_tree_walk(self, name):
+        html = PDF_PAGES[name]
+        root = html_parsing.parse_html(html)
+        from_tree = html_parsing._find_in_tree(root) if root is not None else None
+
+        assert html_parsing.find_pdf_link(html) == (from_tree or html_parsing._quoted_pdf(html))
+
+    @pytest.mark.parametrize(
+        ("html", "expected"),
+        [
+            ('<embed src="/a.pdf">', (True, "/a.pdf")),
+            ("<embed width=100 src=/a.pdf />", (True, "/a.pdf")),
+            ('<embed src="/a.pdf?x=1&amp;y=2">', (True, None)),
+            ('<!-- x --><embed src="/a.pdf">', (True, None)),
+            ('<embed src="/a.pdf" src="/b.pdf">', (True, None)),
+            ('<embedded src="/a.pdf">', (False, None)),
+        ],
+    )
+    def test_scan_first_tag(self, html, expected):
+        assert html_parsing._scan_first_tag(html, "embed", "src") == expected
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.clients.http_client import PoolMetrics, PoolTimingTransport, prewarm_http_clients
+
+
+class _FakePool(httpx.AsyncBaseTransport):
+    """Emits httpcore-style trace events after a simulated wait for a connection."""
+
+    def __init__(self, wait: float, reuse_after_first: bool = True) -> None:
+        self.wait = wait
+        self.calls = 0
+        self.reuse_after_first = reuse_after_first
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        trace = request.extensions["trace"]
+        await asyncio.sleep(self.wait)
+        if self.calls == 0 or not self.reuse_after_first:
+            await trace("connection.connect_tcp.started", {})
+            await asyncio.sleep(0.01)
+        await trace("http11.send_request_headers.started", {})
+        self.calls += 1
+        return httpx.Response(200)
+
+
+class TestPoolTimingTransport:
+    @pytest.mark.asyncio
+    async def test_records_wait_and_new_connections(self):
+        metrics = PoolMetrics()
+        transport = PoolTimingTransport(_FakePool(wait=0.02), metrics)
+        async with httpx.AsyncClient(transport=transport) as client:
+            await client.get("https://example.test/")
+            await client.get("https://example.test/")
+
+        assert metrics.requests == 2
+        assert metrics.new_connections == 1
+        assert metrics.max_wait >= 0.02
+        assert metrics.total_connect >= 0.01
+
+    @pytest.mark.asyncio
+    async def test_chains_caller_trace(self):
+        seen = []
+
+        async def caller_trace(name, info):
+            seen.append(name)
+
+        transport = PoolTimingTransport(_FakePool(wait=0), PoolMetrics())
+        async with httpx.AsyncClient(transport=transport) as client:
+            await client.get("https://example.test/", extensions={"trace": caller_trace})
+
+        assert "http11.send_request_headers.started" in seen
+
+
+class TestPrewarm:
+    @pytest.mark.asyncio
+    async def test_counts_reachable_clients(self):
+        def ok(request):
+            return httpx.Response(405)
+
+        def down(request):
+            raise httpx.ConnectError("baglanti yok", request=request)
+
+        clients = [
+            httpx.AsyncClient(transport=httpx.MockTransport(ok)),
+            httpx.AsyncClient(transport=httpx.MockTransport(down)),
+        ]
+        assert await prewarm_http_clients(clients, "https://example.test") == 1
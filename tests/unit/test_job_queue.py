@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from app.core.exceptions import InvalidRequestError
+from app.schemas.enums import JobStatus
+from app.schemas.responses import ExtractResult
+from app.services.job_queue import (
+    JobQueue,
+    JobStore,
+    check_callback_url,
+    resolve_callback_url,
+)
+
+PDF_URL = "https://www.ticaretsicil.gov.tr/view/hizlierisim/pdf_goster.php?Guid=abc"
+PUBLIC_IP = "93.184.216.34"
+
+
+def _dns(*answers: str):
+    """Patch host resolution so every name resolves to answers."""
+    addresses = [ipaddress.ip_address(a) for a in answers]
+    return patch("app.services.job_queue._resolve_host", AsyncMock(return_value=addresses))
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = JobStore(str(tmp_path / "jobs.sqlite3"))
+    yield s
+    s.close()
+
+
+class TestJobStore:
+    def test_claim_is_exclusive(self, store):
+        job = store.create(PDF_URL, None)
+        assert job.status == JobStatus.QUEUED
+        assert store.claim(job.job_id) is True
+        assert store.claim(job.job_id) is False
+        assert store.get(job.job_id).status == JobStatus.RUNNING
+
+    def test_finish_marks_failed_on_error(self, store):
+        job = store.create(PDF_URL, None)
+        store.claim(job.job_id)
+        done = store.finish(job.job_id, ExtractResult(source_pdf_url=PDF_URL, error="boom"))
+        assert done.status == JobStatus.FAILED
+        assert done.result.error == "boom"
+
+    def test_requeue_unfinished_survives_reopen(self, tmp_path):
+        path = str(tmp_path / "jobs.sqlite3")
+        first = JobStore(path)
+        running = first.create(PDF_URL, None)
+        first.claim(running.job_id)
+        queued = first.create(PDF_URL + "2", None)
+        first.close()
+
+        second = JobStore(path)
+        assert second.requeue_unfinished() == [running.job_id, queued.job_id]
+        assert second.get(running.job_id).status == JobStatus.QUEUED
+        second.close()
+
+
+class TestCallbackUrl:
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "ftp://hook.example/cb",
+            "http://localhost:8000/cb",
+            "http://127.0.0.1/cb",
+            "http://10.0.0.5/cb",
+            "http://169.254.169.254/latest/meta-data",
+            "http://[::1]/cb",
+        ],
+    )
+    def test_rejects_without_allow_list(self, url):
+        with pytest.raises(InvalidRequestError):
+            check_callback_url(url, [])
+
+    def test_public_host_allowed_without_allow_list(self):
+        check_callback_url("https://hook.example/cb", [])
+
+    def test_allow_list_matches_host_and_subdomains(self):
+        check_callback_url("https://api.hook.example/cb", ["hook.example"])
+        with pytest.raises(InvalidRequestError):
+            check_callback_url("https://hook.example.evil.test/cb", ["hook.example"])
+
+
+class TestCallbackResolution:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("url", "answers"),
+        [
+            ("http://localtest.me/cb", ["127.0.0.1"]),
+            ("http://metadata.google.internal/", ["169.254.169.254"]),
+            ("https://hook.example/cb", [PUBLIC_IP, "10.0.0.5"]),
+            ("https://hook.example/cb", ["::ffff:127.0.0.1"]),
+        ],
+    )
+    async def test_rejects_names_resolving_inward(self, url, answers):
+        with _dns(*answers), pytest.raises(InvalidRequestError):
+            await resolve_callback_url(url, [])
+
+    @pytest.mark.asyncio
+    async def test_rejects_unresolvable_host(self):
+        failing = AsyncMock(side_effect=OSError("Name or service not known"))
+        with (
+            patch("app.services.job_queue._resolve_host", failing),
+            pytest.raises(InvalidRequestError),
+        ):
+            await resolve_callback_url("https://yok.example/cb", [])
+
+    @pytest.mark.asyncio
+    async def test_returns_checked_address(self):
+        with _dns(PUBLIC_IP) as resolve:
+            assert await resolve_callback_url("https://hook.example:8443/cb", []) == PUBLIC_IP
+        resolve.assert_awaited_once_with("hook.example", 8443)
+
+    @pytest.mark.asyncio
+    async def test_allow_list_skips_resolution(self):
+        with _dns("10.0.0.5") as resolve:
+            assert (
+                await resolve_callback_url("http://hooks.internal/cb", ["hooks.internal"]) is None
+            )
+        resolve.assert_not_awaited()
+
+
+class TestJobQueue:
+    @pytest.mark.asyncio
+    async def test_runs_job_and_posts_webhook(self, store):
+        extractor = AsyncMock()
+        extractor.extract_from_url.return_value = ExtractResult(
+            source_pdf_url=PDF_URL, raw_text="metin"
+        )
+
+        @asynccontextmanager
+        async def factory():
+            yield extractor
+
+        delivered = asyncio.Event()
+        payloads = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            payloads.append(request.content)
+            delivered.set()
+            return httpx.Response(200)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as webhook:
+            queue = JobQueue(store, factory, webhook, workers=1)
+            queue.start()
+            with _dns(PUBLIC_IP):
+                job = await queue.submit(PDF_URL, callback_url="https://hook.example/cb")
+                assert (await queue.submit(PDF_URL)).job_id == job.job_id
+                await asyncio.wait_for(delivered.wait(), timeout=2)
+            await queue.stop()
+
+        done = queue.get(job.job_id)
+        assert done.status == JobStatus.COMPLETED
+        assert done.result.raw_text == "metin"
+        assert job.job_id.encode() in payloads[0]
+        extractor.extract_from_url.assert_awaited_once_with(PDF_URL)
+
+    @pytest.mark.asyncio
+    async def test_duplicate_submit_keeps_every_callback(self, store):
+        extractor = AsyncMock()
+        extractor.extract_from_url.return_value = ExtractResult(
+            source_pdf_url=PDF_URL, raw_text="metin"
+        )
+
+        @asynccontextmanager
+        async def factory():
+            yield extractor
+
+        delivered: list[str] = []
+        both = asyncio.Event()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.url.host == PUBLIC_IP
+            assert request.extensions["sni_hostname"] == request.headers["Host"]
+            delivered.append(request.headers["Host"])
+            if len(delivered) == 2:
+                both.set()
+            return httpx.Response(200)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as webhook:
+            queue = JobQueue(store, factory, webhook, workers=1)
+            with _dns(PUBLIC_IP):
+                first = await queue.submit(PDF_URL, callback_url="https://a.example/cb")
+                second = await queue.submit(PDF_URL, callback_url="https://b.example/cb")
+                assert second.job_id == first.job_id
+                assert second.callback_urls == ["https://a.example/cb", "https://b.example/cb"]
+
+                queue.start()
+                await asyncio.wait_for(both.wait(), timeout=2)
+            await queue.stop()
+
+        assert sorted(delivered) == ["a.example", "b.example"]
+        extractor.extract_from_url.assert_awaited_once_with(PDF_URL)
+
+    @pytest.mark.asyncio
+    async def test_webhook_dropped_when_dns_turns_inward(self, store):
+        extractor = AsyncMock()
+        extractor.extract_from_url.return_value = ExtractResult(
+            source_pdf_url=PDF_URL, raw_text="metin"
+        )
+
+        @asynccontextmanager
+        async def factory():
+            yield extractor
+
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as webhook:
+            queue = JobQueue(store, factory, webhook, workers=1)
+            with _dns(PUBLIC_IP):
+                job = await queue.submit(PDF_URL, callback_url="https://hook.example/cb")
+            with _dns("127.0.0.1"):
+                queue.start()
+                await asyncio.wait_for(queue._queue.join(), timeout=2)
+            await queue.stop()
+
+        assert queue.get(job.job_id).status == JobStatus.COMPLETED
+        assert requests == []
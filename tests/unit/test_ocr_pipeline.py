@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import io
+import mmap
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -7,7 +9,7 @@ from PIL import Image
 
 from app.config import Settings
 from app.core.exceptions import OCRError
-from app.services.ocr_pipeline import OCRPipeline
+from app.services.ocr_pipeline import OCRPipeline, _as_stream
 
 
 @pytest.fixture
@@ -87,3 +89,16 @@ class TestOCRPipeline:
 
         assert mock_tess.image_to_string.call_count == 1
         assert "single column text" in result
+
+
+class TestAsStream:
+    def test_mmap_stream_reads_and_seeks(self, tmp_path):
+        path = tmp_path / "a.pdf"
+        path.write_bytes(b"%PDF-1.4 body %%EOF")
+        with path.open("rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            stream = _as_stream(data)
+            assert stream.read(8) == b"%PDF-1.4"
+            stream.seek(-5, io.SEEK_END)
+            assert stream.read() == b"%%EOF"
+            stream.seek(0)
+            assert stream.read() == b"%PDF-1.4 body %%EOF"
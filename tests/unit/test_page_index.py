@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import hashlib
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.schemas.responses import GazetteRecord
+from app.services.extractor import Extractor
+from app.services.gazette_cache import GazetteRecordCache
+from app.services.page_index import GazettePageIndex, gazette_page
+
+PDF = "https://www.ticaretsicil.gov.tr/view/hizlierisim/pdf_goster.php?Guid="
+
+
+def _record(sicil_no: str, guid: str, sayi: str = "11085", sayfa: str = "412") -> GazetteRecord:
+    return GazetteRecord(
+        mudurluk="ANKARA",
+        sicil_no=sicil_no,
+        unvan=f"FIRMA {sicil_no}",
+        yayin_tarihi="15/06/2024",
+        sayi=sayi,
+        sayfa=sayfa,
+        pdf_url=f"{PDF}{guid}",
+    )
+
+
+@pytest.fixture
+def page_index():
+    index = GazettePageIndex(":memory:")
+    yield index
+    index.close()
+
+
+@pytest.fixture
+def gazette_cache():
+    cache = GazetteRecordCache(fresh_ttl=60, max_entries=10)
+    cache.put("18", "1", [_record("1", "a")])
+    cache.put("18", "2", [_record("2", "b")])
+    cache.put("18", "3", [_record("3", "c", sayfa="413")])
+    return cache
+
+
+def _extractor(page_index, gazette_cache) -> Extractor:
+    return Extractor(
+        auth_client=AsyncMock(),
+        pdf_fetcher=AsyncMock(),
+        ocr_pipeline=MagicMock(),
+        page_index=page_index,
+        gazette_cache=gazette_cache,
+    )
+
+
+class TestGazettePageIndex:
+    def test_page_and_hash_lookups(self, page_index):
+        page_index.put("h1", "metin", ("11085", "412"))
+        page_index.put("h2", "diger")
+
+        assert page_index.text_for_page(("11085", "412")) == "metin"
+        assert page_index.text_for_page(("11085", "413")) is None
+        assert page_index.text_for_hash("h2") == "diger"
+        assert page_index.counts() == (1, 2)
+        assert (page_index.page_hits, page_index.hash_hits) == (1, 1)
+
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "pages.sqlite3")
+        index = GazettePageIndex(path)
+        index.put("h1", "metin", ("11085", "412"))
+        index.close()
+
+        reopened = GazettePageIndex(path)
+        assert reopened.has_page(("11085", "412"))
+        reopened.close()
+
+    def test_gazette_page_needs_both_parts(self):
+        assert gazette_page(" 11085 ", "412") == ("11085", "412")
+        assert gazette_page("11085", None) is None
+        assert gazette_page("", "412") is None
+
+
+class TestExtractorPageReuse:
+    @pytest.mark.asyncio
+    async def test_same_page_other_company_skips_download(self, page_index, gazette_cache):
+        first = _extractor(page_index, gazette_cache)
+        first._pdf.fetch.return_value = b"%PDF-page"
+        first._ocr.extract_text.return_value = "sayfa metni"
+        await first.extract_from_url(f"{PDF}a")
+
+        second = _extractor(page_index, gazette_cache)
+        result = await second.extract_from_url(f"{PDF}b")
+
+        assert result.raw_text == "sayfa metni"
+        assert result.source_pdf_url == f"{PDF}b"
+        second._pdf.fetch.assert_not_awaited()
+        second._auth.ensure_authenticated_with_retry.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_batch_over_one_page_downloads_once(self, page_index, gazette_cache):
+        extractor = _extractor(page_index, gazette_cache)
+        extractor._pdf.fetch.side_effect = lambda url: b"%PDF-" + url[-1:].encode()
+        extractor._ocr.extract_text.return_value = "metin"
+
+        urls = [f"{PDF}a", f"{PDF}b", f"{PDF}c"]
+        results = [r async for r in extractor.extract_many(urls, download_concurrency=3)]
+
+        assert {r.source_pdf_url for r in results} == set(urls)
+        # a and b share page 412; c is on page 413
+        assert extractor._pdf.fetch.await_count == 2
+        assert page_index.counts() == (2, 2)
+
+    @pytest.mark.asyncio
+    async def test_known_bytes_skip_ocr(self, page_index):
+        page_index.put(hashlib.sha256(b"%PDF-same").hexdigest(), "eski metin")
+        extractor = _extractor(page_index, None)
+        extractor._pdf.fetch.return_value = b"%PDF-same"
+
+        result = await extractor.extract_from_url(f"{PDF}z")
+
+        assert result.raw_text == "eski metin"
+        extractor._ocr.extract_text.assert_not_called()
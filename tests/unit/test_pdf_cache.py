@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from app.services.pdf_cache import PDFCache
+
+
+class TestPDFCache:
+    @pytest.mark.asyncio
+    async def test_put_and_open_as_mmap(self, tmp_path):
+        cache = PDFCache(str(tmp_path), max_bytes=1024)
+        await cache.put("abc-123", b"%PDF-hello")
+
+        assert cache.contains("abc-123")
+        with cache.open("abc-123") as data:
+            assert data is not None
+            assert data[:] == b"%PDF-hello"
+        with cache.open("missing") as data:
+            assert data is None
+        assert not list(tmp_path.glob("*.tmp"))
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used(self, tmp_path):
+        cache = PDFCache(str(tmp_path), max_bytes=25)
+        await cache.put("a", b"a" * 10)
+        await cache.put("b", b"b" * 10)
+        cache.path_for("a")  # touch a, so b is now the oldest
+        await cache.put("c", b"c" * 10)
+
+        assert cache.contains("a")
+        assert not cache.contains("b")
+        assert cache.contains("c")
+        assert cache.total_bytes == 20
+
+    @pytest.mark.asyncio
+    async def test_index_survives_restart(self, tmp_path):
+        first = PDFCache(str(tmp_path), max_bytes=100)
+        await first.put("old", b"o" * 40)
+        await first.put("new", b"n" * 40)
+        old_path = first.path_for("old")
+        os.utime(old_path, (0, 0))
+
+        second = PDFCache(str(tmp_path), max_bytes=50)
+        assert second.contains("new")
+        assert not second.contains("old")
+
+    @pytest.mark.asyncio
+    async def test_skips_oversized_and_empty(self, tmp_path):
+        cache = PDFCache(str(tmp_path), max_bytes=5)
+        await cache.put("big", b"x" * 6)
+        await cache.put("empty", b"")
+        assert cache.total_bytes == 0
+
+    @pytest.mark.asyncio
+    async def test_text_sidecar_counts_and_evicts_with_pdf(self, tmp_path):
+        cache = PDFCache(str(tmp_path), max_bytes=30)
+        await cache.put_text("a", "ignored, pdf not cached")
+        assert not cache.has_text("a")
+
+        await cache.put("a", b"a" * 10)
+        await cache.put_text("a", "metin")
+        assert cache.get_text("a") == "metin"
+        assert cache.total_bytes == 15
+
+        await cache.put("b", b"b" * 20)
+        assert not cache.contains("a")
+        assert not list(tmp_path.glob("*.txt"))
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from app.core.exceptions import PDFFetchError
+from app.services.pdf_fetcher import PDFFetcher
+
+BASE = "https://www.ticaretsicil.gov.tr/view/hizlierisim"
+PDF_BYTES = b"%PDF-1.4\n" + b"x" * 200_000
+
+
+class _Body(httpx.AsyncByteStream):
+    """Streams chunks without a Content-Length and records how many were read."""
+
+    def __init__(self, chunks: list[bytes]) -> None:
+        self.chunks = chunks
+        self.sent = 0
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            self.sent += 1
+            yield chunk
+
+
+def _fetcher(handler, settings) -> PDFFetcher:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return PDFFetcher(client=client, settings=settings)
+
+
+class TestFetch:
+    @pytest.mark.asyncio
+    async def test_direct_pdf(self, settings):
+        fetcher = _fetcher(
+            lambda req: httpx.Response(
+                200, content=PDF_BYTES, headers={"content-type": "application/pdf"}
+            ),
+            settings,
+        )
+        assert await fetcher.fetch(f"{BASE}/pdf_goster.php?Guid=a") == PDF_BYTES
+
+    @pytest.mark.asyncio
+    async def test_content_length_over_limit_fails_before_body(self, settings):
+        settings.MAX_PDF_MB = 1
+        body = _Body([b"%PDF-" + b"x" * 1024])
+
+        def handler(req):
+            return httpx.Response(
+                200,
+                stream=body,
+                headers={"content-type": "application/pdf", "content-length": str(5 * 1024**2)},
+            )
+
+        with pytest.raises(PDFFetchError, match="boyutu limiti"):
+            await _fetcher(handler, settings).fetch(f"{BASE}/pdf_goster.php?Guid=a")
+        assert body.sent == 0
+
+    @pytest.mark.asyncio
+    async def test_limit_enforced_while_streaming(self, settings):
+        settings.MAX_PDF_MB = 1
+        body = _Body([b"%PDF-" + b"x" * 600_000, b"x" * 600_000, b"x" * 600_000])
+
+        def handler(req):
+            return httpx.Response(200, stream=body, headers={"content-type": "application/pdf"})
+
+        with pytest.raises(PDFFetchError, match="boyutu limiti"):
+            await _fetcher(handler, settings).fetch(f"{BASE}/pdf_goster.php?Guid=a")
+        assert body.sent < 3
+
+    @pytest.mark.asyncio
+    async def test_unknown_type_without_magic_rejected(self, settings):
+        fetcher = _fetcher(
+            lambda req: httpx.Response(
+                200, content=b"not a pdf", headers={"content-type": "application/octet-stream"}
+            ),
+            settings,
+        )
+        with pytest.raises(PDFFetchError, match="Beklenmeyen icerik tipi"):
+            await fetcher.fetch(f"{BASE}/pdf_goster.php?Guid=a")
+
+    @pytest.mark.asyncio
+    async def test_html_embed_is_followed(self, settings):
+        def handler(req):
+            if req.url.path.endswith(".pdf"):
+                return httpx.Response(
+                    200, content=PDF_BYTES, headers={"content-type": "application/pdf"}
+                )
+            return httpx.Response(
+                200,
+                text='<html><embed src="/tmp_gazete/abc.pdf"></html>',
+                headers={"content-type": "text/html; charset=utf-8"},
+            )
+
+        fetcher = _fetcher(handler, settings)
+        assert await fetcher.fetch(f"{BASE}/pdf_goster.php?Guid=a") == PDF_BYTES
+
+
+class _Dropping(httpx.AsyncByteStream):
+    """Sends the first chunk, then fails like a connection cut mid-download."""
+
+    def __init__(self, first: bytes) -> None:
+        self.first = first
+
+    async def __aiter__(self):
+        yield self.first
+        raise httpx.ReadError("baglanti koptu")
+
+
+class TestResume:
+    @pytest.mark.asyncio
+    async def test_resumes_with_range_request(self, settings):
+        cut = 2 * 64 * 1024  # whole chunks, so everything sent is received before the cut
+        seen_headers = []
+
+        def handler(req):
+            seen_headers.append(dict(req.headers))
+            if "range" not in req.headers:
+                return httpx.Response(
+                    200,
+                    stream=_Dropping(PDF_BYTES[:cut]),
+                    headers={
+                        "content-type": "application/pdf",
+                        "content-length": str(len(PDF_BYTES)),
+                        "etag": '"v1"',
+                    },
+                )
+            start = int(req.headers["range"].removeprefix("bytes=").rstrip("-"))
+            return httpx.Response(
+                206,
+                content=PDF_BYTES[start:],
+                headers={
+                    "content-type": "application/pdf",
+                    "content-range": f"bytes {start}-{len(PDF_BYTES) - 1}/{len(PDF_BYTES)}",
+                },
+            )
+
+        data = await _fetcher(handler, settings).fetch(f"{BASE}/pdf_goster.php?Guid=a")
+
+        assert data == PDF_BYTES
+        assert seen_headers[1]["range"] == f"bytes={cut}-"
+        assert seen_headers[1]["if-range"] == '"v1"'
+
+    @pytest.mark.asyncio
+    async def test_restarts_when_range_ignored(self, settings):
+        calls = []
+
+        def handler(req):
+            calls.append(req)
+            if len(calls) == 1:
+                return httpx.Response(
+                    200,
+                    stream=_Dropping(PDF_BYTES[:1000]),
+                    headers={"content-type": "application/pdf"},
+                )
+            return httpx.Response(
+                200, content=PDF_BYTES, headers={"content-type": "application/pdf"}
+            )
+
+        data = await _fetcher(handler, settings).fetch(f"{BASE}/pdf_goster.php?Guid=a")
+        assert data == PDF_BYTES
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_resume_attempts(self, settings):
+        settings.PDF_RESUME_ATTEMPTS = 1
+
+        def handler(req):
+            return httpx.Response(
+                200,
+                stream=_Dropping(PDF_BYTES[:1000]),
+                headers={"content-type": "application/pdf"},
+            )
+
+        with pytest.raises(PDFFetchError, match="PDF indirme hatasi"):
+            await _fetcher(handler, settings).fetch(f"{BASE}/pdf_goster.php?Guid=a")
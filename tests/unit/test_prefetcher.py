@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.schemas.responses import SearchRecord
+from app.services.extractor import Extractor, pdf_key
+from app.services.pdf_cache import PDFCache
+from app.services.prefetcher import Prefetcher
+
+BASE = "https://www.ticaretsicil.gov.tr/view/hizlierisim/pdf_goster.php?Guid="
+
+
+def _record(*guids: str) -> SearchRecord:
+    return SearchRecord(title="ACME A.S.", pdf_urls=[BASE + g for g in guids])
+
+
+def _prefetcher(cache, factory=None, **kwargs) -> Prefetcher:
+    options = {"top_k": 1, "max_pending": 10, "ocr": False, **kwargs}
+    return Prefetcher(extractor_factory=factory or MagicMock(), pdf_cache=cache, **options)
+
+
+class TestSchedule:
+    def test_takes_top_k_and_skips_duplicates_and_cached(self, tmp_path):
+        cache = PDFCache(str(tmp_path), max_bytes=1024)
+        prefetcher = _prefetcher(cache, top_k=2)
+
+        accepted = prefetcher.schedule([_record("a", "b", "c"), _record("a", "d")])
+
+        assert accepted == 3  # a, b, d
+        assert prefetcher.pending == 3
+
+    def test_caps_pending(self, tmp_path):
+        cache = PDFCache(str(tmp_path), max_bytes=1024)
+        prefetcher = _prefetcher(cache, top_k=3, max_pending=2)
+        assert prefetcher.schedule([_record("a", "b", "c")]) == 2
+
+    def test_cancel_drops_pending(self, tmp_path):
+        cache = PDFCache(str(tmp_path), max_bytes=1024)
+        prefetcher = _prefetcher(cache)
+        prefetcher.schedule([_record("a"), _record("b")])
+        prefetcher.cancel()
+        assert prefetcher.pending == 0
+
+
+class TestWorker:
+    @pytest.mark.asyncio
+    async def test_prefetched_pdf_is_extracted_without_login(self, tmp_path):
+        cache = PDFCache(str(tmp_path), max_bytes=1024**2)
+        auth, pdf, ocr = AsyncMock(), AsyncMock(), MagicMock()
+        pdf.fetch.return_value = b"%PDF-prefetched"
+        ocr.extract_text.return_value = "metin"
+        done = asyncio.Event()
+
+        @asynccontextmanager
+        async def factory():
+            yield Extractor(auth_client=auth, pdf_fetcher=pdf, ocr_pipeline=ocr, pdf_cache=cache)
+            done.set()
+
+        prefetcher = _prefetcher(cache, factory=factory)
+        prefetcher.start()
+        prefetcher.schedule([_record("abc")])
+        await asyncio.wait_for(done.wait(), timeout=2)
+        await prefetcher.stop()
+
+        assert cache.contains(pdf_key(BASE + "abc"))
+        ocr.extract_text.assert_not_called()
+
+        auth.reset_mock()
+        pdf.reset_mock()
+        extractor = Extractor(auth_client=auth, pdf_fetcher=pdf, ocr_pipeline=ocr, pdf_cache=cache)
+        result = await extractor.extract_from_url(BASE + "abc")
+
+        assert result.raw_text == "metin"
+        pdf.fetch.assert_not_awaited()
+        auth.ensure_authenticated_with_retry.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_cancel_aborts_running_download(self, tmp_path):
+        cache = PDFCache(str(tmp_path), max_bytes=1024**2)
+        auth, pdf = AsyncMock(), AsyncMock()
+        started, aborted = asyncio.Event(), asyncio.Event()
+
+        async def fetch(url):
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                aborted.set()
+                raise
+
+        pdf.fetch.side_effect = fetch
+
+        @asynccontextmanager
+        async def factory():
+            yield Extractor(
+                auth_client=auth, pdf_fetcher=pdf, ocr_pipeline=MagicMock(), pdf_cache=cache
+            )
+
+        prefetcher = _prefetcher(cache, factory=factory)
+        prefetcher.start()
+        prefetcher.schedule([_record("abc")])
+        await asyncio.wait_for(started.wait(), timeout=2)
+        prefetcher.cancel()
+        await asyncio.wait_for(aborted.wait(), timeout=2)
+        await prefetcher.stop()
+
+        assert not cache.contains(pdf_key(BASE + "abc"))
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from app.utils.rate_limit import AdaptiveRateLimiter, TokenBucket
+
+
+@pytest.fixture
+def limiter():
+    return AdaptiveRateLimiter(
+        rate=4.0,
+        capacity=4,
+        min_rate=1.0,
+        max_rate=5.0,
+        increase_step=0.5,
+        decrease_factor=0.5,
+        latency_threshold=2.0,
+        decrease_cooldown=0.0,
+    )
+
+
+class TestTokenBucket:
+    @pytest.mark.asyncio
+    async def test_burst_is_immediate(self):
+        bucket = TokenBucket(rate=1.0, capacity=3)
+        for _ in range(3):
+            await bucket.acquire()
+        assert bucket.available < 1
+        assert bucket.queue_depth == 0
+
+    def test_record_is_noop(self):
+        bucket = TokenBucket(rate=2.0, capacity=1)
+        bucket.record(503, 10.0)
+        assert bucket.rate == 2.0
+
+
+class TestAdaptiveRateLimiter:
+    def test_additive_increase_on_clean_responses(self, limiter):
+        limiter.record(200, 0.1)
+        assert limiter.rate == pytest.approx(4.5)
+        limiter.record(200, 0.1)
+        limiter.record(200, 0.1)
+        assert limiter.rate == pytest.approx(5.0)  # capped at max_rate
+
+    @pytest.mark.parametrize(
+        ("status_code", "latency"), [(429, 0.1), (503, 0.1), (None, 0.1), (200, 3.0)]
+    )
+    def test_multiplicative_decrease_on_congestion(self, limiter, status_code, latency):
+        limiter.record(status_code, latency)
+        assert limiter.rate == pytest.approx(2.0)
+
+    def test_rate_floor(self, limiter):
+        for _ in range(5):
+            limiter.record(500, 0.1)
+        assert limiter.rate == pytest.approx(1.0)
+
+    def test_decrease_cooldown(self):
+        limiter = AdaptiveRateLimiter(
+            rate=4.0,
+            capacity=4,
+            min_rate=1.0,
+            max_rate=5.0,
+            increase_step=0.5,
+            decrease_factor=0.5,
+            latency_threshold=2.0,
+            decrease_cooldown=60.0,
+        )
+        limiter.record(503, 0.1)
+        limiter.record(503, 0.1)
+        assert limiter.rate == pytest.approx(2.0)
+
+    def test_first_decrease_not_suppressed_on_fresh_host(self):
+        limiter = AdaptiveRateLimiter(
+            rate=4.0,
+            capacity=4,
+            min_rate=1.0,
+            max_rate=5.0,
+            increase_step=0.5,
+            decrease_factor=0.5,
+            latency_threshold=2.0,
+            decrease_cooldown=60.0,
+        )
+        # monotonic() counts from boot: a host up for 5s is still inside the cooldown
+        with patch("app.utils.rate_limit.time.monotonic", return_value=5.0):
+            limiter.record(503, 0.1)
+        assert limiter.rate == pytest.approx(2.0)
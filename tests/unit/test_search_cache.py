@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from app.schemas.responses import SearchRecord
+from app.services.search_cache import SearchCache, normalize_query_key
+
+
+def _records(title: str = "ACME A.S.") -> list[SearchRecord]:
+    return [SearchRecord(title=title, registry_no="123", tsm="ANKARA")]
+
+
+class TestNormalizeQueryKey:
+    def test_turkish_case_variants_share_key(self):
+        assert normalize_query_key("Altınkaya") == normalize_query_key("ALTINKAYA")
+        assert normalize_query_key("ALTİNKAYA") == normalize_query_key("altinkaya")
+
+    def test_nfc_and_whitespace(self):
+        decomposed = "I\u0307STANBUL  ELEKTRONI\u0307K"
+        assert normalize_query_key(decomposed) == normalize_query_key("İSTANBUL ELEKTRONİK")
+
+
+class TestSearchCache:
+    def test_hit_returns_copy_without_pdf_urls(self):
+        cache = SearchCache(ttl=60, stale_ttl=60, max_entries=10)
+        records = _records()
+        records[0].pdf_urls = ["https://example.com/a"]
+        cache.put("acme", records, 5)
+
+        cached = cache.get("ACME")
+        assert cached is not None
+        assert cached.total == 5
+        assert cached.stale is False
+        assert cached.results[0].pdf_urls == []
+        cached.results[0].title = "changed"
+        assert cache.get("acme").results[0].title == "ACME A.S."
+
+    def test_stale_then_expired(self):
+        cache = SearchCache(ttl=10, stale_ttl=10, max_entries=10)
+        with patch("app.services.search_cache.time.time", return_value=1000.0):
+            cache.put("acme", _records(), 1)
+        with patch("app.services.search_cache.time.time", return_value=1015.0):
+            assert cache.get("acme").stale is True
+        with patch("app.services.search_cache.time.time", return_value=1025.0):
+            assert cache.get("acme") is None
+
+    def test_lru_eviction(self):
+        cache = SearchCache(ttl=60, stale_ttl=0, max_entries=2)
+        cache.put("one", _records("ONE"), 1)
+        cache.put("two", _records("TWO"), 1)
+        cache.get("one")
+        cache.put("three", _records("THREE"), 1)
+        assert cache.get("two") is None
+        assert cache.get("one") is not None
+        assert cache.get("three") is not None
+
+    def test_disabled_with_zero_ttl(self):
+        cache = SearchCache(ttl=0, stale_ttl=60, max_entries=10)
+        cache.put("acme", _records(), 1)
+        assert cache.get("acme") is None
+
+    def test_disk_tier_survives_new_instance(self, tmp_path):
+        SearchCache(ttl=60, stale_ttl=0, max_entries=10, disk_dir=str(tmp_path)).put(
+            "acme", _records(), 3
+        )
+        fresh = SearchCache(ttl=60, stale_ttl=0, max_entries=10, disk_dir=str(tmp_path))
+        cached = fresh.get("ACME")
+        assert cached is not None
+        assert cached.total == 3
+
+    @pytest.mark.asyncio
+    async def test_background_refresh_updates_entry(self):
+        cache = SearchCache(ttl=60, stale_ttl=60, max_entries=10)
+
+        async def fetch():
+            return _records("REFRESHED"), 2
+
+        cache.refresh_in_background("acme", fetch)
+        await cache._refreshing[normalize_query_key("acme")]
+        assert cache.get("acme").results[0].title == "REFRESHED"
+
+
+class TestNegativeCache:
+    def test_miss_is_remembered_for_all_variants(self):
+        cache = SearchCache(ttl=60, stale_ttl=0, max_entries=10, negative_ttl=30)
+        cache.put_negative("yazim hatasi", "YAZİM HATASİ")
+        assert cache.is_known_missing("YAZIM HATASI")
+        assert cache.is_known_missing("yazım hatası")
+
+    def test_expires(self):
+        cache = SearchCache(ttl=60, stale_ttl=0, max_entries=10, negative_ttl=30)
+        with patch("app.services.search_cache.time.monotonic", return_value=100.0):
+            cache.put_negative("nope")
+        with patch("app.services.search_cache.time.monotonic", return_value=131.0):
+            assert not cache.is_known_missing("nope")
+
+    def test_invalidate_and_positive_put_clear_negative(self):
+        cache = SearchCache(ttl=60, stale_ttl=0, max_entries=10, negative_ttl=30)
+        cache.put_negative("acme")
+        cache.invalidate("ACME")
+        assert not cache.is_known_missing("acme")
+
+        cache.put_negative("acme")
+        cache.put("acme", _records(), 1)
+        assert not cache.is_known_missing("acme")
+
+    def test_disabled_with_zero_ttl(self):
+        cache = SearchCache(ttl=60, stale_ttl=0, max_entries=10, negative_ttl=0)
+        cache.put_negative("acme")
+        assert not cache.is_known_missing("acme")
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pydantic import SecretStr
+
+from app.clients.account_pool import Account
+from app.clients.session_manager import SessionManager
+from app.config import Settings
+from app.services.auth_client import AuthClient
+from app.utils.rate_limit import TokenBucket
+
+
+class TestSessionProbe:
+    def test_not_authenticated_never_probes(self):
+        mgr = SessionManager()
+        assert mgr.needs_probe(probe_after_seconds=0, probe_cache_seconds=0) is False
+
+    def test_fresh_session_skips_probe(self):
+        mgr = SessionManager()
+        with patch("app.clients.session_manager.time.monotonic", return_value=1000.0):
+            mgr.mark_authenticated()
+        with patch("app.clients.session_manager.time.monotonic", return_value=1100.0):
+            assert mgr.needs_probe(probe_after_seconds=300, probe_cache_seconds=60) is False
+
+    def test_old_session_needs_probe_until_validated(self):
+        mgr = SessionManager()
+        with patch("app.clients.session_manager.time.monotonic", return_value=1000.0):
+            mgr.mark_authenticated()
+        with patch("app.clients.session_manager.time.monotonic", return_value=1400.0):
+            assert mgr.needs_probe(probe_after_seconds=300, probe_cache_seconds=60) is True
+            mgr.mark_validated()
+        with patch("app.clients.session_manager.time.monotonic", return_value=1430.0):
+            assert mgr.needs_probe(probe_after_seconds=300, probe_cache_seconds=60) is False
+        with patch("app.clients.session_manager.time.monotonic", return_value=1470.0):
+            assert mgr.needs_probe(probe_after_seconds=300, probe_cache_seconds=60) is True
+
+
+@pytest.fixture
+def auth():
+    client = AsyncMock()
+    client.cookies = MagicMock()
+    settings = Settings(
+        TOBB_LOGIN_EMAIL="test@test.com",
+        TOBB_LOGIN_PASSWORD="testpass",
+        SESSION_PROBE_AFTER_SECONDS=0,
+        SESSION_PROBE_CACHE_SECONDS=60,
+    )
+    session = SessionManager()
+    session.mark_authenticated()
+    return AuthClient(
+        client=client, settings=settings, captcha_handler=AsyncMock(), session_manager=session
+    )
+
+
+class TestEnsureSessionValid:
+    @pytest.mark.asyncio
+    async def test_valid_probe_keeps_session(self, auth):
+        probe = MagicMock(status_code=200, text='<select name="SicilMudurluguId">')
+        auth._client.get.return_value = probe
+        auth._session._validated_at = None
+
+        with patch.object(auth, "_login_with_retry", new_callable=AsyncMock) as login:
+            await auth.ensure_session_valid()
+
+        login.assert_not_called()
+        assert auth._session.needs_probe(0, 60) is False
+
+    @pytest.mark.asyncio
+    async def test_failed_probe_reauthenticates(self, auth):
+        auth._client.get.return_value = MagicMock(status_code=200, text="<form>LoginSifre</form>")
+        auth._session._validated_at = None
+
+        with patch.object(auth, "_login_with_retry", new_callable=AsyncMock) as login:
+            await auth.ensure_session_valid()
+
+        login.assert_awaited_once()
+        auth._client.cookies.clear.assert_called_once()
+
+
+class TestSharedAccount:
+    @pytest.mark.asyncio
+    async def test_concurrent_holders_log_in_once(self):
+        client = AsyncMock()
+        client.cookies = MagicMock()
+        account = Account(
+            email="a@test.com",
+            password=SecretStr("pw"),
+            client=client,
+            limiter=TokenBucket(rate=10, capacity=10),
+            quarantine_after=3,
+            quarantine_seconds=60,
+        )
+        settings = Settings(SESSION_PROBE_AFTER_SECONDS=600)
+        clients = [
+            AuthClient(
+                client=client,
+                settings=settings,
+                captcha_handler=AsyncMock(),
+                session_manager=account.session,
+                account=account,
+            )
+            for _ in range(3)
+        ]
+
+        async def login(_self):
+            await asyncio.sleep(0)
+            account.session.mark_authenticated()
+
+        with patch.object(AuthClient, "_login", side_effect=login, autospec=True) as mocked:
+            await asyncio.gather(*(c.ensure_authenticated() for c in clients))
+
+        assert mocked.await_count == 1
+        assert account.session.is_authenticated
+
+    @pytest.mark.asyncio
+    async def test_session_left_by_earlier_request_is_probed(self):
+        client = AsyncMock()
+        client.cookies = MagicMock()
+        client.get.return_value = MagicMock(status_code=200, text="<form>LoginSifre</form>")
+        account = Account(
+            email="a@test.com",
+            password=SecretStr("pw"),
+            client=client,
+            limiter=TokenBucket(rate=10, capacity=10),
+            quarantine_after=3,
+            quarantine_seconds=60,
+        )
+        settings = Settings(SESSION_PROBE_AFTER_SECONDS=300, SESSION_PROBE_CACHE_SECONDS=60)
+        with patch("app.clients.session_manager.time.monotonic", return_value=1000.0):
+            account.session.mark_authenticated()
+
+        # A later request builds its own AuthClient on the still-open session
+        later = AuthClient(
+            client=client,
+            settings=settings,
+            captcha_handler=AsyncMock(),
+            session_manager=account.session,
+            account=account,
+        )
+        with (
+            patch("app.clients.session_manager.time.monotonic", return_value=1400.0),
+            patch.object(later, "_login_with_retry", new_callable=AsyncMock) as login,
+        ):
+            await later.ensure_session_valid()
+
+        client.get.assert_awaited_once()
+        login.assert_awaited_once()
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.schemas.responses import GazetteRecord
+from app.services.extractor import Extractor
+from app.services.gazette_cache import GazetteRecordCache
+from app.services.text_index import GazetteTextIndex, fold_text, match_expression
+
+PDF = "https://www.ticaretsicil.gov.tr/view/hizlierisim/pdf_goster.php?Guid="
+
+
+def _record(guid: str, yayin_tarihi: str, ilan_turu: str) -> GazetteRecord:
+    return GazetteRecord(
+        mudurluk="ISTANBUL",
+        sicil_no=guid.upper(),
+        unvan=f"FİRMA {guid.upper()} ANONİM ŞİRKETİ",
+        yayin_tarihi=yayin_tarihi,
+        ilan_turu=ilan_turu,
+        pdf_url=f"{PDF}{guid}",
+    )
+
+
+@pytest.fixture
+def index():
+    index = GazetteTextIndex(":memory:")
+    index.add(
+        f"{PDF}a",
+        "Şirketin sermayesi 1.000.000 TL'den 5.000.000 TL'ye ARTIRILMIŞTIR.",
+        _record("a", "10/03/2024", "Sermaye Artırımı"),
+    )
+    index.add(
+        f"{PDF}b",
+        "Şirket merkezi Kadıköy ilçesine taşınmıştır.",
+        _record("b", "20/05/2024", "Adres Değişikliği"),
+    )
+    index.add(f"{PDF}c", "Yönetim kurulu üyeliğine seçilmiştir. Sermaye değişmemiştir.")
+    yield index
+    index.close()
+
+
+class TestFolding:
+    def test_turkish_letters_fold_to_ascii_lowercase(self):
+        assert fold_text("İSTANBUL ılık ŞİRKETİ çğöü") == "istanbul ilik sirketi cgou"
+        assert len(fold_text("ARTIRIMI artırımı")) == len("ARTIRIMI artırımı")
+
+    def test_match_expression_quotes_terms(self):
+        assert match_expression('sermaye "artır*') == '"sermaye" AND "artir"*'
+        assert match_expression("-- !!") is None
+        assert (
+            match_expression("tl", ilan_turu=["Sermaye Art"])
+            == '"tl" AND ilan_turu : ("sermaye art"*)'
+        )
+
+
+class TestGazetteTextIndex:
+    def test_turkish_insensitive_match_with_snippet(self, index):
+        hits = index.search("artirilmistir")
+
+        assert [hit.pdf_url for hit in hits] == [f"{PDF}a"]
+        assert hits[0].record.ilan_turu == "Sermaye Artırımı"
+        assert "<em>ARTIRILMIŞTIR</em>" in hits[0].snippet
+
+    def test_snippet_escapes_html_in_text(self, index):
+        index.add(f"{PDF}d", "<script>x</script> A & B <b>unvan</b> degisikligi")
+
+        [hit] = index.search("unvan")
+
+        assert "&lt;script&gt;x&lt;/script&gt; A &amp; B &lt;b&gt;<em>unvan</em>&lt;/b&gt;" in (
+            hit.snippet
+        )
+        assert "<script>" not in hit.snippet
+
+    def test_prefix_and_all_words(self, index):
+        assert {h.pdf_url for h in index.search("sermaye*")} == {f"{PDF}a", f"{PDF}c"}
+        assert [h.pdf_url for h in index.search("kadikoy tasinmistir")] == [f"{PDF}b"]
+        assert index.search("kadikoy sermaye") == []
+
+    def test_filters_use_record_metadata(self, index):
+        by_type = index.search("sirket*", ilan_turu=["adres"])
+        by_date = index.search("sirket*", date_from=date(2024, 5, 1))
+
+        assert [h.pdf_url for h in by_type] == [f"{PDF}b"]
+        assert [h.pdf_url for h in by_date] == [f"{PDF}b"]
+
+    def test_metadata_filled_in_once_known(self, index):
+        assert not index.add(f"{PDF}c", "tekrar")
+        assert index.add(f"{PDF}c", "tekrar", _record("c", "01/06/2024", "Yönetim Kurulu"))
+
+        hits = index.search("tekrar", ilan_turu=["yonetim"])
+        assert [h.record.sicil_no for h in hits] == ["C"]
+        assert index.count() == 3
+
+
+class TestExtractorIndexing:
+    @pytest.mark.asyncio
+    async def test_extracted_text_is_indexed_with_record(self):
+        gazette_cache = GazetteRecordCache(fresh_ttl=60, max_entries=10)
+        gazette_cache.put("34", "A", [_record("a", "10/03/2024", "Sermaye Artırımı")])
+        text_index = GazetteTextIndex(":memory:")
+        extractor = Extractor(
+            auth_client=AsyncMock(),
+            pdf_fetcher=AsyncMock(),
+            ocr_pipeline=MagicMock(),
+            gazette_cache=gazette_cache,
+            text_index=text_index,
+        )
+        extractor._pdf.fetch.return_value = b"%PDF-1.4"
+        extractor._ocr.extract_text.return_value = "Sermaye artırımı tescil edilmiştir."
+
+        await extractor.extract_from_url(f"{PDF}a")
+
+        hits = text_index.search("tescil")
+        assert [h.record.unvan for h in hits] == ["FİRMA A ANONİM ŞİRKETİ"]
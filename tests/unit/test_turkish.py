@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from app.utils.turkish import fold_turkish_case, normalize_turkish
+
+
+class TestTurkishNormalisation:
+    def test_dotted_and_dotless_i_fold_to_ascii(self):
+        assert fold_turkish_case("istanbul") == fold_turkish_case("İSTANBUL") == "ISTANBUL"
+        assert fold_turkish_case("altınkaya") == "ALTINKAYA"
+
+    def test_normalize_collapses_whitespace_and_composes(self):
+        decomposed = " I\u0307STANBUL \t ELEKTRONI\u0307K"
+        assert normalize_turkish(decomposed) == normalize_turkish("istanbul elektronik")